@@ -9,6 +9,7 @@ import matplotlib.pyplot as plt
 import matplotlib.patches as patches
 from io import BytesIO
 from PIL import Image  # Assuming Pillow; fallback to savefig if needed
+from logic.agents import AgentRegistry
 
 class OTK(QMainWindow):
     def __init__(self):
@@ -27,7 +28,7 @@ class OTK(QMainWindow):
         config_file = 'otk_agents.yaml'
         if os.path.exists(config_file):
             with open(config_file, 'r') as f:
-                return yaml.safe_load(f)
+                return AgentRegistry(yaml.safe_load(f))
         defaults = {
             'Architect': {'color': 'orange', 'prompt': 'CTS: Architect {input}'},
             'Reflexion': {'color': 'pink', 'prompt': 'Reflect on {input}'},
@@ -36,7 +37,7 @@ class OTK(QMainWindow):
         }
         with open(config_file, 'w') as f:
             yaml.dump(defaults, f)
-        return defaults
+        return AgentRegistry(defaults)
 
     def build_ui(self):
         central = QWidget()
@@ -47,7 +48,7 @@ class OTK(QMainWindow):
         switcher_label = QLabel("Context Switcher")
         layout.addWidget(switcher_label)
         self.switcher = QTabWidget()
-        agent_order = list(self.agents.keys())
+        agent_order = self.agents.names
         for i, agent_name in enumerate(agent_order):
             tab = QWidget()
             btn = QPushButton(agent_name)
@@ -104,19 +105,19 @@ class OTK(QMainWindow):
             self.status_bar.showMessage("Idea Mode: Auto-tagging for creative capture")
 
         if 'RFP' in text.upper():
-            rfp_index = list(self.agents.keys()).index('RFP Scout')
+            rfp_index = self.agents.index_of('RFP Scout')
             self.switcher.setCurrentIndex(rfp_index)
             self.switch_context('RFP Scout')
             self.status_bar.showMessage("Swarm: Routed to RFP Scout")
 
     def on_prompt_submit(self):
-        agent_name = list(self.agents.keys())[self.switcher.currentIndex()]
+        agent_name = self.agents.name_at(self.switcher.currentIndex())
         self.switch_context(agent_name)
         input_text = self.prompt_edit.text()
         full_prompt = self.agents[agent_name]['prompt'].format(input=input_text)
         self.submit_count[agent_name] += 1
         if self.submit_count[agent_name] > 5:
-            next_agent = list(self.agents.keys())[(list(self.agents.keys()).index(agent_name) + 1) % len(self.agents)]
+            next_agent = self.agents.next_after(agent_name)
             self.switch_context(next_agent)
             self.status_bar.showMessage(f"Fatigue: Rotated to {next_agent}")
 
@@ -133,8 +134,8 @@ class OTK(QMainWindow):
         for i in range(self.switcher.count()):
             tab_widget = self.switcher.widget(i)
             btn = tab_widget.layout().itemAt(0).widget()
-            agent_key = list(self.agents.keys())[i]
-            color = self.agents[agent_key]['color'] if agent_name == agent_key else 'lightgray'
+            record = self.agents.record_at(i)
+            color = record.color if agent_name == record.name else 'lightgray'
             btn.setStyleSheet(f"background-color: {color}; border-radius: 5px;")
 
     def quick_runbook(self):
@@ -204,7 +205,7 @@ class OTK(QMainWindow):
 
         # Viz: Simple graph for Bayesian edges (export PNG to vault)
         fig, ax = plt.subplots(figsize=(5, 3))
-        agents = list(self.agents.keys())
+        agents = list(self.agents.names)
         weights = [self.submit_count[a] for a in agents]  # Edge weights
         colors = [self.agents[a]['color'] for a in agents]
         bars = ax.bar(agents, weights, color=colors)
@@ -1,14 +1,37 @@
 import sys
+from logic import startup_profile
+
+# Must start before the heavy imports below so they show up in the report
+profiler = startup_profile.StartupProfiler() if startup_profile.requested() else None
+
 import os
-import yaml
+import time
 from datetime import datetime
-from PySide6.QtWidgets import (QApplication, QMainWindow, QTabWidget, QPushButton,
+from pathlib import Path
+from PySide6.QtWidgets import (QApplication, QMainWindow, QPushButton,
                                QVBoxLayout, QWidget, QLabel, QStatusBar, QLineEdit)
-from PySide6.QtCore import Qt
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-from io import BytesIO
-from PIL import Image
+from PySide6.QtCore import Qt, QObject, QEvent, QTimer
+from logic.ce_index import CEIndex
+from logic.ce_writer import CEWriter
+from logic.segments import SegmentStore
+from logic import reflection_render
+from logic.activity_ring import ActivityRing
+from logic.routing import RoutingEngine
+from logic.agents import AgentRegistry
+from logic.agent_switcher import AgentSwitcher
+from logic.hot_reload import ConfigWatcher, diff_keyed
+from logic import config_cache
+
+CE_FILE = 'otk_ce_index.md'
+AGENTS_FILE = 'otk_agents.yaml'  # Watched; edits apply without a restart
+SWITCHER_QSS_FILE = Path(__file__).resolve().parents[1] / 'styles' / 'agent_switcher.qss'
+CE_DURABILITY = 'flush'  # none | flush | fsync, applied once per batch
+CE_HOT_MAX_BYTES = 256 * 1024  # resolved tasks move to otk_ce_index.md.segments/ past this, or daily
+CE_COMPACT_CHECK_MS = 60_000
+REFLECTION_FORMAT = 'png'  # or 'svg', cheaper to produce
+ACTIVITY_CAPACITY = 4096  # keystroke samples kept for Tracker embeds
+ANALYSIS_IDLE_MS = 150    # Prompt Bay analysis runs once typing pauses this long
+ROUTING_TAGS = {'creative': ['IDEA', 'CREATIVE', 'BRAINSTORM']}  # Agent rules live in otk_agents.yaml
 
 class OTK(QMainWindow):
     def __init__(self):
@@ -18,32 +41,74 @@ class OTK(QMainWindow):
         self.setMinimumSize(320, 240)
         self.resize(450, 350)
         self.agents = self.load_agents()
+        self.router = RoutingEngine.from_agents(self.agents, ROUTING_TAGS)
         self.active_agent = "Architect"
         self.submit_count = {agent: 0 for agent in self.agents}
-        self.activity_log = []  # For Tracker embeds
-        self.start_time = datetime.now()
+        self.ce_index = CEIndex(CE_FILE)  # Sidecar index; tails appends instead of rescanning
+        self.ce_writer = CEWriter(CE_FILE, durability=CE_DURABILITY, on_append=self.ce_index.note_append)
+        self.ce_segments = SegmentStore(CE_FILE, max_bytes=CE_HOT_MAX_BYTES)
+        self.activity = ActivityRing(ACTIVITY_CAPACITY)  # For Tracker embeds; bounded
+        self.start_time = time.monotonic()
+        self._last_cadence = 0.0
+        self._analyzing = False
+        self._setting_prompt = False
         self._drag_pos = None
         self._resizing = False
         self._resize_dir = None
         self._resize_margin = 8  # pixels for edge detection
         self._orig_geom = None
         self.build_ui()
+        self.config_watcher = ConfigWatcher(parent=self)
+        self.config_watcher.changed.connect(self.reload_agents)
+        self.config_watcher.watch(AGENTS_FILE)
         self.prime_pump()
 
     def load_agents(self):
-        config_file = 'otk_agents.yaml'
+        config_file = AGENTS_FILE
         if os.path.exists(config_file):
-            with open(config_file, 'r') as f:
-                return yaml.safe_load(f)
+            # Parsed once per edit; later launches read the compiled sidecar
+            return AgentRegistry(config_cache.load_agents(config_file))
         defaults = {
             'Architect': {'color': 'orange', 'prompt': 'Architect {input}'},
             'Reflexion': {'color': 'pink', 'prompt': 'Reflect on {input}'},
-            'RFP Scout': {'color': 'blue', 'prompt': 'Scout RFPs for {input}'},
+            'RFP Scout': {'color': 'blue', 'prompt': 'Scout RFPs for {input}',
+                          'routing': {'keywords': ['RFP'], 'priority': 10}},
             'Docs': {'color': 'white', 'prompt': 'Docs query: {input}'}
         }
+        import yaml  # Only needed to seed a missing config
         with open(config_file, 'w') as f:
             yaml.dump(defaults, f)
-        return defaults
+        return AgentRegistry(defaults)
+
+    def reload_agents(self, path=AGENTS_FILE):
+        try:
+            agents = AgentRegistry(config_cache.load_agents(path))
+            router = RoutingEngine.from_agents(agents, ROUTING_TAGS)
+        except Exception as e:
+            # Keep running on the last good config until the file is fixed
+            self.status_bar.showMessage(f"Agents reload failed: {e}")
+            return
+        diff = diff_keyed(self.agents.to_config(), agents.to_config())
+        if not diff:
+            return
+
+        self.agents = agents
+        self.router = router
+        # Session state survives for every agent that is still defined
+        self.submit_count = {name: self.submit_count.get(name, 0) for name in agents}
+        self.switcher.apply(agents, diff)
+        if self.active_agent not in agents:
+            self.switch_context(agents.name_at(0))
+        else:
+            self.switcher.setCurrentIndex(agents.index_of(self.active_agent))
+        self.status_bar.showMessage(f"Agents reloaded: +{len(diff.added)} -{len(diff.removed)} ~{len(diff.changed)}")
+
+    def switcher_stylesheet(self):
+        # Only the agentSegment selectors; the rest of the HUD keeps its native look
+        if not SWITCHER_QSS_FILE.exists():
+            return ""
+        with open(SWITCHER_QSS_FILE, 'r', encoding='utf-8') as f:
+            return f.read()
 
     def build_ui(self):
         central = QWidget()
@@ -52,18 +117,10 @@ class OTK(QMainWindow):
 
         switcher_label = QLabel("Context Switcher")
         layout.addWidget(switcher_label)
-        self.switcher = QTabWidget()
-        agent_order = list(self.agents.keys())
-        for i, agent_name in enumerate(agent_order):
-            tab = QWidget()
-            btn = QPushButton(agent_name)
-            btn.clicked.connect(lambda checked, name=agent_name: self.switch_context(name))
-            tab_layout = QVBoxLayout(tab)
-            tab_layout.addWidget(btn)
-            self.switcher.addTab(tab, agent_name)
-            if agent_name == self.active_agent:
-                self.switcher.setCurrentIndex(i)
-                btn.setStyleSheet("background-color: orange; border-radius: 5px;")
+        self.switcher = AgentSwitcher(self.agents, self.switcher_stylesheet())
+        self.switcher.agent_selected.connect(self.switch_context)
+        if self.active_agent in self.agents:
+            self.switcher.setCurrentIndex(self.agents.index_of(self.active_agent))
         layout.addWidget(self.switcher)
 
         tools_label = QLabel("Tools & Ambient")
@@ -87,41 +144,71 @@ class OTK(QMainWindow):
         self.prompt_edit = QLineEdit()
         self.prompt_edit.returnPressed.connect(self.on_prompt_submit)
         self.prompt_edit.textChanged.connect(self.on_prompt_change)
-        self.start_time = datetime.now()
+        self.start_time = time.monotonic()
         layout.addWidget(self.prompt_edit)
 
+        # Compaction runs on the CE writer thread, between batches
+        self.compact_timer = QTimer(self)
+        self.compact_timer.timeout.connect(lambda: self.ce_writer.run_exclusive(self.compact_ce))
+        self.compact_timer.start(CE_COMPACT_CHECK_MS)
+
+        # Keystrokes only restart this timer; analysis runs once per idle pause
+        self.analysis_timer = QTimer(self)
+        self.analysis_timer.setSingleShot(True)
+        self.analysis_timer.setInterval(ANALYSIS_IDLE_MS)
+        self.analysis_timer.timeout.connect(self.analyze_prompt)
+
         self.status_bar = QStatusBar()
         self.setStatusBar(self.status_bar)
         self.status_bar.showMessage("Ready | Active: Architect")
 
     def on_prompt_change(self):
-        text = self.prompt_edit.text()
-        now = datetime.now()
-        typing_speed = len(text) / max((now - self.start_time).total_seconds(), 1)
-        self.activity_log.append({'time': now, 'cadence': typing_speed, 'agent': self.active_agent})
-        if typing_speed < 10:
+        if self._setting_prompt:
+            return  # Our own setText from switch_context, not user input
+        now = time.monotonic()
+        self._last_cadence = len(self.prompt_edit.text()) / max(now - self.start_time, 1)
+        self.activity.append(self._last_cadence, self.active_agent, now)
+        self.start_time = now
+        self.analysis_timer.start()
+
+    def flush_prompt_analysis(self):
+        if self.analysis_timer.isActive():
+            self.analysis_timer.stop()
+            self.analyze_prompt()
+
+    def analyze_prompt(self):
+        if self._analyzing:
+            return
+        self._analyzing = True
+        try:
+            self._analyze_prompt(self.prompt_edit.text())
+        finally:
+            self._analyzing = False
+
+    def _analyze_prompt(self, text):
+        if self._last_cadence < 10:
             self.status_bar.showMessage("Activity: Slow cadence—log to Tracker?")
             self.dim_tools()
-        self.start_time = now
 
-        is_creative = any(word in text.upper() for word in ['IDEA', 'CREATIVE', 'BRAINSTORM'])
-        if is_creative:
+        route = self.router.match(text)
+        if 'creative' in route.tags:
             self.status_bar.showMessage("Creativity: Tagged for Excalidraw surfacing")
 
-        if 'RFP' in text.upper():
-            rfp_index = list(self.agents.keys()).index('RFP Scout')
-            self.switcher.setCurrentIndex(rfp_index)
-            self.switch_context('RFP Scout')
-            self.status_bar.showMessage("Swarm: Routed to RFP Scout")
+        if route.candidates and route.candidates[0].agent != self.active_agent:
+            target = route.candidates[0].agent
+            self.switcher.setCurrentIndex(self.agents.index_of(target))
+            self.switch_context(target)
+            self.status_bar.showMessage(f"Swarm: Routed to {target}")
 
     def on_prompt_submit(self):
-        agent_name = list(self.agents.keys())[self.switcher.currentIndex()]
+        self.flush_prompt_analysis()
+        agent_name = self.agents.name_at(self.switcher.currentIndex())
         self.switch_context(agent_name)
         input_text = self.prompt_edit.text()
         full_prompt = self.agents[agent_name]['prompt'].format(input=input_text)
         self.submit_count[agent_name] += 1
         if self.submit_count[agent_name] > 5:
-            next_agent = list(self.agents.keys())[(list(self.agents.keys()).index(agent_name) + 1) % len(self.agents)]
+            next_agent = self.agents.next_after(agent_name)
             self.switch_context(next_agent)
             self.status_bar.showMessage(f"Fatigue: Rotated to {next_agent}")
 
@@ -134,28 +221,29 @@ class OTK(QMainWindow):
 
     def switch_context(self, agent_name):
         self.active_agent = agent_name
-        self.prompt_edit.setText(self.agents[agent_name]['prompt'].format(input="Your idea..."))
+        self._setting_prompt = True
+        try:
+            self.prompt_edit.setText(self.agents[agent_name]['prompt'].format(input="Your idea..."))
+        finally:
+            self._setting_prompt = False
         self.status_bar.showMessage(f"Switched to {agent_name}")
-        for i in range(self.switcher.count()):
-            tab_widget = self.switcher.widget(i)
-            btn = tab_widget.layout().itemAt(0).widget()
-            agent_key = list(self.agents.keys())[i]
-            color = self.agents[agent_key]['color'] if agent_name == agent_key else 'lightgray'
-            btn.setStyleSheet(f"background-color: {color}; border-radius: 5px;")
+        self.switcher.setCurrentIndex(self.agents.index_of(agent_name))  # Re-polishes old + new segment only
 
     def quick_runbook(self):
         unresolved = self.parse_ce_unresolved()
         branches = self.generate_what_if(unresolved, prioritize_creative=True)
         contrarian = self.get_contrarian("Current activities")
-        activity_summary = f"Cadence avg: {sum([a['cadence'] for a in self.activity_log])/max(len(self.activity_log),1):.1f}"
+        activity_summary = (f"Cadence avg: {self.activity.mean:.1f} "
+                            f"(EWMA {self.activity.ewma:.1f}, p95 {self.activity.percentile(95):.1f})")
         summary = f"Runbook: {unresolved} open | {branches} | Contrarian: {contrarian} | {activity_summary}"
-        self.log_to_ce(summary, self.active_agent)
+        saved = self.log_to_ce(summary, self.active_agent)
         self.export_to_kanban(summary)  # Plugin YAML
-        self.status_bar.showMessage("Runbook + Kanban board → Obsidian")
+        if saved:  # Keep the "not saved" warning visible otherwise
+            self.status_bar.showMessage("Runbook + Kanban board → Obsidian")
 
     def prime_pump(self):
         unresolved = self.parse_ce_unresolved()
-        creative_unresolved = sum(1 for line in open('otk_ce_index.md', 'r') if '- [ ]' in line and '#creative' in line)
+        creative_unresolved = self.ce_index.tag_count('creative')
         if unresolved > 0:
             paths = self.generate_what_if(unresolved, prioritize_creative=True, num_paths=3)
             recap = f"Prime: {unresolved} TODOs ({creative_unresolved} creative). Paths: {paths}"
@@ -177,14 +265,13 @@ class OTK(QMainWindow):
     def get_contrarian(self, context):
         return f"Risk: {context} silos creativity—test A/B with devil's advocate?"
 
+    def compact_ce(self):
+        if self.ce_segments.due() and not self.ce_segments.compact():
+            print("CE compaction skipped: file changed during compaction, will retry")
+
     def parse_ce_unresolved(self):
-        ce_file = 'otk_ce_index.md'
-        if not os.path.exists(ce_file):
-            return 0
-        with open(ce_file, 'r') as f:
-            content = f.read()
-        lines = [line for line in content.split('\n') if '- [ ]' in line]
-        return len(lines)
+        self.ce_index.refresh()
+        return self.ce_index.unresolved
 
     def dim_tools(self):
         for i in range(self.tools_layout.count()):
@@ -197,8 +284,12 @@ class OTK(QMainWindow):
             self.tools_layout.itemAt(i).widget().show()
 
     def quit_app(self):
+        self.hide()  # Disappear right away; nothing below needs the window
         self.generate_reflection_artifact()
         self.export_activity_tracker()
+        self.compact_timer.stop()
+        self.ce_writer.close()  # Drain queued CE entries before exit
+        self.ce_index.refresh()  # Index them while their appends are still on record
         self.close()
 
     def generate_reflection_artifact(self):
@@ -206,23 +297,26 @@ class OTK(QMainWindow):
         what_if = self.generate_what_if(unresolved)
         contrarian = self.get_contrarian(f"{unresolved} threads")
         summary = f"Reflection [{datetime.now().strftime('%Y-%m-%d %H:%M')}]: {what_if} | Contrarian: {contrarian}"
-        self.log_to_ce(summary, self.active_agent)
+        saved = self.log_to_ce(summary, self.active_agent)
 
-        # Graph with creative highlight
-        fig, ax = plt.subplots(figsize=(5, 3))
-        agents = list(self.agents.keys())
+        # Graph with creative highlight, painted in a detached process so quit never waits on it
+        agents = list(self.agents.names)
         weights = [self.submit_count[a] for a in agents]
         colors = ['yellow' if w > 3 else self.agents[a]['color'] for a, w in zip(agents, weights)]  # Highlight high activity (creative proxy)
-        bars = ax.bar(agents, weights, color=colors)
-        ax.set_ylabel('Activity Weight')
-        ax.set_title('Runbook Graph (Yellow: Creative Bursts)')
-        for bar, w in zip(bars, weights):
-            ax.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.1, str(w), ha='center')
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-        plt.savefig('otk_reflection_graph.png', dpi=100, bbox_inches='tight')
-        plt.close()
-        self.status_bar.showMessage("Artifact (Tasks + Graph) → Vault")
+        spec = {
+            'labels': agents,
+            'values': weights,
+            'colors': colors,
+            'ylabel': 'Activity Weight',
+            'title': 'Runbook Graph (Yellow: Creative Bursts)',
+            'format': REFLECTION_FORMAT,
+            'out': f'otk_reflection_graph.{REFLECTION_FORMAT}',
+        }
+        if reflection_render.render_detached(spec):
+            if saved:
+                self.status_bar.showMessage("Artifact (Tasks + Graph) → Vault")
+        elif saved:
+            self.status_bar.showMessage("Artifact (Tasks) → Vault | Graph unchanged")
 
     def export_to_kanban(self, content):
         # YAML for Kanban plugin import
@@ -234,6 +328,7 @@ class OTK(QMainWindow):
                 {'title': 'Done', 'cards': []}
             ]
         }
+        import yaml  # Deferred off the startup path
         with open('runbook_board.yaml', 'w') as f:
             yaml.dump(board, f)
 
@@ -241,8 +336,8 @@ class OTK(QMainWindow):
         # Embed for Tracker plugin (e.g., ![[activity_log|300px]])
         with open('activity_log.md', 'w') as f:
             f.write("# Activity Tracker Embed\n")
-            for act in self.activity_log:
-                f.write(f"- {act['time'].strftime('%H:%M')} | Cadence: {act['cadence']:.1f} | {act['agent']}\n")
+            f.writelines(f"- {when.strftime('%H:%M')} | Cadence: {cadence:.1f} | {agent}\n"
+                         for when, cadence, agent in self.activity)
         self.status_bar.showMessage("Activity log → Tracker")
 
 
@@ -330,18 +425,37 @@ class OTK(QMainWindow):
         event.accept()
 
     def log_to_ce(self, content, agent, is_idea=False):
-        ce_file = 'otk_ce_index.md'
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
         tags = '#creative #idea' if is_idea else '#task #activity'
         priority = 'high' if is_idea else 'medium'
         links = '[[Runbooks]] [[Creative Sparks]]' if is_idea else '[[Activity Log]]'
         weight = str(self.submit_count.get(agent, 0))
         entry = f"\n- [ ] {content} | agent: {agent} | weight: {weight} | #priority:{priority} {tags} {links} {{due: {datetime.now().strftime('%Y-%m-%dT%H:%M')}}}\n"
-        with open(ce_file, 'a') as f:
-            f.write(entry)
+        if self.ce_writer.write(entry):
+            return True
+        self.status_bar.showMessage(
+            f"⚠️ CE log backed up; entry NOT saved ({self.ce_writer.dropped} dropped): {content[:40]}")
+        return False
+
+class FirstPaintProbe(QObject):
+    """Records time-to-first-paint for --profile-startup, then writes the report."""
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint:
+            obj.removeEventFilter(self)
+            profiler.mark('first_paint')
+            profiler.write()
+        return False
+
 
 if __name__ == "__main__":
+    if profiler:
+        profiler.mark('imports_done')
     app = QApplication(sys.argv)
     otk = OTK()
+    if profiler:
+        profiler.mark('otk_init_done')
+        probe = FirstPaintProbe()
+        otk.installEventFilter(probe)
     otk.show()
     sys.exit(app.exec())
\ No newline at end of file
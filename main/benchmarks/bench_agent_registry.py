@@ -0,0 +1,73 @@
+# Agent lookup cost: list(self.agents.keys()) scans vs AgentRegistry
+#
+#   cd main && python benchmarks/bench_agent_registry.py
+#
+# Replays the lookups on_prompt_submit and switch_context perform (without
+# the Qt widgets) for growing agent counts. Submit should be flat with the
+# registry; switch is reported per tab, since restyling still visits each tab.
+
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from logic.agents import AgentRegistry
+
+
+def make_config(n):
+    return {f"Agent {i}": {'color': 'orange', 'prompt': f'Agent {i}: {{input}}'} for i in range(n)}
+
+
+def legacy_submit(agents, current_index):
+    agent_name = list(agents.keys())[current_index]
+    prompt = agents[agent_name]['prompt']
+    next_agent = list(agents.keys())[(list(agents.keys()).index(agent_name) + 1) % len(agents)]
+    return prompt, next_agent
+
+
+def registry_submit(agents, current_index):
+    agent_name = agents.name_at(current_index)
+    prompt = agents[agent_name]['prompt']
+    return prompt, agents.next_after(agent_name)
+
+
+def legacy_switch(agents, agent_name):
+    colors = []
+    for i in range(len(agents)):
+        agent_key = list(agents.keys())[i]
+        colors.append(agents[agent_key]['color'] if agent_name == agent_key else 'lightgray')
+    return colors
+
+
+def registry_switch(agents, agent_name):
+    colors = []
+    for i in range(len(agents)):
+        record = agents.record_at(i)
+        colors.append(record.color if agent_name == record.name else 'lightgray')
+    return colors
+
+
+def per_call_us(fn, *args, number=None):
+    number = number or 2000
+    return min(timeit.repeat(lambda: fn(*args), number=number, repeat=3)) / number * 1e6
+
+
+def main():
+    print(f"{'agents':>7} | {'submit legacy':>14} {'submit registry':>16} | {'switch/tab legacy':>18} {'switch/tab registry':>20}")
+    for n in (4, 16, 100, 250, 1000):
+        config = make_config(n)
+        registry = AgentRegistry(config)
+        last = n - 1
+        target = f"Agent {n // 2}"
+        switch_number = max(10, 20000 // (n * n)) if n > 100 else 500
+        row = (
+            per_call_us(legacy_submit, config, last),
+            per_call_us(registry_submit, registry, last),
+            per_call_us(legacy_switch, config, target, number=switch_number) / n,
+            per_call_us(registry_switch, registry, target, number=500) / n,
+        )
+        print(f"{n:>7} | {row[0]:>12.2f}us {row[1]:>14.2f}us | {row[2]:>16.3f}us {row[3]:>18.3f}us")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+# CE log query cost: json.loads every line vs CEQuery (mmap + sparse time index)
+#
+#   cd main && python benchmarks/bench_ce_query.py [lines]
+#
+# Writes a synthetic ce_session_log.jsonl (default 2M lines, ~400 MB) to a temp
+# directory, then times "slot X in a 3-day window" and "all failures in a
+# 3-day window" both ways. The index build is timed separately; later
+# refreshes only index appended bytes.
+
+import datetime
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from logic.ce_query import CEQuery, TIME_FORMAT
+
+TYPES = ["prompt", "note", "macro", "url", "exec", "log"]
+STATUSES = ["OK", "OK", "OK", "QUEUED", "FAIL: Prompt not found"]
+
+
+def write_log(path, lines):
+    start = datetime.datetime(2025, 1, 1)
+    rng = random.Random(7)
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(lines):
+            event = {
+                "timestamp": (start + datetime.timedelta(seconds=i * 15)).strftime(TIME_FORMAT),
+                "source": "OTK",
+                "slot_id": f"Slot_{rng.randrange(60)}",
+                "label": "Slot",
+                "type": rng.choice(TYPES),
+                "payload": "agents/CTS_Architect/seed.md",
+                "status": rng.choice(STATUSES),
+            }
+            f.write(json.dumps(event) + "\n")
+    return start + datetime.timedelta(seconds=lines * 15)
+
+
+def full_scan(path, since, until, **match):
+    since, until = since.strftime(TIME_FORMAT), until.strftime(TIME_FORMAT)
+    hits = 0
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            event = json.loads(line)
+            if since <= event["timestamp"] <= until and all(
+                    str(event.get(k, "")).startswith(v) for k, v in match.items()):
+                hits += 1
+    return hits
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "ce_session_log.jsonl")
+        end = write_log(path, lines)
+        print(f"{lines} lines, {os.path.getsize(path) / 1e6:.0f} MB")
+        until = end - datetime.timedelta(days=30)
+        since = until - datetime.timedelta(days=3)
+
+        query = CEQuery(path)
+        _, ms = timed(query.refresh)
+        print(f"index build: {ms:.1f} ms ({len(query.entries)} entries)")
+
+        for label, match, kwargs in (("slot window", {"slot_id": "Slot_7"}, {"slot_id": "Slot_7"}),
+                                     ("failures window", {"status": "FAIL"}, {"status": "FAIL"})):
+            expected, scan_ms = timed(lambda: full_scan(path, since, until, **match))
+            got, query_ms = timed(lambda: query.count(since=since, until=until, **kwargs))
+            assert got == expected, (got, expected)
+            print(f"{label:>16}: {got:>6} hits | full scan {scan_ms:>9.1f} ms | CEQuery {query_ms:>7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# Config load cost at startup: parse every launch vs the compiled sidecar cache
+#
+#   cd main && python benchmarks/bench_config_load.py
+#
+# Generates agent YAML and deck layout JSON files of growing size in a temp
+# directory and times: PyYAML's pure-Python SafeLoader, the libyaml
+# CSafeLoader (if built), a cold config_cache load (parse + validate + write
+# the .cache sidecar) and a warm one (read the sidecar only).
+
+import json
+import os
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from logic import config_cache
+
+COLORS = ["orange", "pink", "blue", "white"]
+
+
+def write_agents(path, n):
+    config = {}
+    for i in range(n):
+        config[f"Agent {i}"] = {"color": COLORS[i % len(COLORS)], "prompt": f"Agent {i}: {{input}}"}
+        if i % 10 == 0:
+            config[f"Agent {i}"]["routing"] = {"keywords": [f"KW{i}", f"ALT{i}"], "priority": i % 5}
+    with open(path, "w", encoding="utf-8") as f:
+        yaml.dump(config, f)
+
+
+def write_layout(path, n):
+    layout = [{"slot_id": f"Slot_{i}", "label": f"Slot {i}", "type": "prompt", "payload": f"agents/{i}/seed.md",
+               "tooltip": f"Copy seed {i}", "icon": "seed.png", "row": i // 8, "col": i % 8} for i in range(n)]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(layout, f, indent=2)
+
+
+def ms(fn, number=5):
+    return min(timeit.repeat(fn, number=number, repeat=3)) / number * 1000
+
+
+def cold(path, loader):
+    def run():
+        try:
+            os.remove(path + config_cache.CACHE_SUFFIX)
+        except FileNotFoundError:
+            pass
+        loader(path)
+    return run
+
+
+def main():
+    has_c = hasattr(yaml, "CSafeLoader")
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'agents':>7} | {'SafeLoader':>11} {'CSafeLoader':>12} {'cold cache':>11} {'warm cache':>11}")
+        for n in (50, 500, 5000):
+            path = os.path.join(tmp, f"agents_{n}.yaml")
+            write_agents(path, n)
+
+            def pure(p=path):
+                with open(p, encoding="utf-8") as f:
+                    yaml.load(f, Loader=yaml.SafeLoader)
+
+            c_ms = ms(lambda: config_cache.parse_yaml(path)) if has_c else float("nan")
+            cold_ms = ms(cold(path, config_cache.load_agents))
+            config_cache.load_agents(path)
+            print(f"{n:>7} | {ms(pure):>9.2f}ms {c_ms:>10.2f}ms {cold_ms:>9.2f}ms "
+                  f"{ms(lambda: config_cache.load_agents(path), 50):>9.3f}ms")
+
+        print(f"\n{'slots':>7} | {'json.load':>11} {'cold cache':>11} {'warm cache':>11}")
+        for n in (200, 2000, 20000):
+            path = os.path.join(tmp, f"layout_{n}.json")
+            write_layout(path, n)
+            cold_ms = ms(cold(path, config_cache.load_layout))
+            config_cache.load_layout(path)
+            print(f"{n:>7} | {ms(lambda: config_cache.parse_json(path)):>9.2f}ms {cold_ms:>9.2f}ms "
+                  f"{ms(lambda: config_cache.load_layout(path), 50):>9.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# Deck grid cost: one QPushButton per slot vs the virtualized SlotGridView
+#
+#   cd main && python benchmarks/bench_deck_grid.py
+#
+# Builds both grids offscreen for growing layouts and times first show and a
+# resize. The button grid grows with the layout; the view should stay roughly
+# flat because it only paints the cells on screen.
+
+import os
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from PySide6.QtWidgets import QApplication, QGridLayout, QPushButton, QWidget
+from logic.deck_grid import SlotGridModel, SlotGridView
+from logic.hot_reload import diff_keyed
+
+QSS_FILE = Path(__file__).resolve().parents[2] / "styles" / "cognition_mode.qss"
+COLS = 8
+
+
+def make_layout(n):
+    return {f"slot_{i}": {"slot_id": f"slot_{i}", "label": f"Slot {i}", "tooltip": f"Tooltip {i}",
+                          "type": "prompt", "payload": f"prompts/{i}.txt", "row": i // COLS, "col": i % COLS}
+            for i in range(n)}
+
+
+def button_grid(slots):
+    window = QWidget()
+    grid = QGridLayout(window)
+    for slot_id, button in slots.items():
+        btn = QPushButton(button["label"])
+        btn.setToolTip(button["tooltip"])
+        btn.clicked.connect(lambda _, s=slot_id: None)
+        grid.addWidget(btn, button["row"], button["col"])
+    return window
+
+
+def view_grid(slots):
+    window = QWidget()
+    grid = QGridLayout(window)
+    model = SlotGridModel(lambda button: None, parent=window)
+    model.set_slots(slots, diff_keyed({}, slots))
+    grid.addWidget(SlotGridView(model, 24), 0, 0)
+    return window
+
+
+def measure(app, build, slots):
+    start = time.perf_counter()
+    window = build(slots)
+    window.resize(600, 400)
+    window.show()
+    app.processEvents()
+    shown = time.perf_counter() - start
+    start = time.perf_counter()
+    window.resize(900, 600)
+    app.processEvents()
+    resized = time.perf_counter() - start
+    window.close()
+    window.deleteLater()
+    app.processEvents()
+    return shown * 1000, resized * 1000
+
+
+def main():
+    app = QApplication(sys.argv)
+    if QSS_FILE.exists():
+        app.setStyleSheet(QSS_FILE.read_text(encoding="utf-8"))
+    print(f"{'slots':>7} | {'buttons show ms':>15} | {'buttons resize ms':>17} | {'view show ms':>12} | {'view resize ms':>14}")
+    for n in (100, 1000, 5000):
+        slots = make_layout(n)
+        buttons = measure(app, button_grid, slots)
+        view = measure(app, view_grid, slots)
+        print(f"{n:>7} | {buttons[0]:>15.1f} | {buttons[1]:>17.1f} | {view[0]:>12.1f} | {view[1]:>14.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+# Command palette search cost per keystroke
+#
+#   cd main && python benchmarks/bench_slot_search.py
+#
+# Builds SlotIndex over generated layouts and replays typing a few queries one
+# character at a time, reporting index build time and the worst keystroke.
+# A frame at 60 Hz is ~16 ms; the palette has to stay under it at 10,000 slots.
+
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from logic.slot_search import SlotIndex
+
+WORDS = ["architect", "reflexion", "scout", "docs", "quick", "log", "seed", "prompt", "vault", "daily",
+         "review", "macro", "export", "kanban", "search", "obsidian", "meeting", "notes", "rfp", "tender"]
+TYPES = ["prompt", "note", "macro", "url", "exec", "log"]
+QUERIES = ["arch", "rfp tender", "qlog", "dailyreview", "obs notes", "zzz"]
+
+
+def make_slots(n, rng):
+    slots = []
+    for i in range(n):
+        words = rng.sample(WORDS, 3)
+        slots.append({
+            "slot_id": f"{words[0].title()}_{words[1].title()}_{i}",
+            "label": " ".join(w.title() for w in words[:2]),
+            "tooltip": f"{rng.choice(['Copy', 'Open', 'Run'])} {' '.join(words)}",
+            "payload": f"agents/{words[0]}/{words[2]}_{i}.md",
+            "type": rng.choice(TYPES),
+        })
+    return slots
+
+
+def main():
+    rng = random.Random(3)
+    print(f"{'slots':>7} | {'build ms':>9} | {'worst keystroke ms':>19} | {'mean keystroke ms':>18}")
+    for n in (500, 2000, 10000):
+        slots = make_slots(n, rng)
+        start = time.perf_counter()
+        index = SlotIndex(slots)
+        index.set_usage({s["slot_id"]: rng.randrange(50) for s in slots[::7]})
+        build_ms = (time.perf_counter() - start) * 1000
+
+        times = []
+        for query in QUERIES:
+            for k in range(1, len(query) + 1):
+                start = time.perf_counter()
+                index.search(query[:k])
+                times.append((time.perf_counter() - start) * 1000)
+            # Backspacing through the query hits the remembered prefixes
+            for k in range(len(query) - 1, 0, -1):
+                start = time.perf_counter()
+                index.search(query[:k])
+                times.append((time.perf_counter() - start) * 1000)
+        print(f"{n:>7} | {build_ms:>9.1f} | {max(times):>19.2f} | {sum(times) / len(times):>18.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# Agent switch cost in the OTK HUD: AgentSwitcher vs per-tab setStyleSheet
+#
+#   cd main && python benchmarks/bench_switch_context.py
+#
+# Builds both switchers offscreen for growing agent counts and times the
+# highlight update of one switch. AgentSwitcher should stay flat; the legacy
+# QTabWidget restyles every tab's button on every switch.
+
+import os
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from PySide6.QtWidgets import QApplication, QTabWidget, QWidget, QPushButton, QVBoxLayout
+from logic.agents import AgentRegistry
+from logic.agent_switcher import AgentSwitcher
+
+QSS_FILE = Path(__file__).resolve().parents[2] / "styles" / "agent_switcher.qss"
+COLORS = ["orange", "pink", "blue", "white"]
+
+
+def make_registry(n):
+    return AgentRegistry({f"Agent {i}": {"color": COLORS[i % len(COLORS)], "prompt": "{input}"} for i in range(n)})
+
+
+def legacy_switcher(agents):
+    switcher = QTabWidget()
+    for name in agents:
+        tab = QWidget()
+        tab_layout = QVBoxLayout(tab)
+        tab_layout.addWidget(QPushButton(name))
+        switcher.addTab(tab, name)
+    return switcher
+
+
+def legacy_switch(switcher, agents, agent_name):
+    for i in range(switcher.count()):
+        btn = switcher.widget(i).layout().itemAt(0).widget()
+        record = agents.record_at(i)
+        color = record.color if agent_name == record.name else 'lightgray'
+        btn.setStyleSheet(f"background-color: {color}; border-radius: 5px;")
+
+
+def time_switches(switch, rounds):
+    start = time.perf_counter()
+    for r in range(rounds):
+        switch(r)
+        QApplication.processEvents()
+    return (time.perf_counter() - start) / rounds * 1000
+
+
+def main():
+    app = QApplication(sys.argv)
+    qss = QSS_FILE.read_text(encoding="utf-8") if QSS_FILE.exists() else ""
+
+    print(f"{'agents':>7} | {'legacy ms/switch':>17} | {'AgentSwitcher ms/switch':>24}")
+    for n in (4, 16, 100, 250, 1000):
+        agents = make_registry(n)
+
+        legacy = legacy_switcher(agents)
+        legacy.show()
+        legacy_ms = time_switches(lambda r: legacy_switch(legacy, agents, agents.name_at(r % n)), 20)
+        legacy.close()
+
+        segmented = AgentSwitcher(agents, qss)
+        segmented.show()
+        new_ms = time_switches(lambda r: segmented.setCurrentIndex(r % n), 200)
+        segmented.close()
+
+        print(f"{n:>7} | {legacy_ms:>17.3f} | {new_ms:>24.3f}")
+
+
+if __name__ == "__main__":
+    main()
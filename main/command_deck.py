@@ -1,24 +1,54 @@
-import sys, json, os, datetime, webbrowser, subprocess
+import sys, os, datetime, webbrowser, threading
 from pathlib import Path
 
 from PySide6.QtWidgets import (
-    QApplication, QWidget, QPushButton, QGridLayout, QLabel
+    QApplication, QWidget, QPushButton, QGridLayout, QMenu
 )
-from PySide6.QtCore import QTimer, Qt, QPropertyAnimation, QRect
-from PySide6.QtGui import QIcon, QShortcut, QKeySequence
+from PySide6.QtCore import QTimer
+from PySide6.QtGui import QShortcut, QKeySequence
+
+from logic.log_pipeline import LogPipeline, TextSink, JsonlSink
+from logic.executor import ActionExecutor
+from logic.worker_pool import WorkerPool
+from logic.payload_cache import PayloadCache, payload_key
+from logic.hot_reload import ConfigWatcher, diff_keyed
+from logic import config_cache
+from logic.icon_service import IconService
+from logic.segments import SegmentStore
+from logic.usage_stats import UsageStats
+from logic.stats_panel import UsageStatsPanel
+from logic.latency import LatencyRecorder
+from logic.perf_hud import PerfHud
+from logic.toasts import ToastManager
+from logic.slot_search import SlotIndex
+from logic.command_palette import CommandPalette
+from logic.deck_grid import SlotGridModel, SlotGridView
+from logic.process_manager import ProcessManager, command_line, DEFAULT_INSTANCES, FAILED, FOCUSED, LAUNCHED, LIMITED
+from logic.process_panel import ProcessPanel
 
 # Paths
 BASE_DIR = Path(__file__).resolve().parents[1]
-LAYOUT_FILE = BASE_DIR / "data" / "OTK.json"
+LAYOUT_FILE = BASE_DIR / "data" / "OTK_layout.json"  # Watched; edits apply without a restart
 QSS_FILE = BASE_DIR / "styles" / "cognition_mode.qss"
 LIGHT_QSS_FILE = BASE_DIR / "styles" / "cognition_mode_light.qss"
+ICON_DIR = BASE_DIR / "resources" / "icons"
+ICON_CACHE_DIR = BASE_DIR / "cache" / "icons"  # Pre-scaled PNGs, safe to delete
+ICON_SIZE = 24  # logical px; scaled for the screen's device pixel ratio
 LOG_DIR = BASE_DIR / "logs"
 LOG_FILE = LOG_DIR / "OTK_usage.log"
+METRICS_FILE = LOG_DIR / "OTK_metrics.jsonl"  # one latency record per action
+PERF_HUD_SHORTCUT = "F12"
+PALETTE_SHORTCUT = "Ctrl+K"
 CE_LOG_FILE = BASE_DIR.parents[1] / "Cognition_Engine" / "logs" / "ce_session_log.jsonl"
-
-# Global toast stack
-toast_stack = []
-
+LOG_FLUSH_MS = 1000
+LOG_MAX_BYTES = 5_000_000
+LOG_BACKUPS = 5
+MACRO_TIMEOUT = 300  # seconds; override per slot with "timeout"
+MAX_PARALLEL_ACTIONS = 4
+MACRO_WORKERS = 2        # warm interpreters kept for macro slots
+MACRO_WORKER_RUNS = 50   # recycle a worker after this many scripts
+PAYLOAD_CACHE_BYTES = 8 * 1024 * 1024
+FILE_PAYLOAD_TYPES = ("prompt", "note", "macro")
 
 class CommandDeck(QWidget):
     def __init__(self):
@@ -28,14 +58,46 @@ class CommandDeck(QWidget):
         self.setLayout(self.layout)
         self.is_dark = True
         self.load_stylesheet()
+        self.toasts = ToastManager(self, dark=self.is_dark)
         LOG_DIR.mkdir(exist_ok=True)
+        self.init_logging()
+        self.init_latency()
+        self.init_executor()
+        self.init_processes()
+        self.payloads = PayloadCache(max_bytes=PAYLOAD_CACHE_BYTES, parent=self)
+        self.payloads.availability_changed.connect(self.on_payload_availability)
+        self.icons = IconService(ICON_CACHE_DIR, parent=self)
+        QApplication.instance().aboutToQuit.connect(self.icons.close)
+        # Connected after the other shutdown hooks, so what they log (CANCELLED jobs) is flushed too
+        QApplication.instance().aboutToQuit.connect(self.logs.close)
         self.build_ui()
+        self.config_watcher = ConfigWatcher(parent=self)
+        self.config_watcher.changed.connect(self.reload_layout)
+        self.config_watcher.watch(LAYOUT_FILE)
 
         # Add theme toggle button
         self.toggle_btn = QPushButton("🌙")
         self.toggle_btn.setToolTip("Toggle Light/Dark Theme")
         self.toggle_btn.clicked.connect(self.toggle_theme)
-        self.layout.addWidget(self.toggle_btn, 99, 0, 1, 3)
+        self.layout.addWidget(self.toggle_btn, 99, 0, 1, 2)
+
+        # Usage stats; the aggregator only parses lines logged since it last looked
+        self.usage_stats = UsageStats(LOG_FILE)
+        self.stats_panel = None
+        self.stats_btn = QPushButton("📊")
+        self.stats_btn.setToolTip("Usage stats")
+        self.stats_btn.clicked.connect(self.show_stats)
+        self.layout.addWidget(self.stats_btn, 99, 2)
+        self.process_panel = None
+        self.processes_btn = QPushButton("🖥️")
+        self.processes_btn.setToolTip("Running exec slots and their output")
+        self.processes_btn.clicked.connect(self.show_processes)
+        self.layout.addWidget(self.processes_btn, 99, 3)
+
+        # Command palette over the slot index built in apply_layout
+        self.palette = CommandPalette(self)
+        self.palette.slot_chosen.connect(self.on_palette_chosen)
+        QShortcut(QKeySequence(PALETTE_SHORTCUT), self).activated.connect(self.show_palette)
 
     def load_stylesheet(self):
         qss_file = QSS_FILE if self.is_dark else LIGHT_QSS_FILE
@@ -47,40 +109,223 @@ class CommandDeck(QWidget):
         self.is_dark = not self.is_dark
         self.toggle_btn.setText("🌙" if self.is_dark else "☀️")
         self.load_stylesheet()
-        Toast(self, f"Theme: {'Dark' if self.is_dark else 'Light'}", self.is_dark)
+        self.toasts.set_dark(self.is_dark)
+        self.toasts.show(f"Theme: {'Dark' if self.is_dark else 'Light'}")
+
+    def show_stats(self):
+        if self.stats_panel is None:
+            self.stats_panel = UsageStatsPanel(self.usage_stats, before_refresh=self.logs.flush, parent=self)
+        self.stats_panel.show()
+        self.stats_panel.raise_()
+
+    def show_palette(self):
+        # Rank by what has actually been used, as of the last flushed log line
+        self.logs.flush()
+        self.usage_stats.refresh()
+        self.slot_index.set_usage({slot_id: c['total'] for slot_id, c in self.usage_stats.slots.items()})
+        self.palette.open(self.slot_index, {s: b["label"] for s, b in self.slots_by_id.items()})
+
+    def on_palette_chosen(self, slot_id):
+        button = self.slots_by_id.get(slot_id)
+        if button is not None:
+            self.handle_click(button)
+
+    def show_processes(self):
+        if self.process_panel is None:
+            self.process_panel = ProcessPanel(self.processes, parent=self)
+        self.process_panel.show()
+        self.process_panel.raise_()
 
     def build_ui(self):
+        self.slots_by_id = {}
+        self.slot_index = SlotIndex([])
+        self.slot_shortcuts = {}  # slot_id -> QShortcut, for slots that declare one
+        self.payload_slots = {}   # payload path -> [slot_id]
+        # Slots are cells of a model; the view only paints (and fetches icons for) what is on screen
+        self.slot_model = SlotGridModel(self.request_slot_icon, parent=self)
+        self.grid = SlotGridView(self.slot_model, ICON_SIZE)
+        self.grid.slot_clicked.connect(lambda s: self.handle_click(self.slots_by_id[s]))
+        self.grid.slot_menu_requested.connect(lambda s, pos: self.show_slot_menu(self.slots_by_id[s], pos))
+        self.layout.addWidget(self.grid, 0, 0, 1, 4)
+        layout = self.read_layout()
+        if layout is None:
+            return
+        self.warm_macro_pool(layout)
+        self.apply_layout(layout)
+
+    def read_layout(self):
         try:
-            with open(LAYOUT_FILE, "r", encoding="utf-8") as f:
-                layout = json.load(f)
+            # Validated once per edit; later launches read the compiled sidecar
+            return config_cache.load_layout(LAYOUT_FILE)
         except Exception as e:
             print(f"Error loading layout: {e}")
+            return None
+
+    def reload_layout(self, path=None):
+        layout = self.read_layout()
+        if layout is None:
+            return  # Keep the last good layout until the file is fixed
+        diff = self.apply_layout(layout)
+        if diff.added or diff.removed or diff.changed:
+            touched = [self.slots_by_id[s] for s in diff.added + diff.changed]
+            if any(b.get("type") == "macro" and b.get("preload") for b in touched):
+                self.warm_macro_pool(touched)
+            self.toasts.show(f"🔄 Layout reloaded: +{len(diff.added)} -{len(diff.removed)} ~{len(diff.changed)}")
+
+    def apply_layout(self, layout):
+        """Update the slot model and only the shortcuts that differ from what is live."""
+        new = {b["slot_id"]: b for b in layout}
+        diff = diff_keyed(self.slots_by_id, new)
+        if not (diff.added or diff.removed or diff.changed):
+            return diff
+
+        old, self.slots_by_id = self.slots_by_id, new
+        self.slot_model.set_slots(new, diff)
+        for slot_id in diff.removed:
+            self.drop_shortcut(slot_id)
+        for slot_id in diff.changed:
+            if old[slot_id].get("shortcut") != new[slot_id].get("shortcut"):
+                self.drop_shortcut(slot_id)
+                self.make_shortcut(slot_id, new[slot_id])
+        for slot_id in diff.added:
+            self.make_shortcut(slot_id, new[slot_id])
+        self.slot_index = SlotIndex(new.values())
+
+        self.payload_slots = {}
+        for slot_id, button in new.items():
+            if button.get("type") in FILE_PAYLOAD_TYPES:
+                key = payload_key(BASE_DIR / button["payload"])
+                self.payload_slots.setdefault(key, []).append(slot_id)
+
+        # Read prompt seeds and check note/macro targets off the GUI thread
+        touched = [new[s] for s in diff.added + diff.changed]
+        self.payloads.preload(
+            text_paths=[BASE_DIR / b["payload"] for b in touched if b.get("type") == "prompt"],
+            stat_paths=[BASE_DIR / b["payload"] for b in touched if b.get("type") in ("note", "macro")],
+        )
+        for button in touched:
+            if button.get("type") in FILE_PAYLOAD_TYPES:
+                # Payloads the cache already knows about won't signal again
+                exists = self.payloads.known(BASE_DIR / button["payload"])
+                if exists is not None:
+                    self.slot_model.set_available(button["slot_id"], exists)
+        return diff
+
+    def request_slot_icon(self, button):
+        # Optional icon support; asked for by the model when the slot's cell is first painted
+        self.icons.request(ICON_DIR / button["icon"], ICON_SIZE, self.devicePixelRatioF(),
+                           lambda icon, s=button["slot_id"], name=button["icon"]: self.slot_model.set_icon(s, name, icon))
+
+    def make_shortcut(self, slot_id, button):
+        # Optional shortcut support
+        if "shortcut" not in button:
             return
-
-        for button in layout:
-            btn = QPushButton(button["label"])
-            btn.setToolTip(button.get("tooltip", ""))
-
-            # Optional icon support
-#            icon_path = BASE_DIR / "resources" / "icons" / button.get("icon", "")
-#            if icon_path.exists():
-#                btn.setIcon(QIcon(str(icon_path)))
-
-            # Click handler
-            btn.clicked.connect(lambda _, b=button: self.handle_click(b))
-            self.layout.addWidget(btn, button.get("row", 0), button.get("col", 0))
-
-            # Optional shortcut support
-            if "shortcut" in button:
-                shortcut = QShortcut(QKeySequence(button["shortcut"]), self)
-                shortcut.activated.connect(lambda b=button: self.handle_click(b))
+        shortcut = QShortcut(QKeySequence(button["shortcut"]), self)
+        shortcut.activated.connect(lambda s=slot_id: self.handle_click(self.slots_by_id[s]))
+        self.slot_shortcuts[slot_id] = shortcut
+
+    def drop_shortcut(self, slot_id):
+        shortcut = self.slot_shortcuts.pop(slot_id, None)
+        if shortcut is not None:
+            shortcut.setEnabled(False)
+            shortcut.deleteLater()
+
+    def on_payload_availability(self, path, exists):
+        for slot_id in self.payload_slots.get(path, []):
+            self.slot_model.set_available(slot_id, exists)
+
+    def init_logging(self):
+        self.logs = LogPipeline(on_error=self.on_log_error)
+        self.logs.add_sink("usage", TextSink(LOG_FILE, max_bytes=LOG_MAX_BYTES, daily=True, backups=LOG_BACKUPS))
+        # CE history rolls into gzip segments next to the log and is never aged out
+        self.ce_segments = SegmentStore(CE_LOG_FILE)
+        self.logs.add_sink("ce", JsonlSink(CE_LOG_FILE, max_bytes=LOG_MAX_BYTES, daily=True,
+                                           archive=self.ce_segments))
+        self.log_timer = QTimer(self)
+        self.log_timer.timeout.connect(self.logs.flush)
+        self.log_timer.start(LOG_FLUSH_MS)
+
+    def on_log_error(self, sink_name, error):
+        if sink_name == "ce":
+            timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            self.logs.emit("usage", (timestamp, "CE_LOG_FAIL", error))
+        else:
+            print(f"Log write failed ({sink_name}): {error}")
+
+    def init_executor(self):
+        self.executor = ActionExecutor(max_workers=MAX_PARALLEL_ACTIONS, parent=self)
+        self.executor.job_finished.connect(self.on_job_finished)
+        QApplication.instance().aboutToQuit.connect(self.executor.shutdown)
+        self.macro_pool = WorkerPool(size=MACRO_WORKERS, max_runs=MACRO_WORKER_RUNS)
+        QApplication.instance().aboutToQuit.connect(self.macro_pool.shutdown)
+
+    def on_job_finished(self, job):
+        button = self.slots_by_id.get(job.slot_id, {"slot_id": job.slot_id, "label": job.label, "type": "macro"})
+        self.log_action(button, job.describe())
+        trace = self.macro_traces.pop(job.job_id, None)
+        if trace is not None:
+            # The click's own trace, so the slot's total covers queueing and the run itself
+            if job.started_at is not None:
+                trace.add("run", job.duration * 1000)
+            trace.finish(job.describe())
+        if job.ok:
+            self.toasts.show(f"✅ Finished: {job.label} ({job.duration:.1f}s)")
+        else:
+            self.toasts.show(f"❌ {job.label}: {job.describe()}", duration=4000)
+
+    def init_processes(self):
+        # exec slots: every child is tracked, its output kept and its exit reaped
+        self.processes = ProcessManager(parent=self)
+        self.processes.process_exited.connect(self.on_process_exited)
+
+    def on_process_exited(self, process):
+        if process.status != FAILED:
+            return
+        # CE log only: the usage log already counted this launch when it was clicked
+        self.logs.emit("ce", {
+            "timestamp": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "source": "OTK",
+            "slot_id": process.slot_id,
+            "label": process.label,
+            "type": "exec",
+            "payload": self.slots_by_id.get(process.slot_id, {}).get("payload"),
+            "status": process.describe(),
+        })
+        self.toasts.show(f"❌ {process.label}: exited with code {process.returncode}", duration=4000)
+
+    def init_latency(self):
+        self.logs.add_sink("metrics", JsonlSink(METRICS_FILE, max_bytes=LOG_MAX_BYTES, backups=LOG_BACKUPS))
+        self.latency = LatencyRecorder(on_trace=lambda record: self.logs.emit("metrics", record))
+        self.macro_traces = {}  # job_id -> ActionTrace, finished when the job reports back
+        self.perf_hud = PerfHud(self.latency, self)
+        QShortcut(QKeySequence(PERF_HUD_SHORTCUT), self).activated.connect(self.perf_hud.toggle)
+
+    def show_slot_menu(self, button, pos):
+        slot_id = button["slot_id"]
+        running = self.executor.jobs(slot_id) + self.processes.running(slot_id)
+        menu = QMenu(self)
+        cancel = menu.addAction(f"⏹ Cancel running ({len(running)})")
+        cancel.setEnabled(bool(running))
+        output = menu.addAction("🖥️ Show processes")
+        output.setVisible(button.get("type") == "exec")
+        chosen = menu.exec(pos)
+        if chosen == cancel:
+            self.executor.cancel_slot(slot_id)
+            for process in self.processes.running(slot_id):
+                self.processes.terminate(process.proc_id)
+        elif chosen == output:
+            self.show_processes()
+
+    def warm_macro_pool(self, layout):
+        # Per-slot "preload" lists are imported once, off the GUI thread
+        preloads = sorted({m for b in layout if b.get("type") == "macro" for m in b.get("preload", [])})
+        threading.Thread(target=self.macro_pool.warm, args=(preloads,), daemon=True).start()
 
     def log_action(self, button, status="OK"):
         timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
         # Flat text log
-        with open(LOG_FILE, "a", encoding="utf-8") as log:
-            log.write(f"{timestamp} | {button['slot_id']} | {button['type']} | {status}\n")
+        self.logs.emit("usage", (timestamp, button['slot_id'], button['type'], status))
 
         # CE structured log
         event = {
@@ -92,49 +337,80 @@ class CommandDeck(QWidget):
             "payload": button.get("payload"),
             "status": status
         }
-        try:
-            CE_LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
-            with open(CE_LOG_FILE, "a", encoding="utf-8") as ce_log:
-                ce_log.write(json.dumps(event) + "\n")
-        except Exception as e:
-            with open(LOG_FILE, "a", encoding="utf-8") as log:
-                log.write(f"{timestamp} | CE_LOG_FAIL | {e}\n")
+        self.logs.emit("ce", event)
 
     def handle_click(self, button):
         action_type = button["type"]
         target = button["payload"]
+        status = "OK"
+        trace = self.latency.start(button["slot_id"], action_type)
 
         try:
             if action_type == "prompt":
                 full_path = BASE_DIR / target
-                if not full_path.exists():
+                with trace.stage("resolve"):
+                    found = self.payloads.exists(full_path)
+                if not found:
                     raise FileNotFoundError(f"Prompt not found: {target}")
-                with open(full_path, "r", encoding="utf-8") as f:
-                    text = f.read()
-                QApplication.clipboard().setText(text)
-                Toast(self, f"✅ Copied: {button['label']}", self.is_dark)
+                with trace.stage("read"):
+                    text = self.payloads.read_text(full_path)
+                with trace.stage("clipboard"):
+                    QApplication.clipboard().setText(text)
+                self.toasts.show(f"✅ Copied: {button['label']}")
 
             elif action_type == "note":
                 full_path = BASE_DIR / target
-                if not full_path.exists():
+                with trace.stage("resolve"):
+                    found = self.payloads.exists(full_path)
+                if not found:
                     raise FileNotFoundError(f"Note not found: {target}")
-                os.startfile(full_path)
-                Toast(self, f"📄 Opened: {button['label']}", self.is_dark)
+                with trace.stage("spawn"):
+                    os.startfile(full_path)
+                self.toasts.show(f"📄 Opened: {button['label']}")
 
             elif action_type == "macro":
                 full_path = BASE_DIR / target
-                if not full_path.exists():
+                with trace.stage("resolve"):
+                    found = self.payloads.exists(full_path)
+                if not found:
                     raise FileNotFoundError(f"Script not found: {target}")
-                os.system(f'python "{full_path}"')
-                Toast(self, f"▶️ Ran: {button['label']}", self.is_dark)
+                timeout = button.get("timeout", MACRO_TIMEOUT)
+                with trace.stage("spawn"):
+                    if button.get("isolated"):
+                        # Opt-out for scripts that need a pristine interpreter
+                        job = self.executor.submit(button["slot_id"], button["label"],
+                                                   [sys.executable, str(full_path)], timeout=timeout)
+                    else:
+                        run = lambda job, p=full_path, pre=tuple(button.get("preload", [])): self.macro_pool.run(job, p, pre)
+                        job = self.executor.submit(button["slot_id"], button["label"], timeout=timeout, runner=run)
+                self.macro_traces[job.job_id] = trace
+                status = "QUEUED"  # Final status and run time are logged by on_job_finished
+                self.toasts.show(f"▶️ Started: {button['label']}")
 
             elif action_type == "url":
-                webbrowser.open(target)
-                Toast(self, f"🌐 Opened: {button['label']}", self.is_dark)
+                with trace.stage("spawn"):
+                    webbrowser.open(target)
+                self.toasts.show(f"🌐 Opened: {button['label']}")
 
             elif action_type == "exec":
-                subprocess.Popen([target], shell=True)
-                Toast(self, f"⚙️ Launched: {button['label']}", self.is_dark)
+                # Optional: "instances" (N, "single" or "focus"), "args", "shell" (default true), "capture"
+                argv, shell = command_line(target, button.get("args", []), button.get("shell", True))
+                with trace.stage("spawn"):
+                    outcome, process = self.processes.launch(
+                        button["slot_id"], button["label"], argv,
+                        instances=button.get("instances", DEFAULT_INSTANCES), shell=shell,
+                        capture=button.get("capture", False))
+                if outcome == LAUNCHED:
+                    self.toasts.show(f"⚙️ Launched: {button['label']}")
+                elif outcome == FOCUSED:
+                    status = "FOCUSED"
+                    self.toasts.show(f"🔁 Already running: {button['label']}")
+                elif outcome == LIMITED:
+                    # Refused by the slot's "instances" policy; a failed launch raises and is logged as FAIL
+                    status = "LIMITED"
+                    self.toasts.show(f"⛔ {button['label']} already running (pid {process.pid})", duration=4000)
+                else:
+                    raise RuntimeError(f"unexpected launch outcome {outcome!r}")
 
             elif action_type == "log":
                 note = {
@@ -145,72 +421,21 @@ class CommandDeck(QWidget):
                     "type": "log",
                     "message": target
                 }
-                with open(CE_LOG_FILE, "a", encoding="utf-8") as ce_log:
-                    ce_log.write(json.dumps(note) + "\n")
-                Toast(self, f"📝 Logged: {target}", self.is_dark)
+                with trace.stage("log"):
+                    self.logs.emit("ce", note)
+                self.toasts.show(f"📝 Logged: {target}")
 
             else:
-                Toast(self, f"⚠️ Unknown action: {action_type}", self.is_dark, duration=4000)
-
-            self.log_action(button, "OK")
+                self.toasts.show(f"⚠️ Unknown action: {action_type}", duration=4000)
 
         except Exception as e:
-            self.log_action(button, f"FAIL: {e}")
-            Toast(self, f"❌ Failed: {button['label']}", self.is_dark, duration=4000)
-
-
-class Toast(QLabel):
-    def __init__(self, parent, message, dark=True, duration=2000):
-        super().__init__(parent)
-        global toast_stack
-
-        # Style by theme
-        bg = "rgba(50, 50, 50, 220)" if dark else "rgba(240, 240, 240, 220)"
-        color = "white" if dark else "black"
-        self.setText(message)
-        self.setStyleSheet(f"""
-            background-color: {bg};
-            color: {color};
-            border-radius: 8px;
-            padding: 8px 12px;
-            font-size: 13px;
-        """)
-        self.setWindowFlags(Qt.ToolTip | Qt.FramelessWindowHint)
-        self.adjustSize()
-
-        # Compute stacked position
-        parent_rect = parent.geometry()
-        index = len(toast_stack)
-        x = parent_rect.width() - self.width() - 20
-        y = parent_rect.height() - self.height() - 20 - (index * (self.height() + 10))
-        self.setGeometry(QRect(x, y, self.width(), self.height()))
-        toast_stack.append(self)
-
-        # Fade in
-        self.setWindowOpacity(0.0)
-        self.show()
-        self.anim = QPropertyAnimation(self, b"windowOpacity")
-        self.anim.setDuration(300)
-        self.anim.setStartValue(0.0)
-        self.anim.setEndValue(1.0)
-        self.anim.start()
-
-        # Auto close
-        QTimer.singleShot(duration, self.fade_out)
-
-    def fade_out(self):
-        self.anim = QPropertyAnimation(self, b"windowOpacity")
-        self.anim.setDuration(500)
-        self.anim.setStartValue(1.0)
-        self.anim.setEndValue(0.0)
-        self.anim.finished.connect(self.cleanup)
-        self.anim.start()
-
-    def cleanup(self):
-        global toast_stack
-        if self in toast_stack:
-            toast_stack.remove(self)
-        self.close()
+            status = f"FAIL: {e}"
+            self.toasts.show(f"❌ Failed: {button['label']}", duration=4000)
+
+        with trace.stage("log"):
+            self.log_action(button, status)
+        if status != "QUEUED":
+            trace.finish(status)
 
 
 if __name__ == "__main__":
@@ -5,10 +5,8 @@ from datetime import datetime
 from PySide6.QtWidgets import (QApplication, QMainWindow, QTabWidget, QPushButton,
                                QVBoxLayout, QWidget, QLabel, QStatusBar, QLineEdit)
 from PySide6.QtCore import Qt
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-from io import BytesIO
-from PIL import Image  # Assuming Pillow for PNG export; if not, fallback to savefig
+from logic import qt_charts
+from logic.agents import AgentRegistry
 
 class CommandDeck(QMainWindow):
     def __init__(self):
@@ -27,7 +25,7 @@ class CommandDeck(QMainWindow):
         config_file = 'agents.yaml'
         if os.path.exists(config_file):
             with open(config_file, 'r') as f:
-                return yaml.safe_load(f)
+                return AgentRegistry(yaml.safe_load(f))
         # Default
         defaults = {
             'Architect': {'color': 'orange', 'prompt': 'CTS: Architect {input}'},
@@ -37,7 +35,7 @@ class CommandDeck(QMainWindow):
         }
         with open(config_file, 'w') as f:
             yaml.dump(defaults, f)
-        return defaults
+        return AgentRegistry(defaults)
 
     def build_ui(self):
         central = QWidget()
@@ -48,7 +46,7 @@ class CommandDeck(QMainWindow):
         switcher_label = QLabel("Context Switcher")
         layout.addWidget(switcher_label)
         self.switcher = QTabWidget()
-        agent_order = list(self.agents.keys())
+        agent_order = self.agents.names
         for i, agent_name in enumerate(agent_order):
             tab = QWidget()
             btn = QPushButton(agent_name)
@@ -102,19 +100,19 @@ class CommandDeck(QMainWindow):
         self.start_time = now
 
         if 'RFP' in text.upper():
-            rfp_index = list(self.agents.keys()).index('RFP Scout')
+            rfp_index = self.agents.index_of('RFP Scout')
             self.switcher.setCurrentIndex(rfp_index)
             self.switch_context('RFP Scout')  # Sync active_agent
             self.status_bar.showMessage("Swarm: Routed to RFP Scout")
 
     def on_prompt_submit(self):
-        agent_name = list(self.agents.keys())[self.switcher.currentIndex()]
+        agent_name = self.agents.name_at(self.switcher.currentIndex())
         self.switch_context(agent_name)  # Sync
         input_text = self.prompt_edit.text()
         full_prompt = self.agents[agent_name]['prompt'].format(input=input_text)
         self.submit_count[agent_name] += 1
         if self.submit_count[agent_name] > 5:  # Fatigue rotate
-            next_agent = list(self.agents.keys())[(list(self.agents.keys()).index(agent_name) + 1) % len(self.agents)]
+            next_agent = self.agents.next_after(agent_name)
             self.switch_context(next_agent)
             self.status_bar.showMessage(f"Fatigue: Rotated to {next_agent}")
 
@@ -136,7 +134,7 @@ class CommandDeck(QMainWindow):
             tab_widget = self.switcher.widget(i)
             btn = tab_widget.layout().itemAt(0).widget()
             btn.setStyleSheet("background-color: {}; border-radius: 5px;".format(
-                self.agents[agent_name]['color'] if agent_name == self.agents[list(self.agents.keys())[i]]['color'] else 'gray' if i == self.switcher.currentIndex() else 'lightgray'))
+                self.agents[agent_name]['color'] if agent_name == self.agents.record_at(i).color else 'gray' if i == self.switcher.currentIndex() else 'lightgray'))
 
     def update_thread(self):
         summary = f"Session pulse: Active {self.active_agent}, {sum(self.submit_count.values())} submits"
@@ -172,19 +170,9 @@ class CommandDeck(QMainWindow):
         self.close()
 
     def generate_handoff(self):
-        # Ritual: PNG mindmap of open loops
-        fig, ax = plt.subplots(figsize=(4, 4))
-        ax.add_patch(patches.Circle((0.5, 0.5), 0.4, color='lightblue'))
-        ax.text(0.5, 0.5, f'Open: {self.parse_ce_unresolved()} Threads\nActive: {self.active_agent}', ha='center', va='center')
-        for i, agent in enumerate(self.agents.keys()):
-            ax.text(0.5 + 0.3 * (i % 2 - 0.5), 0.5 + 0.2 * (i // 2 - 0.5), agent, fontsize=8)
-        ax.axis('off')
-        buf = BytesIO()
-        plt.savefig(buf, format='png', bbox_inches='tight')
-        buf.seek(0)
-        img = Image.open(buf)
-        img.save('handoff_mindmap.png')
-        plt.close()
+        # Ritual: PNG mindmap of open loops, painted straight to a QImage
+        center = f'Open: {self.parse_ce_unresolved()} Threads\nActive: {self.active_agent}'
+        qt_charts.render_mindmap('handoff_mindmap.png', center, list(self.agents.names))
         self.status_bar.showMessage("Handoff PNG generated")
 
     def log_to_ce(self, content, agent):
@@ -0,0 +1,85 @@
+# Fixed-capacity activity telemetry for the Prompt Bay
+#
+# on_prompt_change() used to append a dict with a datetime per keystroke to an
+# unbounded list, and quick_runbook re-averaged the whole list. ActivityRing
+# keeps the last `capacity` samples in preallocated arrays (monotonic time,
+# cadence, agent id) and maintains the running aggregates as samples arrive,
+# so memory stays flat for however long the session runs.
+
+import time
+from array import array
+from datetime import datetime, timedelta
+
+
+class ActivityRing:
+    def __init__(self, capacity=4096, ewma_alpha=0.1):
+        self.capacity = capacity
+        self.ewma_alpha = ewma_alpha
+        self._times = array('d', bytes(8 * capacity))
+        self._cadence = array('d', bytes(8 * capacity))
+        self._agent_ids = array('H', bytes(2 * capacity))
+        self._agent_names = []
+        self._agent_index = {}
+        self._head = 0      # next write position
+        self._size = 0
+        # Lifetime aggregates (survive eviction from the ring)
+        self.count = 0
+        self.total = 0.0
+        self.ewma = 0.0
+        # Aggregates over what's currently in the ring
+        self._window_total = 0.0
+        # Anchor for turning monotonic stamps back into wall-clock times
+        self._mono0 = time.monotonic()
+        self._wall0 = datetime.now()
+
+    def __len__(self):
+        return self._size
+
+    def append(self, cadence, agent, now=None):
+        now = time.monotonic() if now is None else now
+        agent_id = self._agent_index.get(agent)
+        if agent_id is None:
+            agent_id = self._agent_index[agent] = len(self._agent_names)
+            self._agent_names.append(agent)
+
+        i = self._head
+        if self._size == self.capacity:
+            self._window_total -= self._cadence[i]
+        else:
+            self._size += 1
+        self._times[i] = now
+        self._cadence[i] = cadence
+        self._agent_ids[i] = agent_id
+        self._head = (i + 1) % self.capacity
+
+        self._window_total += cadence
+        self.ewma = cadence if self.count == 0 else self.ewma + self.ewma_alpha * (cadence - self.ewma)
+        self.count += 1
+        self.total += cadence
+
+    @property
+    def mean(self):
+        """Lifetime mean cadence."""
+        return self.total / max(self.count, 1)
+
+    @property
+    def window_mean(self):
+        return self._window_total / max(self._size, 1)
+
+    def percentile(self, q):
+        """q-th percentile (0-100) of cadence over the samples currently in the ring."""
+        if not self._size:
+            return 0.0
+        values = sorted(self._cadence[:self._size])
+        rank = (len(values) - 1) * q / 100.0
+        lo = int(rank)
+        hi = min(lo + 1, len(values) - 1)
+        return values[lo] + (values[hi] - values[lo]) * (rank - lo)
+
+    def __iter__(self):
+        """Yield (wall-clock datetime, cadence, agent) oldest first."""
+        start = (self._head - self._size) % self.capacity
+        for k in range(self._size):
+            i = (start + k) % self.capacity
+            wall = self._wall0 + timedelta(seconds=self._times[i] - self._mono0)
+            yield wall, self._cadence[i], self._agent_names[self._agent_ids[i]]
@@ -0,0 +1,118 @@
+# Segmented agent switcher for the OTK HUD
+#
+# Replaces the QTabWidget whose every page held a QWidget + layout +
+# QPushButton, and whose highlight was redone with setStyleSheet() on every
+# tab per switch. Here each agent is one flat QPushButton in a scrollable row.
+# The highlight is the dynamic property active=true, matched by the
+# QPushButton#agentSegment selectors in styles/agent_switcher.qss, so a switch
+# only re-polishes the previously active and the newly active segment. That
+# stylesheet is set on the switcher itself and leaves the rest of the HUD be.
+# apply() updates the segments in place when otk_agents.yaml is hot-reloaded.
+
+from PySide6.QtCore import Qt, Signal
+from PySide6.QtWidgets import QScrollArea, QWidget, QHBoxLayout, QPushButton, QFrame
+
+
+def _color_rules(agents):
+    # Agent colours come from otk_agents.yaml, so their selectors are generated
+    # once here rather than living in the .qss files
+    colors = sorted({record.color for record in (agents.record_at(i) for i in range(len(agents)))})
+    return "\n".join(
+        f'QPushButton#agentSegment[active="true"][agentColor="{c}"] {{ background-color: {c}; color: black; }}'
+        for c in colors
+    )
+
+
+class AgentSwitcher(QScrollArea):
+    agent_selected = Signal(str)
+
+    def __init__(self, agents, stylesheet="", parent=None):
+        super().__init__(parent)
+        self._stylesheet = stylesheet  # agentSegment rules, scoped to this widget
+        self._current = -1
+        self._buttons = []
+        self._by_name = {}
+
+        row = QWidget()
+        row.setObjectName("agentSwitcherRow")
+        self._row_layout = layout = QHBoxLayout(row)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(4)
+        for i in range(len(agents)):
+            btn = self._make_button(agents.record_at(i))
+            layout.addWidget(btn)
+            self._buttons.append(btn)
+        layout.addStretch(1)
+
+        self.setWidget(row)
+        self.setWidgetResizable(True)
+        self.setFrameShape(QFrame.NoFrame)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+        self.setFixedHeight(row.sizeHint().height() + self.horizontalScrollBar().sizeHint().height())
+        self._color_rules = _color_rules(agents)
+        self.setStyleSheet(self._stylesheet + "\n" + self._color_rules)
+
+    def _make_button(self, record):
+        btn = QPushButton(record.name)
+        btn.setObjectName("agentSegment")
+        btn.setProperty("active", False)
+        btn.setProperty("agentColor", record.color)
+        btn.clicked.connect(lambda checked=False, name=record.name: self.agent_selected.emit(name))
+        self._by_name[record.name] = btn
+        return btn
+
+    def apply(self, agents, diff):
+        """Bring the segments in line with a reloaded registry; diff is a logic.hot_reload.ConfigDiff."""
+        active = self._buttons[self._current].text() if 0 <= self._current < len(self._buttons) else None
+        for name in diff.removed:
+            btn = self._by_name.pop(name)
+            self._row_layout.removeWidget(btn)
+            btn.deleteLater()
+        for name in diff.changed:
+            btn = self._by_name[name]
+            color = agents[name].color
+            if btn.property("agentColor") != color:
+                btn.setProperty("agentColor", color)
+                btn.style().unpolish(btn)
+                btn.style().polish(btn)
+        for name in diff.added:
+            self._make_button(agents[name])
+
+        self._buttons = [self._by_name[name] for name in agents.names]
+        if diff.added or diff.removed or diff.reordered:
+            # Re-seat the surviving widgets in registry order; none are recreated
+            for btn in self._buttons:
+                self._row_layout.removeWidget(btn)
+            for i, btn in enumerate(self._buttons):
+                self._row_layout.insertWidget(i, btn)
+        self._current = agents.index_of(active) if active in agents else -1
+
+        rules = _color_rules(agents)
+        if rules != self._color_rules:
+            self._color_rules = rules
+            self.setStyleSheet(self._stylesheet + "\n" + rules)
+
+    def count(self):
+        return len(self._buttons)
+
+    def currentIndex(self):
+        return self._current
+
+    def setCurrentIndex(self, index):
+        if index == self._current:
+            return
+        self._set_active(self._current, False)
+        self._set_active(index, True)
+        self._current = index
+        if 0 <= index < len(self._buttons):
+            self.ensureWidgetVisible(self._buttons[index])
+
+    def _set_active(self, index, active):
+        if not 0 <= index < len(self._buttons):
+            return
+        btn = self._buttons[index]
+        btn.setProperty("active", active)
+        # Property selectors are only re-evaluated on polish; touch just this widget
+        btn.style().unpolish(btn)
+        btn.style().polish(btn)
@@ -0,0 +1,80 @@
+# Agent registry shared by the OTK variants
+#
+# The HUDs used to rebuild list(self.agents.keys()) and call .index() several
+# times per submit/switch, which made switch_context O(n^2) in the number of
+# agents. AgentRegistry fixes the order once at load time and keeps name <->
+# index maps, so every lookup is O(1). It is still a read-only Mapping of
+# name -> record, and records answer record['prompt'] as well as
+# record.prompt, so existing self.agents[name]['color'] call sites keep working.
+
+from collections.abc import Mapping
+
+
+class AgentRecord:
+    __slots__ = ('name', 'index', 'color', 'prompt', 'routing', 'extra')
+
+    def __init__(self, name, index, config):
+        config = dict(config or {})
+        self.name = name
+        self.index = index
+        self.color = config.pop('color', 'lightgray')
+        self.prompt = config.pop('prompt', '{input}')
+        self.routing = config.pop('routing', None)
+        self.extra = config  # Any other keys from the YAML, untouched
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key) if key in self.__slots__ else self.extra[key]
+        except KeyError:
+            raise KeyError(key) from None
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def to_config(self):
+        config = {'color': self.color, 'prompt': self.prompt, **self.extra}
+        if self.routing is not None:
+            config['routing'] = self.routing
+        return config
+
+
+class AgentRegistry(Mapping):
+    def __init__(self, config):
+        config = config or {}
+        self.names = tuple(config)
+        self._records = [AgentRecord(name, i, config[name]) for i, name in enumerate(self.names)]
+        self._index = {name: i for i, name in enumerate(self.names)}
+
+    # Mapping protocol (name -> AgentRecord), insertion order preserved
+    def __getitem__(self, name):
+        return self._records[self._index[name]]
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self._index
+
+    # O(1) positional helpers
+    def index_of(self, name):
+        return self._index[name]
+
+    def name_at(self, index):
+        return self.names[index]
+
+    def record_at(self, index):
+        return self._records[index]
+
+    # Fatigue rotation
+    def next_after(self, name, step=1):
+        """Agent `step` places after name, wrapping around."""
+        return self.names[(self._index[name] + step) % len(self.names)]
+
+    def to_config(self):
+        return {r.name: r.to_config() for r in self._records}
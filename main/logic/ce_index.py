@@ -0,0 +1,235 @@
+# Incremental task index for otk_ce_index.md
+#
+# The CE index is append-only in normal use, so instead of re-reading the whole
+# markdown on every query we keep a sidecar JSON file with the byte offset we
+# parsed up to plus running counts. refresh() only reads the bytes appended
+# since the last call; if the file was edited in place (checkbox ticked in
+# Obsidian, lines deleted, file replaced) the index rebuilds from scratch.
+#
+# Sampled blocks alone miss a ticked checkbox when the writer appends before
+# the next refresh (size grows, so it looks like a pure append). Growth is
+# therefore only trusted when it is accounted for by appends the CE writer
+# reported through note_append(): a chain of (size, mtime) before/after pairs
+# leading from the state we indexed to the file's current one. Any other
+# change in between (an edit, or an append by another program) breaks the
+# chain and rebuilds. Verifying costs two stats per batch, not a re-read.
+
+import collections
+import hashlib
+import json
+import os
+import re
+
+INDEX_VERSION = 3
+SAMPLE_BLOCKS = 16      # evenly spaced blocks hashed to detect in-place edits
+SAMPLE_SIZE = 256
+TAIL_SIZE = 4096        # last bytes before the offset, always hashed
+
+OPEN_MARK = '- [ ]'
+DONE_RE = re.compile(r'- \[[xX]\]')
+AGENT_RE = re.compile(r'agent:\s*([^|#\n]+?)\s*(?:\||#|$)')
+PRIORITY_RE = re.compile(r'#priority:(\w+)')
+TAG_RE = re.compile(r'(?<!\S)#([A-Za-z][\w/-]*)(?![\w/:-])')
+
+
+class CEIndex:
+    def __init__(self, md_path, sidecar_path=None):
+        self.md_path = md_path
+        self.sidecar_path = sidecar_path or md_path + '.idx.json'
+        self._appends = collections.deque()  # ((size, mtime_ns) before, after) per writer batch
+        self._reset()
+        self._load_sidecar()
+
+    def _reset(self):
+        self.offset = 0
+        self.size = 0
+        self.mtime_ns = 0
+        self.inode = 0
+        self.fingerprint = ''
+        self.unresolved = 0
+        self.resolved = 0
+        # Counters keyed by name; each value is [open, resolved]
+        self.agents = {}
+        self.priorities = {}
+        self.tags = {}
+
+    # ---- Public queries (O(1), call refresh() first if freshness matters) ----
+
+    def agent_count(self, agent, open_only=True):
+        return self._count(self.agents, agent, open_only)
+
+    def priority_count(self, priority, open_only=True):
+        return self._count(self.priorities, priority, open_only)
+
+    def tag_count(self, tag, open_only=True):
+        return self._count(self.tags, tag.lstrip('#'), open_only)
+
+    def counts(self):
+        return {
+            'unresolved': self.unresolved,
+            'resolved': self.resolved,
+            'agents': dict(self.agents),
+            'priorities': dict(self.priorities),
+            'tags': dict(self.tags),
+        }
+
+    @staticmethod
+    def _count(table, key, open_only):
+        pair = table.get(key)
+        if pair is None:
+            return 0
+        return pair[0] if open_only else pair[0] + pair[1]
+
+    # ---- Maintenance ----
+
+    def refresh(self):
+        """Bring the index up to date with the markdown file. Returns True if anything changed."""
+        try:
+            st = os.stat(self.md_path)
+        except FileNotFoundError:
+            if self.offset or self.unresolved or self.resolved:
+                self._reset()
+                self._save_sidecar()
+                return True
+            return False
+
+        if st.st_size == self.size and st.st_mtime_ns == self.mtime_ns and st.st_ino == self.inode:
+            return False
+
+        with open(self.md_path, 'rb') as f:
+            if not self._still_prefix(f, st):
+                self._reset()
+            f.seek(self.offset)
+            chunk = f.read(st.st_size - self.offset)
+
+            # Only consume complete lines; a partial trailing line is picked up next time
+            end = chunk.rfind(b'\n') + 1
+            if end:
+                for raw in chunk[:end - 1].split(b'\n'):
+                    self._ingest(raw.decode('utf-8', errors='replace'))
+                self.offset += end
+            self.fingerprint = self._fingerprint(f, self.offset)
+
+        self.size = st.st_size
+        self.mtime_ns = st.st_mtime_ns
+        self.inode = st.st_ino
+        self._save_sidecar()
+        return True
+
+    def note_append(self, before, after):
+        """Record that the file went from before to after, both (size, mtime_ns), by appending only.
+
+        Called by CEWriter after each batch, from its own thread.
+        """
+        self._appends.append((before, after))
+
+    def rebuild(self):
+        self._reset()
+        return self.refresh()
+
+    def _still_prefix(self, f, st):
+        """True if the bytes we already indexed look unchanged (pure append since last refresh)."""
+        if not self.offset:
+            return True
+        if st.st_ino != self.inode or st.st_size < self.offset:
+            return False
+        # Same size but touched: a same-length in-place edit such as "- [ ]" -> "- [x]"
+        if st.st_size == self.size and st.st_mtime_ns != self.mtime_ns:
+            return False
+        if st.st_size > self.size and not self._appended_only(st):
+            return False
+        return self._fingerprint(f, self.offset) == self.fingerprint
+
+    def _appended_only(self, st):
+        """True if reported appends lead from the indexed (size, mtime) to st's."""
+        state = (self.size, self.mtime_ns)
+        current = (st.st_size, st.st_mtime_ns)
+        while self._appends and state != current:
+            before, after = self._appends[0]
+            if after[0] > st.st_size:
+                break  # Appended after our stat; left for the next refresh
+            self._appends.popleft()
+            if after[0] <= self.size:
+                continue  # Already indexed
+            if before != state:
+                return False  # Something else touched the file in between
+            state = after
+        return state == current
+
+    @staticmethod
+    def _fingerprint(f, offset):
+        h = hashlib.sha1()
+        if offset > SAMPLE_SIZE * SAMPLE_BLOCKS:
+            step = offset // SAMPLE_BLOCKS
+            for i in range(SAMPLE_BLOCKS):
+                f.seek(i * step)
+                h.update(f.read(SAMPLE_SIZE))
+        tail_start = max(0, offset - TAIL_SIZE)
+        f.seek(tail_start)
+        h.update(f.read(offset - tail_start))
+        return h.hexdigest()
+
+    def _ingest(self, line):
+        if OPEN_MARK in line:
+            slot = 0
+            self.unresolved += 1
+        elif DONE_RE.search(line):
+            slot = 1
+            self.resolved += 1
+        else:
+            return
+
+        agent = AGENT_RE.search(line)
+        if agent:
+            self._bump(self.agents, agent.group(1), slot)
+        priority = PRIORITY_RE.search(line)
+        if priority:
+            self._bump(self.priorities, priority.group(1).lower(), slot)
+        for tag in set(TAG_RE.findall(line)):
+            self._bump(self.tags, tag, slot)
+
+    @staticmethod
+    def _bump(table, key, slot):
+        pair = table.get(key)
+        if pair is None:
+            pair = table[key] = [0, 0]
+        pair[slot] += 1
+
+    # ---- Sidecar persistence ----
+
+    def _load_sidecar(self):
+        try:
+            with open(self.sidecar_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') != INDEX_VERSION:
+            return
+        self.offset = data['offset']
+        self.size = data['size']
+        self.mtime_ns = data['mtime_ns']
+        self.inode = data['inode']
+        self.fingerprint = data['fingerprint']
+        self.unresolved = data['unresolved']
+        self.resolved = data['resolved']
+        self.agents = data['agents']
+        self.priorities = data['priorities']
+        self.tags = data['tags']
+
+    def _save_sidecar(self):
+        data = {
+            'version': INDEX_VERSION,
+            'offset': self.offset,
+            'size': self.size,
+            'mtime_ns': self.mtime_ns,
+            'inode': self.inode,
+            'fingerprint': self.fingerprint,
+            **self.counts(),
+        }
+        tmp = self.sidecar_path + '.tmp'
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp, self.sidecar_path)
+        except OSError as e:
+            print(f"CE index sidecar not saved: {e}")
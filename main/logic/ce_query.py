@@ -0,0 +1,317 @@
+# Time-range queries over ce_session_log.jsonl
+#
+# Answering "all OTK events for slot X in the last 3 days" used to mean
+# json.loads on every line of the log. CEQuery memory-maps the log and keeps a
+# sparse timestamp -> byte offset index in a sidecar (one entry per
+# INDEX_BLOCK_BYTES, extended incrementally as the log grows, rebuilt if the
+# log was rolled or rewritten). A query bisects the index for its byte range,
+# then uses mmap.find() on the JSON bytes of the slot_id/type/status filters to
+# jump between candidate lines; only lines that pass are decoded.
+#
+# The index assumes lines are appended in timestamp order, which holds for
+# LogPipeline's single writer. The sink rolls the active file into gzip
+# segments (logic.segments) daily and at 5 MB, so by default a query also
+# reads the segments whenever its range starts before the active file's first
+# event. Segments have no index: each one whose roll time does not rule it out
+# is decompressed and scanned line by line, so only today's part of a range
+# gets the mmap/index speedup.
+#
+#   cd main && python -m logic.ce_query --since 3d --slot Scout_Button
+#   cd main && python -m logic.ce_query --since "2025-08-01" --status FAIL --count
+
+import argparse
+import bisect
+import datetime
+import gzip
+import hashlib
+import json
+import mmap
+import os
+import re
+from pathlib import Path
+
+from logic.segments import SegmentStore
+
+INDEX_VERSION = 1
+INDEX_BLOCK_BYTES = 256 * 1024
+HEAD_BYTES = 4096
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"  # what log_action writes
+TS_KEY = b'"timestamp": "'
+TS_LEN = 19
+DEFAULT_LOG = Path(__file__).resolve().parents[2].parents[1] / "Cognition_Engine" / "logs" / "ce_session_log.jsonl"
+SEGMENT_NAME_RE = re.compile(r'^\d+-(\d{8}T\d{6})\.gz$')
+
+
+def _line_timestamp(buf, start, end):
+    i = buf.find(TS_KEY, start, end)
+    if i < 0:
+        return None
+    i += len(TS_KEY)
+    return buf[i:i + TS_LEN].decode('ascii', errors='replace')
+
+
+def _as_timestamp(value):
+    if value is None or isinstance(value, str):
+        return value
+    return value.strftime(TIME_FORMAT)
+
+
+def _needle(key, value, prefix=False):
+    # LogPipeline writes json.dumps(record) with default separators, so this is the exact byte form
+    text = json.dumps(value)
+    return f'"{key}": {text[:-1] if prefix else text}'.encode()
+
+
+class CEQuery:
+    def __init__(self, path=DEFAULT_LOG, index_path=None, block_bytes=INDEX_BLOCK_BYTES):
+        self.path = str(path)
+        self.index_path = index_path or self.path + '.time.idx.json'
+        self.block_bytes = block_bytes
+        self._reset()
+        self._load_index()
+
+    def _reset(self):
+        self.size = 0
+        self.inode = 0
+        self.head = ''
+        self.entries = []  # [timestamp, offset of a line start]; timestamps non-decreasing
+        self._keys = []
+
+    # ---- Index maintenance ----
+
+    def refresh(self):
+        """Extend the index over bytes appended since the last call. Returns True if it changed."""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            if self.entries:
+                self._reset()
+                self._save_index()
+                return True
+            return False
+        if st.st_size == self.size and st.st_ino == self.inode:
+            return False
+
+        with open(self.path, 'rb') as f:
+            if st.st_ino != self.inode or st.st_size < self.size or self._head(f, self.size) != self.head:
+                self._reset()  # Rolled, truncated or replaced
+            head = self._head(f, st.st_size)
+            if st.st_size:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    self._extend(mm, st.st_size)
+        self.size = st.st_size
+        self.inode = st.st_ino
+        self.head = head
+        self._save_index()
+        return True
+
+    @staticmethod
+    def _head(f, size):
+        f.seek(0)
+        return hashlib.sha1(f.read(min(size, HEAD_BYTES))).hexdigest() if size else ''
+
+    def _extend(self, mm, size):
+        next_at = self.entries[-1][1] + self.block_bytes if self.entries else 0
+        while next_at < size:
+            if next_at:
+                nl = mm.find(b'\n', next_at - 1, size)
+                if nl < 0:
+                    break
+                line_start = nl + 1
+            else:
+                line_start = 0
+            line_end = mm.find(b'\n', line_start, size)
+            if line_end < 0:
+                break  # Partial last line; indexed on a later refresh
+            ts = _line_timestamp(mm, line_start, line_end)
+            if ts is None:
+                next_at = line_end + 1  # Torn or foreign line; sample the next one
+                continue
+            if self.entries and ts < self.entries[-1][0]:
+                ts = self.entries[-1][0]  # Keep the keys sorted for bisect
+            self.entries.append([ts, line_start])
+            self._keys.append(ts)
+            next_at = line_start + self.block_bytes
+
+    # ---- Queries ----
+
+    def query(self, since=None, until=None, slot_id=None, action_type=None, status=None, include_archived=None):
+        """Yield event dicts with since <= timestamp <= until; status matches as a prefix (e.g. 'FAIL').
+
+        include_archived: None reads rolled segments only when the range starts before the active file.
+        """
+        since, until = _as_timestamp(since), _as_timestamp(until)
+        needles = []  # Most selective first
+        if slot_id is not None:
+            needles.append(_needle('slot_id', slot_id))
+        if action_type is not None:
+            needles.append(_needle('type', action_type))
+        if status is not None:
+            needles.append(_needle('status', status, prefix=True))
+
+        def accept(line_bytes, ts):
+            if ts is None or (since and ts < since) or (until and ts > until):
+                return None
+            try:
+                event = json.loads(line_bytes)
+            except ValueError:
+                return None
+            if slot_id is not None and event.get('slot_id') != slot_id:
+                return None
+            if action_type is not None and event.get('type') != action_type:
+                return None
+            if status is not None and not str(event.get('status', '')).startswith(status):
+                return None
+            return event
+
+        self.refresh()
+        if include_archived is None:
+            include_archived = not since or not self._keys or since < self._keys[0]
+        if include_archived:
+            yield from self._query_segments(since, until, needles, accept)
+
+        if not self.size:
+            return
+        with open(self.path, 'rb') as f:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                return  # Emptied by a roll since refresh()
+            with mm:
+                yield from self._query_active(mm, since, until, needles, accept)
+
+    def _query_active(self, mm, since, until, needles, accept):
+        start, end = self._byte_range(since, until, min(self.size, len(mm)))
+        for ls, le in self._candidate_lines(mm, start, end, needles):
+            line = mm[ls:le]
+            if all(n in line for n in needles[1:]):
+                event = accept(line, _line_timestamp(mm, ls, le))
+                if event is not None:
+                    yield event
+
+    def count(self, **filters):
+        return sum(1 for _ in self.query(**filters))
+
+    def _byte_range(self, since, until, size):
+        start, end = 0, size
+        if since and self._keys:
+            i = bisect.bisect_left(self._keys, since) - 1
+            if i >= 0:
+                start = self.entries[i][1]
+        if until and self._keys:
+            j = bisect.bisect_right(self._keys, until)
+            if j < len(self.entries):
+                end = self.entries[j][1]
+        return start, end
+
+    @staticmethod
+    def _candidate_lines(mm, start, end, needles):
+        """(start, end) of complete lines in [start, end); with needles, only lines containing the first."""
+        pos = start
+        while pos < end:
+            if needles:
+                hit = mm.find(needles[0], pos, end)
+                if hit < 0:
+                    return
+                ls = mm.rfind(b'\n', pos, hit)
+                ls = pos if ls < 0 else ls + 1
+            else:
+                hit = ls = pos
+            le = mm.find(b'\n', hit, end)
+            if le < 0:
+                return  # Partial trailing line
+            yield ls, le
+            pos = le + 1
+
+    def _query_segments(self, since, until, needles, accept):
+        previous_roll = None
+        for segment in SegmentStore(self.path).segments():
+            m = SEGMENT_NAME_RE.match(segment.name)
+            rolled = datetime.datetime.strptime(m.group(1), "%Y%m%dT%H%M%S").strftime(TIME_FORMAT) if m else None
+            # A segment holds events up to the moment it was rolled
+            if until and previous_roll and previous_roll > until:
+                return
+            previous_roll = rolled or previous_roll
+            if since and rolled and rolled < since:
+                continue
+            with gzip.open(segment, 'rb') as f:
+                for line in f:
+                    if all(n in line for n in needles):
+                        event = accept(line, _line_timestamp(line, 0, len(line)))
+                        if event is not None:
+                            yield event
+
+    # ---- Sidecar persistence ----
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') != INDEX_VERSION or data.get('block_bytes') != self.block_bytes:
+            return
+        self.size = data['size']
+        self.inode = data['inode']
+        self.head = data['head']
+        self.entries = data['entries']
+        self._keys = [e[0] for e in self.entries]
+
+    def _save_index(self):
+        data = {
+            'version': INDEX_VERSION,
+            'block_bytes': self.block_bytes,
+            'size': self.size,
+            'inode': self.inode,
+            'head': self.head,
+            'entries': self.entries,
+        }
+        tmp = self.index_path + '.tmp'
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp, self.index_path)
+        except OSError as e:
+            print(f"CE query index not saved: {e}")
+
+
+# ---- CLI ----
+
+def parse_when(text, now=None):
+    """'3d', '12h', '30m' relative to now, or an ISO date/datetime."""
+    m = re.fullmatch(r'(\d+)([dhm])', text.strip())
+    if m:
+        unit = {'d': 'days', 'h': 'hours', 'm': 'minutes'}[m.group(2)]
+        return (now or datetime.datetime.now()) - datetime.timedelta(**{unit: int(m.group(1))})
+    return datetime.datetime.fromisoformat(text)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Query OTK events in ce_session_log.jsonl and its rolled segments",
+        epilog="The active log is queried through an mmap'd sparse time index. Rolled gzip segments "
+               "have no index and are decompressed and scanned line by line.")
+    parser.add_argument('--log', default=str(DEFAULT_LOG))
+    parser.add_argument('--since', type=parse_when, help="e.g. 3d, 12h, 2025-08-01")
+    parser.add_argument('--until', type=parse_when)
+    parser.add_argument('--slot', dest='slot_id')
+    parser.add_argument('--type', dest='action_type')
+    parser.add_argument('--status', help="prefix match, e.g. FAIL")
+    parser.add_argument('--archived', action=argparse.BooleanOptionalAction, default=None,
+                        help="scan rolled gzip segments too (default: only when --since reaches "
+                             "before the active log's first event)")
+    parser.add_argument('--count', action='store_true')
+    args = parser.parse_args(argv)
+
+    events = CEQuery(args.log).query(since=args.since, until=args.until, slot_id=args.slot_id,
+                                     action_type=args.action_type, status=args.status,
+                                     include_archived=args.archived)
+    if args.count:
+        print(sum(1 for _ in events))
+        return
+    for event in events:
+        print(json.dumps(event))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+# Background group-commit writer for CE markdown appends
+#
+# log_to_ce() used to open the CE file, write one line and close it on the GUI
+# thread. CEWriter hands entries to a dedicated thread through a bounded queue;
+# the thread keeps the file open, gathers everything that arrives within one
+# flush interval and writes it as a single batch. run_exclusive() runs
+# maintenance (segment compaction) on that same thread with the file closed,
+# so nothing is appended through a handle to a file that was just replaced.
+# on_append, if given, is called on the writer thread with the file's
+# (size, mtime_ns) before and after each batch (see CEIndex.note_append).
+
+import os
+import queue
+import threading
+import time
+
+DURABILITY_MODES = ('none', 'flush', 'fsync')
+_STOP = object()
+
+
+class _Task:
+    def __init__(self, fn):
+        self.fn = fn
+
+
+class CEWriter:
+    def __init__(self, path, durability='flush', flush_interval=0.25, max_queue=1024, on_append=None):
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"durability must be one of {DURABILITY_MODES}, got {durability!r}")
+        self.path = path
+        self.durability = durability
+        self.flush_interval = flush_interval
+        self.on_append = on_append
+        self.dropped = 0
+        self.written = 0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="CEWriter", daemon=True)
+        self._thread.start()
+
+    def write(self, entry):
+        """Queue an entry for appending; False if the queue was full and it was dropped. Never waits."""
+        if self._closed:
+            raise RuntimeError("CEWriter is closed")
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            # Writer is badly stalled (e.g. vault volume offline); don't freeze the UI over it
+            self.dropped += 1
+            print(f"CE writer queue full, dropped entry ({self.dropped} total)")
+            return False
+        return True
+
+    def run_exclusive(self, fn):
+        """Run fn() on the writer thread after the entries queued so far, with the file closed.
+
+        Returns False without queueing if the writer is backed up; callers on a timer retry next tick.
+        """
+        if self._closed:
+            raise RuntimeError("CEWriter is closed")
+        try:
+            self._queue.put_nowait(_Task(fn))
+        except queue.Full:
+            return False
+        return True
+
+    def close(self, timeout=5.0):
+        """Drain pending entries and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def _run(self):
+        f = None
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            batch = []
+            task = None
+            if item is _STOP:
+                stopping = True
+            elif isinstance(item, _Task):
+                task = item
+            else:
+                batch.append(item)
+                # Group commit: keep collecting until the interval elapses
+                deadline = time.monotonic() + self.flush_interval
+                while True:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = self._queue.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+                    if item is _STOP:
+                        stopping = True
+                        break
+                    if isinstance(item, _Task):
+                        task = item  # Write what we have, then run it
+                        break
+                    batch.append(item)
+
+            if stopping:
+                # Pick up anything queued behind the stop marker
+                while True:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is not _STOP and not isinstance(item, _Task):
+                        batch.append(item)
+
+            if batch:
+                f = self._write_batch(f, batch)
+            if task is not None:
+                if f is not None:
+                    f.close()
+                    f = None
+                try:
+                    task.fn()
+                except Exception as e:
+                    print(f"CE writer task failed: {e}")
+
+        if f is not None:
+            f.close()
+
+    def _write_batch(self, f, batch):
+        try:
+            if f is None:
+                f = open(self.path, 'a', encoding='utf-8')
+            before = os.fstat(f.fileno())
+            f.write(''.join(batch))
+            if self.durability != 'none' or self.on_append is not None:
+                f.flush()  # on_append reports the size the batch reached
+            if self.durability == 'fsync':
+                os.fsync(f.fileno())
+            self.written += len(batch)
+            if self.on_append is not None:
+                after = os.fstat(f.fileno())
+                self.on_append((before.st_size, before.st_mtime_ns), (after.st_size, after.st_mtime_ns))
+        except OSError as e:
+            print(f"CE writer failed to append {len(batch)} entries: {e}")
+            if f is not None:
+                f.close()
+                f = None
+        return f
@@ -0,0 +1,99 @@
+# Keyboard command palette for the command deck
+#
+# A frame overlaid on the deck's top edge: type to fuzzy-match slots by label,
+# slot_id, tooltip or payload through a logic.slot_search.SlotIndex, Up/Down to
+# move, Enter to fire, Esc to close. Only the visible result rows are ever
+# created, so a keystroke costs one index search plus at most PALETTE_ROWS
+# list items however large the layout is. Styled by QFrame#commandPalette in
+# styles/cognition_mode*.qss.
+
+from PySide6.QtCore import QEvent, Qt, Signal
+from PySide6.QtWidgets import QFrame, QLineEdit, QListWidget, QListWidgetItem, QVBoxLayout
+
+PALETTE_ROWS = 12
+PALETTE_WIDTH = 420
+PALETTE_MARGIN = 8
+
+
+class CommandPalette(QFrame):
+    slot_chosen = Signal(str)
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.index = None
+        self.labels = {}  # slot_id -> text shown for it, set by open()
+        self.setObjectName("commandPalette")
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(6, 6, 6, 6)
+        self.input = QLineEdit()
+        self.input.setPlaceholderText("Search slots…")
+        self.input.textChanged.connect(self.update_results)
+        self.input.installEventFilter(self)
+        layout.addWidget(self.input)
+        self.results = QListWidget()
+        self.results.setFocusPolicy(Qt.NoFocus)
+        self.results.itemActivated.connect(lambda item: self.choose(item))
+        self.results.itemClicked.connect(lambda item: self.choose(item))
+        layout.addWidget(self.results)
+        parent.installEventFilter(self)
+        self.hide()
+
+    def open(self, index, labels):
+        """index: SlotIndex for the current layout; labels: slot_id -> text shown in the list."""
+        self.index = index
+        self.labels = labels
+        self.input.blockSignals(True)
+        self.input.clear()
+        self.input.blockSignals(False)
+        self.update_results("")
+        self._reposition()
+        self.show()
+        self.raise_()
+        self.input.setFocus()
+
+    def update_results(self, text):
+        self.results.clear()
+        if self.index is None:
+            return
+        for score, slot_id in self.index.search(text, PALETTE_ROWS):
+            item = QListWidgetItem(f"{self.labels.get(slot_id, slot_id)}    · {slot_id}")
+            item.setData(Qt.UserRole, slot_id)
+            self.results.addItem(item)
+        if self.results.count():
+            self.results.setCurrentRow(0)
+        rows = max(1, self.results.count())
+        self.results.setFixedHeight(rows * max(1, self.results.sizeHintForRow(0)) + 4)
+        self.adjustSize()
+
+    def choose(self, item=None):
+        item = item or self.results.currentItem()
+        if item is None:
+            return
+        self.hide()
+        self.slot_chosen.emit(item.data(Qt.UserRole))
+
+    def _move(self, step):
+        count = self.results.count()
+        if count:
+            self.results.setCurrentRow((self.results.currentRow() + step) % count)
+
+    def _reposition(self):
+        parent = self.parentWidget()
+        self.setFixedWidth(min(PALETTE_WIDTH, parent.width() - 2 * PALETTE_MARGIN))
+        self.move((parent.width() - self.width()) // 2, PALETTE_MARGIN)
+
+    def eventFilter(self, obj, event):
+        if obj is self.input and event.type() == QEvent.KeyPress:
+            key = event.key()
+            if key == Qt.Key_Escape:
+                self.hide()
+                return True
+            if key in (Qt.Key_Return, Qt.Key_Enter):
+                self.choose()
+                return True
+            if key in (Qt.Key_Down, Qt.Key_Up):
+                self._move(1 if key == Qt.Key_Down else -1)
+                return True
+        elif obj is self.parentWidget() and event.type() == QEvent.Resize and self.isVisible():
+            self._reposition()
+        return False
@@ -0,0 +1,126 @@
+# Compiled config cache for otk_agents.yaml and the command deck layout
+#
+# Both files used to be parsed from scratch on every launch, the YAML with the
+# pure-Python loader, and the layout was never validated. load_agents() and
+# load_layout() parse with libyaml's CSafeLoader when PyYAML was built with it,
+# validate and normalize the result, and keep it in a marshal sidecar
+# (path + '.cache') keyed by the source's path, mtime and size. A warm start
+# reads the sidecar and skips both parsing and importing yaml.
+
+import json
+import marshal
+import os
+import sys
+
+CACHE_VERSION = 2
+CACHE_SUFFIX = '.cache'
+
+
+class ConfigError(ValueError):
+    pass
+
+
+# ---- Normalizers: parsed document -> plain dicts/lists safe to marshal ----
+
+def normalize_agents(doc):
+    if not isinstance(doc, dict) or not doc:
+        raise ConfigError("agents: expected a non-empty mapping of name -> config")
+    agents = {}
+    for name, config in doc.items():
+        if config is not None and not isinstance(config, dict):
+            raise ConfigError(f"agents: {name}: expected a mapping, got {type(config).__name__}")
+        config = dict(config or {})
+        if not isinstance(config.get('prompt', ''), str) or not isinstance(config.get('color', ''), str):
+            raise ConfigError(f"agents: {name}: color and prompt must be strings")
+        config.setdefault('color', 'lightgray')
+        config.setdefault('prompt', '{input}')
+        routing = config.get('routing')
+        if routing is not None:
+            if not isinstance(routing, dict):
+                raise ConfigError(f"agents: {name}: routing must be a mapping")
+            config['routing'] = {
+                'keywords': [str(k) for k in routing.get('keywords') or []],
+                'regex': [str(r) for r in routing.get('regex') or []],
+                'priority': int(routing.get('priority', 0)),
+            }
+        agents[str(name)] = config
+    return agents
+
+
+def normalize_layout(doc):
+    if not isinstance(doc, list):
+        raise ConfigError("layout: expected a list of slots")
+    seen = set()
+    layout = []
+    for i, slot in enumerate(doc):
+        if not isinstance(slot, dict):
+            raise ConfigError(f"layout: slot {i} is not an object")
+        missing = [k for k in ('slot_id', 'label', 'type', 'payload') if k not in slot]
+        if missing:
+            raise ConfigError(f"layout: slot {slot.get('slot_id', i)} is missing {', '.join(missing)}")
+        if slot['slot_id'] in seen:
+            raise ConfigError(f"layout: duplicate slot_id {slot['slot_id']}")
+        seen.add(slot['slot_id'])
+        slot = dict(slot)
+        slot['tooltip'] = slot.get('tooltip', '')
+        slot['row'] = int(slot.get('row', 0))
+        slot['col'] = int(slot.get('col', 0))
+        instances = slot.get('instances')
+        if instances is not None and instances not in ('single', 'focus') and not (
+                isinstance(instances, int) and instances >= 1):
+            raise ConfigError(f"layout: slot {slot['slot_id']} instances must be a positive number, 'single' or 'focus'")
+        layout.append(slot)
+    return layout
+
+
+# ---- Parsers (cold path only) ----
+
+def parse_yaml(path):
+    import yaml  # Deferred; warm starts never need it
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    with open(path, 'r', encoding='utf-8') as f:
+        return yaml.load(f, Loader=loader)
+
+
+def parse_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+# ---- Cache ----
+
+def _cache_key(path, kind):
+    st = os.stat(path)
+    return (CACHE_VERSION, sys.version_info[:2], kind, os.path.abspath(path), st.st_mtime_ns, st.st_size)
+
+
+def load_cached(path, parse, normalize, kind, cache_path=None):
+    """Normalized contents of path, from the sidecar cache when it still matches the source."""
+    path = str(path)
+    cache_path = cache_path or path + CACHE_SUFFIX
+    key = _cache_key(path, kind)  # Raises if the source is gone; callers fall back
+    try:
+        with open(cache_path, 'rb') as f:
+            cached_key, data = marshal.loads(f.read())  # load(f) does many tiny reads
+        if cached_key == key:
+            return data
+    except (OSError, EOFError, ValueError, TypeError):
+        pass  # Missing, truncated or from another Python; rebuild below
+
+    data = normalize(parse(path))
+    tmp = cache_path + '.tmp'
+    try:
+        with open(tmp, 'wb') as f:
+            f.write(marshal.dumps((key, data)))
+        os.replace(tmp, cache_path)
+    except (OSError, ValueError) as e:
+        print(f"Config cache not written ({cache_path}): {e}")
+    return data
+
+
+def load_agents(path):
+    return load_cached(path, parse_yaml, normalize_agents, 'agents')
+
+
+def load_layout(path):
+    return load_cached(path, parse_json, normalize_layout, 'layout')
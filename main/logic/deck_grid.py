@@ -0,0 +1,234 @@
+# Virtualized slot grid for the command deck
+#
+# The deck used to create a QPushButton, two lambda closures and a QGridLayout
+# item per layout entry, so startup, memory and every resize grew with the
+# layout. SlotGridModel instead exposes the slots as cells of a table keyed by
+# their "row"/"col", and SlotGridView is a QTableView with fixed-size sections:
+# Qt only asks the model about cells that are on screen and scrolls by row and
+# column. SlotDelegate draws each cell as a button through the style, so the
+# QTableView#slotGrid::item rules in styles/cognition_mode*.qss apply.
+#
+# Per-slot state the buttons used to carry lives in the model: availability
+# of file payloads, and icons, which are only requested the first time their
+# cell is painted.
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, QSize, Qt, Signal
+from PySide6.QtWidgets import QAbstractItemView, QHeaderView, QStyle, QStyledItemDelegate, QTableView
+
+CELL_WIDTH = 140
+CELL_HEIGHT = 40
+HINT_COLS = 6   # size hint covers at most this many columns...
+HINT_ROWS = 10  # ...and rows; larger layouts scroll
+SlotRole = Qt.UserRole
+
+
+def _cell(button):
+    return button.get("row", 0), button.get("col", 0)
+
+
+class SlotGridModel(QAbstractTableModel):
+    def __init__(self, request_icon, parent=None):
+        super().__init__(parent)
+        self.request_icon = request_icon  # called with a slot dict the first time its icon is needed
+        self.slots = {}      # slot_id -> button dict
+        self._cells = {}     # (row, col) -> slot_id; a later slot wins a shared cell
+        self._rows = 0
+        self._cols = 0
+        self._icons = {}     # slot_id -> (icon name, QIcon)
+        self._requested = set()  # (slot_id, icon name) already asked for
+        self._missing = set()    # slot_ids whose payload file is missing
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._rows
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._cols
+
+    def slot_id(self, index):
+        if not index.isValid():
+            return None
+        return self._cells.get((index.row(), index.column()))
+
+    def data(self, index, role=Qt.DisplayRole):
+        slot_id = self.slot_id(index)
+        if slot_id is None:
+            return None
+        button = self.slots[slot_id]
+        if role == Qt.DisplayRole:
+            return button["label"]
+        if role == Qt.ToolTipRole:
+            tooltip = button.get("tooltip", "")
+            if slot_id in self._missing:
+                return f"{tooltip}\n⚠️ Missing: {button['payload']}".strip()
+            return tooltip or None
+        if role == Qt.DecorationRole:
+            return self._icon(button)
+        if role == SlotRole:
+            return slot_id
+        return None
+
+    def flags(self, index):
+        slot_id = self.slot_id(index)
+        if slot_id is None:
+            return Qt.NoItemFlags
+        if slot_id in self._missing:
+            return Qt.ItemNeverHasChildren
+        return Qt.ItemIsEnabled | Qt.ItemNeverHasChildren
+
+    def set_slots(self, slots, diff):
+        """Swap in a new slot_id -> button dict; diff is the hot_reload.diff_keyed result against the old one."""
+        old = self.slots
+        cells = {_cell(button): slot_id for slot_id, button in slots.items()}
+        rows = max((r for r, _ in cells), default=-1) + 1
+        cols = max((c for _, c in cells), default=-1) + 1
+        for slot_id in diff.removed + diff.changed:
+            self._missing.discard(slot_id)  # Availability is re-checked for the new payload
+            if slot_id not in slots or slots[slot_id].get("icon") != old[slot_id].get("icon"):
+                self._icons.pop(slot_id, None)
+                self._requested = {key for key in self._requested if key[0] != slot_id}
+
+        if (rows, cols) != (self._rows, self._cols):
+            self.beginResetModel()
+            self.slots, self._cells, self._rows, self._cols = slots, cells, rows, cols
+            self.endResetModel()
+            return
+
+        # Same shape: repaint only the cells touched by the diff, at their old and new positions
+        touched = {_cell(old[s]) for s in diff.removed + diff.changed}
+        touched.update(_cell(slots[s]) for s in diff.added + diff.changed)
+        self.slots, self._cells = slots, cells
+        for row, col in touched:
+            index = self.index(row, col)
+            self.dataChanged.emit(index, index)
+
+    def index_of(self, slot_id):
+        button = self.slots.get(slot_id)
+        if button is None or self._cells.get(_cell(button)) != slot_id:
+            return QModelIndex()
+        return self.index(*_cell(button))
+
+    def set_available(self, slot_id, exists):
+        if (slot_id not in self._missing) == exists:
+            return
+        if exists:
+            self._missing.discard(slot_id)
+        else:
+            self._missing.add(slot_id)
+        self._changed(slot_id)
+
+    def set_icon(self, slot_id, name, icon):
+        # The slot may have been removed or given another icon by a reload meanwhile
+        if self.slots.get(slot_id, {}).get("icon") == name:
+            self._icons[slot_id] = (name, icon)
+            self._changed(slot_id, [Qt.DecorationRole])
+
+    def _icon(self, button):
+        name = button.get("icon")
+        if not name:
+            return None
+        slot_id = button["slot_id"]
+        cached = self._icons.get(slot_id)
+        if cached is not None and cached[0] == name:
+            return cached[1]
+        if (slot_id, name) not in self._requested:
+            self._requested.add((slot_id, name))
+            self.request_icon(button)
+        return None
+
+    def _changed(self, slot_id, roles=()):
+        index = self.index_of(slot_id)
+        if index.isValid():
+            self.dataChanged.emit(index, index, list(roles))
+
+
+class SlotDelegate(QStyledItemDelegate):
+    def __init__(self, view, icon_size):
+        super().__init__(view)
+        self.view = view
+        self.icon_size = icon_size
+
+    def initStyleOption(self, option, index):
+        super().initStyleOption(option, index)
+        option.displayAlignment = Qt.AlignCenter
+        option.decorationSize = QSize(self.icon_size, self.icon_size)
+        option.textElideMode = Qt.ElideRight
+        if (index.row(), index.column()) == self.view.pressed_cell:
+            option.state |= QStyle.State_Sunken  # QSS ::item:pressed
+
+    def paint(self, painter, option, index):
+        if index.model().slot_id(index) is not None:  # Gaps in the layout stay bare
+            super().paint(painter, option, index)
+
+    def sizeHint(self, option, index):
+        return QSize(CELL_WIDTH, CELL_HEIGHT)
+
+
+class SlotGridView(QTableView):
+    slot_clicked = Signal(str)
+    slot_menu_requested = Signal(str, object)  # slot_id, global QPoint
+
+    def __init__(self, model, icon_size, parent=None):
+        super().__init__(parent)
+        self.pressed_cell = None  # (row, col) under a held left button
+        self.setObjectName("slotGrid")
+        self.setModel(model)
+        self.setItemDelegate(SlotDelegate(self, icon_size))
+        self.setIconSize(QSize(icon_size, icon_size))
+        # Uniform fixed sections: Qt maps scroll offsets to cells arithmetically
+        for header, size in ((self.horizontalHeader(), CELL_WIDTH), (self.verticalHeader(), CELL_HEIGHT)):
+            header.hide()
+            header.setSectionResizeMode(QHeaderView.Fixed)
+            header.setMinimumSectionSize(1)
+            header.setDefaultSectionSize(size)
+        self.setShowGrid(False)
+        self.setWordWrap(False)
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setHorizontalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setMouseTracking(True)
+        self.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.customContextMenuRequested.connect(self._menu_requested)
+        self.clicked.connect(self._clicked)
+        model.modelReset.connect(self.updateGeometry)
+
+    def sizeHint(self):
+        model = self.model()
+        frame = 2 * self.frameWidth()
+        cols = max(1, min(model.columnCount(), HINT_COLS))
+        rows = max(1, min(model.rowCount(), HINT_ROWS))
+        return QSize(cols * CELL_WIDTH + frame, rows * CELL_HEIGHT + frame)
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            self._set_pressed(self.indexAt(event.position().toPoint()))
+        super().mousePressEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        super().mouseReleaseEvent(event)
+        self._set_pressed(QModelIndex())
+
+    def keyPressEvent(self, event):
+        if event.key() in (Qt.Key_Return, Qt.Key_Enter, Qt.Key_Space) and self.currentIndex().isValid():
+            self._clicked(self.currentIndex())
+            return
+        super().keyPressEvent(event)
+
+    def _set_pressed(self, index):
+        previous = self.pressed_cell
+        self.pressed_cell = (index.row(), index.column()) if index.isValid() else None
+        if previous is not None:
+            self.update(self.model().index(*previous))
+        if index.isValid():
+            self.update(index)
+
+    def _clicked(self, index):
+        if index.flags() & Qt.ItemIsEnabled:
+            slot_id = self.model().slot_id(index)
+            if slot_id is not None:
+                self.slot_clicked.emit(slot_id)
+
+    def _menu_requested(self, pos):
+        slot_id = self.model().slot_id(self.indexAt(pos))
+        if slot_id is not None:
+            self.slot_menu_requested.emit(slot_id, self.viewport().mapToGlobal(pos))
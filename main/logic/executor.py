@@ -0,0 +1,162 @@
+# Non-blocking action executor for deck slots
+#
+# Macro slots used to run through os.system() on the GUI thread, freezing the
+# deck until the script exited. ActionExecutor runs each action on a worker
+# thread (which in turn owns the child process), tracks it as a Job and
+# reports state changes back to the GUI through Qt signals. Signals emitted
+# from worker threads are delivered to GUI-thread slots as queued calls.
+
+import itertools
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from PySide6.QtCore import QObject, Signal
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+TIMEOUT = "timeout"
+CANCELLED = "cancelled"
+
+OUTPUT_TAIL = 4096  # chars of stdout/stderr kept per job
+
+
+class Job:
+    def __init__(self, job_id, slot_id, label, argv=None, timeout=None, cwd=None, runner=None):
+        self.job_id = job_id
+        self.slot_id = slot_id
+        self.label = label
+        self.argv = argv
+        self.runner = runner
+        self.timeout = timeout
+        self.cwd = cwd
+        self.status = QUEUED
+        self.returncode = None
+        self.stdout = ""
+        self.stderr = ""
+        self.error = None
+        self.queued_at = time.monotonic()
+        self.started_at = None
+        self.finished_at = None
+        self.cancel_requested = False
+        self._proc = None
+        self._future = None
+
+    @property
+    def ok(self):
+        return self.status == DONE
+
+    @property
+    def duration(self):
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    def attach_process(self, proc):
+        """Register the process doing this job's work so cancel() can kill it."""
+        self._proc = proc
+        if self.cancel_requested:
+            proc.kill()
+
+    def describe(self):
+        if self.status == DONE:
+            return "OK"
+        if self.status == FAILED:
+            return f"FAIL: {self.error or f'exit {self.returncode}'}"
+        return self.status.upper()
+
+
+class ActionExecutor(QObject):
+    job_started = Signal(object)
+    job_finished = Signal(object)
+
+    def __init__(self, max_workers=4, parent=None):
+        super().__init__(parent)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="otk-action")
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def submit(self, slot_id, label, argv=None, timeout=None, cwd=None, runner=None):
+        """Queue a job. Either argv (spawned as a child process) or runner(job) does the work."""
+        job = Job(next(self._ids), slot_id, label, argv, timeout, cwd, runner)
+        with self._lock:
+            self._jobs[job.job_id] = job
+        job._future = self._pool.submit(self._run, job)
+        return job
+
+    def jobs(self, slot_id=None):
+        with self._lock:
+            return [j for j in self._jobs.values() if slot_id is None or j.slot_id == slot_id]
+
+    def cancel(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return False
+            job.cancel_requested = True
+            proc = job._proc
+        if job._future.cancel():
+            # Never started; the worker will not report it, so do it here
+            self._finish(job, CANCELLED)
+        elif proc is not None and proc.poll() is None:
+            proc.kill()
+        return True
+
+    def cancel_slot(self, slot_id):
+        return sum(self.cancel(job.job_id) for job in self.jobs(slot_id))
+
+    def shutdown(self):
+        for job in self.jobs():
+            self.cancel(job.job_id)
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, job):
+        with self._lock:
+            cancelled = job.cancel_requested
+            if not cancelled:
+                job.status = RUNNING
+                job.started_at = time.monotonic()
+        if cancelled:
+            return self._finish(job, CANCELLED)
+        self.job_started.emit(job)
+
+        try:
+            (job.runner or self._run_process)(job)
+            status = DONE if job.returncode == 0 else FAILED
+        except TimeoutError:
+            status = TIMEOUT
+        except Exception as e:
+            job.error = str(e)
+            status = FAILED
+        if job.cancel_requested:
+            status = CANCELLED
+        job.stdout = job.stdout[-OUTPUT_TAIL:]
+        job.stderr = job.stderr[-OUTPUT_TAIL:]
+        self._finish(job, status)
+
+    @staticmethod
+    def _run_process(job):
+        proc = subprocess.Popen(job.argv, cwd=job.cwd, stdout=subprocess.PIPE,
+                                stderr=subprocess.PIPE, text=True, errors="replace")
+        job.attach_process(proc)
+        try:
+            job.stdout, job.stderr = proc.communicate(timeout=job.timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            job.stdout, job.stderr = proc.communicate()
+            raise TimeoutError(f"timed out after {job.timeout}s")
+        finally:
+            job.returncode = proc.returncode
+
+    def _finish(self, job, status):
+        with self._lock:
+            if job.finished_at is not None:
+                return
+            job.status = status
+            job.finished_at = time.monotonic()
+            self._jobs.pop(job.job_id, None)
+        self.job_finished.emit(job)
@@ -0,0 +1,106 @@
+# Config hot-reload for otk_agents.yaml and the command deck layout
+#
+# Agents and slots used to be read once at startup, so any edit meant a
+# restart: full startup cost again, and submit_count/activity state lost.
+# ConfigWatcher reports when a watched config file settles after a change
+# (editors often write it in several steps, or save via rename, which drops a
+# plain QFileSystemWatcher file watch), and diff_keyed() compares the old and
+# new key -> config mappings so callers only touch the widgets that changed.
+
+import os
+from collections import namedtuple
+
+from PySide6.QtCore import QObject, QFileSystemWatcher, QTimer, Signal
+
+RELOAD_DEBOUNCE_MS = 200  # quiet period before a changed config is re-read
+POLL_MS = 2000
+
+
+class ConfigDiff(namedtuple('ConfigDiff', 'added removed changed reordered')):
+    __slots__ = ()
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed or self.reordered)
+
+
+def diff_keyed(old, new):
+    """Structural diff of two ordered key -> config mappings; key lists follow the new order."""
+    added = [k for k in new if k not in old]
+    removed = [k for k in old if k not in new]
+    changed = [k for k in new if k in old and old[k] != new[k]]
+    reordered = [k for k in old if k in new] != [k for k in new if k in old]
+    return ConfigDiff(added, removed, changed, reordered)
+
+
+def _signature(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class ConfigWatcher(QObject):
+    changed = Signal(str)  # path, once its contents have settled
+
+    def __init__(self, debounce_ms=RELOAD_DEBOUNCE_MS, parent=None):
+        super().__init__(parent)
+        self._signatures = {}  # path -> (mtime_ns, size) last reported
+        self._pending = set()
+        self._polled = set()
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._on_file_changed)
+        self._watcher.directoryChanged.connect(self._on_dir_changed)
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(debounce_ms)
+        self._debounce.timeout.connect(self._fire)
+        self._poll_timer = QTimer(self)
+        self._poll_timer.timeout.connect(self._poll)
+
+    def watch(self, path):
+        path = os.path.normpath(str(path))
+        self._signatures[path] = _signature(path)
+        parent = os.path.dirname(path) or '.'
+        if os.path.isdir(parent):
+            self._watcher.addPath(parent)  # Sees the file come back after a save-by-rename
+        if not (os.path.exists(path) and self._watcher.addPath(path)):
+            self._polled.add(path)
+            if not self._poll_timer.isActive():
+                self._poll_timer.start(POLL_MS)
+
+    def _schedule(self, path):
+        self._pending.add(path)
+        self._debounce.start()
+
+    def _on_file_changed(self, path):
+        path = os.path.normpath(path)
+        if os.path.exists(path):
+            self._watcher.addPath(path)  # No-op if still watched
+        self._schedule(path)
+
+    def _on_dir_changed(self, directory):
+        directory = os.path.normpath(directory)
+        for path in self._signatures:
+            if (os.path.dirname(path) or '.') == directory and _signature(path) != self._signatures[path]:
+                if os.path.exists(path) and self._watcher.addPath(path):
+                    self._polled.discard(path)
+                self._schedule(path)
+
+    def _poll(self):
+        for path in list(self._polled):
+            if _signature(path) != self._signatures[path]:
+                self._schedule(path)
+                if os.path.exists(path) and self._watcher.addPath(path):
+                    self._polled.discard(path)
+        if not self._polled:
+            self._poll_timer.stop()
+
+    def _fire(self):
+        pending, self._pending = self._pending, set()
+        for path in sorted(pending):
+            signature = _signature(path)
+            if signature is None or signature == self._signatures.get(path):
+                continue  # Mid-save, or touched without changing; the next event will catch up
+            self._signatures[path] = signature
+            self.changed.emit(path)
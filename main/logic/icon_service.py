@@ -0,0 +1,129 @@
+# Asynchronous slot icons for the command deck
+#
+# Decoding the multi-resolution .ico files in resources/icons on the GUI thread
+# held up startup, so icon support had been commented out. IconService decodes
+# on a worker thread, picks the frame that best fits the button's pixel size
+# (logical size x device pixel ratio), and writes the scaled result to a PNG in
+# the cache directory named after the source's content hash and pixel size.
+# Later launches only hash the .ico and load that PNG; nothing is decoded from
+# .ico again until the file changes. Results reach the GUI thread as QImages
+# and are served from QPixmapCache from then on.
+
+import hashlib
+import os
+import queue
+import threading
+
+from PySide6.QtCore import QObject, Qt, Signal
+from PySide6.QtGui import QIcon, QImage, QImageReader, QPixmap, QPixmapCache
+
+_STOP = object()
+
+
+def _best_frame(path, px):
+    """Smallest frame at least px wide/high, else the largest one."""
+    reader = QImageReader(path)
+    best = None
+    for i in range(max(reader.imageCount(), 1)):
+        if i and not reader.jumpToImage(i):
+            break
+        image = reader.read()
+        if image.isNull():
+            continue
+        side = max(image.width(), image.height())
+        if best is None:
+            best = image
+            continue
+        best_side = max(best.width(), best.height())
+        if (best_side < px and side > best_side) or (px <= side < best_side):
+            best = image
+    return best
+
+
+def _icon(pixmap, dpr):
+    pixmap = QPixmap(pixmap)  # Shallow copy; the cached one keeps its own ratio
+    pixmap.setDevicePixelRatio(dpr)
+    return QIcon(pixmap)
+
+
+class IconService(QObject):
+    _loaded = Signal(object, object, object)  # (path, px), cache key, QImage or None; from the worker
+
+    def __init__(self, cache_dir, parent=None):
+        super().__init__(parent)
+        self.cache_dir = str(cache_dir)
+        self._keys = {}      # (path, px) -> QPixmapCache key, once known
+        self._waiting = {}   # (path, px) -> [(callback, dpr)], requests in flight
+        self._queue = queue.Queue()
+        self._loaded.connect(self._on_loaded)  # Queued: lands on the GUI thread
+        self._thread = threading.Thread(target=self._run, name="IconService", daemon=True)
+        self._thread.start()
+
+    def request(self, path, size, dpr, callback):
+        """Call callback(QIcon) with path's icon for a size x size logical box; immediately if cached."""
+        path = os.path.normpath(str(path))
+        px = max(1, round(size * dpr))
+        request = (path, px)
+        key = self._keys.get(request)
+        if key is not None:
+            pixmap = QPixmapCache.find(key)
+            if pixmap is not None and not pixmap.isNull():
+                callback(_icon(pixmap, dpr))
+                return
+        if request in self._waiting:
+            self._waiting[request].append((callback, dpr))
+            return
+        self._waiting[request] = [(callback, dpr)]
+        self._queue.put(request)
+
+    def close(self):
+        self._queue.put(_STOP)
+
+    # ---- Worker thread ----
+
+    def _run(self):
+        while True:
+            request = self._queue.get()
+            if request is _STOP:
+                return
+            try:
+                key, image = self._load(*request)
+            except Exception as e:
+                print(f"Icon load failed ({request[0]}): {e}")
+                key, image = None, None
+            self._loaded.emit(request, key, image)
+
+    def _load(self, path, px):
+        try:
+            with open(path, 'rb') as f:
+                digest = hashlib.sha1(f.read()).hexdigest()
+        except FileNotFoundError:
+            return None, None  # Slot names an icon we don't have; the button just has none
+        key = f"otk-icon:{digest}:{px}"
+        png = os.path.join(self.cache_dir, f"{digest[:20]}_{px}.png")
+        image = QImage(png)
+        if not image.isNull():
+            return key, image  # Warm: no .ico decoding
+
+        image = _best_frame(path, px)
+        if image is None:
+            raise ValueError("no readable frames")
+        if max(image.width(), image.height()) != px:
+            image = image.scaled(px, px, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp = png + '.tmp'
+        if image.save(tmp, 'PNG'):
+            os.replace(tmp, png)
+        return key, image
+
+    # ---- GUI thread ----
+
+    def _on_loaded(self, request, key, image):
+        waiting = self._waiting.pop(request, [])
+        if image is None:
+            return
+        self._keys[request] = key
+        pixmap = QPixmap.fromImage(image)
+        QPixmapCache.insert(key, pixmap)
+        for callback, dpr in waiting:
+            callback(_icon(pixmap, dpr))
@@ -0,0 +1,180 @@
+# Per-action latency spans for the command deck
+#
+# handle_click only ever logged OK/FAIL, so slow slots were invisible without
+# attaching a profiler. An ActionTrace times the stages of one click (resolve,
+# read, clipboard, spawn, log) with perf_counter; finishing it feeds per-slot
+# and per-type histograms for every stage plus the total, and hands a record
+# to on_trace (the deck writes those to logs/OTK_metrics.jsonl). A macro
+# click's trace stays open until its job finishes and gets the run as a stage.
+#
+# Histograms are log-bucketed (about 5% relative error) so they stay small no
+# matter how many clicks they see; percentiles are read from the buckets.
+#
+#   cd main && python -m logic.latency ../logs/OTK_metrics.jsonl
+
+import datetime
+import json
+import math
+import sys
+import time
+
+BUCKET_GROWTH = 1.1
+MIN_MS = 0.001
+
+
+class LatencyHistogram:
+    __slots__ = ('buckets', 'count', 'total', 'min', 'max')
+
+    def __init__(self):
+        self.buckets = {}  # bucket index -> count
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def record(self, ms):
+        index = int(math.log(max(ms, MIN_MS) / MIN_MS, BUCKET_GROWTH))
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += ms
+        self.min = min(self.min, ms)
+        self.max = max(self.max, ms)
+
+    def percentile(self, q):
+        if not self.count:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                # Geometric middle of the bucket, clamped to what was actually seen
+                value = MIN_MS * BUCKET_GROWTH ** (index + 0.5)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+
+class ActionTrace:
+    def __init__(self, recorder, slot_id, action_type):
+        self.recorder = recorder
+        self.slot_id = slot_id
+        self.action_type = action_type
+        self.stages = {}
+        self._start = time.perf_counter()
+
+    def stage(self, name):
+        return _Span(self, name)
+
+    def add(self, name, ms):
+        """Count time measured elsewhere (e.g. a macro's run on a worker) towards a stage."""
+        self.stages[name] = self.stages.get(name, 0.0) + ms
+
+    def finish(self, status):
+        total = (time.perf_counter() - self._start) * 1000
+        self.recorder._finish(self, status, total)
+        return total
+
+
+class _Span:
+    __slots__ = ('trace', 'name', 'start')
+
+    def __init__(self, trace, name):
+        self.trace = trace
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.trace.add(self.name, (time.perf_counter() - self.start) * 1000)
+        return False
+
+
+class LatencyRecorder:
+    def __init__(self, on_trace=None):
+        self.on_trace = on_trace  # called with one JSON-ready dict per finished action
+        self.histograms = {}      # (kind, key, stage) -> LatencyHistogram; kind is 'slot' or 'type'
+        self.version = 0          # bumped on every record, so views can skip redundant redraws
+
+    def start(self, slot_id, action_type):
+        return ActionTrace(self, slot_id, action_type)
+
+    def record(self, slot_id, action_type, stage, ms):
+        """Add one stage sample. ActionTrace.finish() reports every click through here and replay() re-feeds a metrics log."""
+        self._histogram('slot', slot_id, stage).record(ms)
+        self._histogram('type', action_type, stage).record(ms)
+        self.version += 1
+
+    def histogram(self, kind, key, stage='total'):
+        return self.histograms.get((kind, key, stage))
+
+    def summary(self, kind='slot', stage='total'):
+        """[(key, count, p50, p95, p99)] slowest p95 first."""
+        rows = [(key, h.count, h.percentile(50), h.percentile(95), h.percentile(99))
+                for (k, key, s), h in self.histograms.items() if k == kind and s == stage]
+        rows.sort(key=lambda row: row[3], reverse=True)
+        return rows
+
+    def _histogram(self, kind, key, stage):
+        h = self.histograms.get((kind, key, stage))
+        if h is None:
+            h = self.histograms[(kind, key, stage)] = LatencyHistogram()
+        return h
+
+    def _finish(self, trace, status, total):
+        for stage, ms in trace.stages.items():
+            self.record(trace.slot_id, trace.action_type, stage, ms)
+        self.record(trace.slot_id, trace.action_type, 'total', total)
+        if self.on_trace:
+            self.on_trace({
+                "timestamp": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "slot_id": trace.slot_id,
+                "type": trace.action_type,
+                "status": status,
+                "total_ms": round(total, 3),
+                "stages": {stage: round(ms, 3) for stage, ms in trace.stages.items()},
+            })
+
+    @classmethod
+    def replay(cls, path):
+        """Rebuild histograms from a metrics JSONL written through on_trace."""
+        recorder = cls()
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    continue
+                for stage, ms in event.get("stages", {}).items():
+                    recorder.record(event["slot_id"], event["type"], stage, ms)
+                if "total_ms" in event:
+                    recorder.record(event["slot_id"], event["type"], "total", event["total_ms"])
+        return recorder
+
+
+def format_table(rows, title):
+    lines = [f"{title:<24} {'n':>6} {'p50':>8} {'p95':>8} {'p99':>8}"]
+    for key, count, p50, p95, p99 in rows:
+        lines.append(f"{str(key)[:24]:<24} {count:>6} {p50:>8.2f} {p95:>8.2f} {p99:>8.2f}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print("usage: python -m logic.latency METRICS_JSONL [stage]")
+        return
+    recorder = LatencyRecorder.replay(argv[0])
+    stage = argv[1] if len(argv) > 1 else 'total'
+    print(format_table(recorder.summary('type', stage), f"type ({stage}, ms)"))
+    print()
+    print(format_table(recorder.summary('slot', stage), f"slot ({stage}, ms)"))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+# Buffered logging pipeline for the command deck
+#
+# One LogPipeline owns a set of named sinks (flat text, CE JSONL). emit() only
+# formats the record and appends it to an in-memory buffer; the buffer is
+# written through a long-lived file handle when it grows past flush_bytes or
+# when the owner calls flush() (the deck drives this from a QTimer). Each sink
+# rotates its file by size and/or calendar day so logs/ stays bounded; a sink
+# given an archive (logic.segments.SegmentStore) rolls into gzip segments that
+# are all kept instead of numbered backups that age out.
+
+import datetime
+import json
+import os
+from pathlib import Path
+
+
+class Sink:
+    def __init__(self, path, max_bytes=5_000_000, daily=False, backups=5, encoding='utf-8', archive=None):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.daily = daily
+        self.backups = backups
+        self.archive = archive
+        self.encoding = encoding
+        self._buffer = []
+        self._buffered = 0
+        self._handle = None
+        self._opened_on = None
+
+    def format(self, record):
+        raise NotImplementedError
+
+    def add(self, record):
+        line = self.format(record)
+        self._buffer.append(line)
+        self._buffered += len(line)
+        return self._buffered
+
+    def flush(self):
+        if not self._buffer:
+            return
+        data = ''.join(self._buffer)
+        self._rotate_if_needed(len(data))
+        self._open().write(data)
+        self._handle.flush()
+        # Only now: if anything above raised (file locked, disk full) the batch is retried next flush
+        self._buffer.clear()
+        self._buffered = 0
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+
+    def _open(self):
+        if self._handle is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._handle = open(self.path, 'a', encoding=self.encoding)
+            self._opened_on = datetime.date.today()
+        return self._handle
+
+    def _rotate_if_needed(self, incoming):
+        if self._handle is None:
+            if not self.path.exists():
+                return
+            size = self.path.stat().st_size
+            opened_on = datetime.date.fromtimestamp(self.path.stat().st_mtime)
+        else:
+            size = self._handle.tell()
+            opened_on = self._opened_on
+        too_big = self.max_bytes and size and size + incoming > self.max_bytes
+        new_day = self.daily and opened_on != datetime.date.today()
+        if too_big or (new_day and size):
+            self._rotate()
+
+    def _rotate(self):
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+        if self.archive is not None:
+            self.archive.roll()
+            return
+        for i in range(self.backups - 1, 0, -1):
+            older = self.path.with_name(f"{self.path.name}.{i}")
+            if older.exists():
+                os.replace(older, self.path.with_name(f"{self.path.name}.{i + 1}"))
+        if self.backups:
+            os.replace(self.path, self.path.with_name(f"{self.path.name}.1"))
+        else:
+            self.path.unlink()
+
+
+class TextSink(Sink):
+    """Pipe-delimited lines; records are sequences of fields or preformatted strings."""
+
+    def format(self, record):
+        if isinstance(record, str):
+            return record + "\n"
+        return " | ".join(str(field) for field in record) + "\n"
+
+
+class JsonlSink(Sink):
+    def format(self, record):
+        return json.dumps(record) + "\n"
+
+
+class LogPipeline:
+    def __init__(self, flush_bytes=64 * 1024, on_error=None):
+        self.flush_bytes = flush_bytes
+        self.on_error = on_error  # called as on_error(sink_name, exception)
+        self.sinks = {}
+
+    def add_sink(self, name, sink):
+        self.sinks[name] = sink
+        return sink
+
+    def emit(self, name, record):
+        sink = self.sinks[name]
+        if sink.add(record) >= self.flush_bytes:
+            self._flush_sink(name, sink)
+
+    def flush(self):
+        for name, sink in list(self.sinks.items()):
+            self._flush_sink(name, sink)
+
+    def close(self):
+        self.flush()
+        for sink in self.sinks.values():
+            try:
+                sink.close()
+            except OSError:
+                pass
+
+    def _flush_sink(self, name, sink):
+        try:
+            sink.flush()
+        except OSError as e:
+            if self.on_error:
+                self.on_error(name, e)
+            else:
+                print(f"Log sink {name} failed: {e}")
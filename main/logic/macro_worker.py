@@ -0,0 +1,126 @@
+# Long-lived interpreter that runs macro scripts for WorkerPool
+#
+# Speaks JSON lines over private duplicates of stdin/stdout; the real fds 0/1
+# are pointed at devnull so a macro (or a child it spawns) can't corrupt the
+# protocol. Each script runs through runpy with a fresh __main__ namespace and
+# its output captured; imported modules stay cached, which is the point.
+# run_script() puts back what a script commonly changes so the next one sees
+# the same process: cwd, os.environ, sys.argv and sys.path. atexit handlers
+# the script registers run when it finishes, as they would at interpreter
+# exit, and modules imported from the script's own folder are dropped so the
+# next run re-imports them. Other modules' state is not reset.
+
+import atexit
+import io
+import json
+import os
+import runpy
+import sys
+import traceback
+import importlib
+from contextlib import redirect_stdout, redirect_stderr
+
+
+def preload(modules):
+    failed = []
+    for name in modules:
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            failed.append(f"{name}: {e}")
+    return failed
+
+
+def _run_exit_funcs(funcs):
+    for func, args, kwargs in reversed(funcs):
+        try:
+            func(*args, **kwargs)
+        except BaseException:
+            traceback.print_exc()
+
+
+def _forget_local_modules(folder, before):
+    folder = os.path.normcase(folder) + os.sep
+    for name, module in list(sys.modules.items()):
+        path = getattr(module, "__file__", None)
+        if name not in before and path and os.path.normcase(os.path.abspath(path)).startswith(folder):
+            del sys.modules[name]
+
+
+def run_script(script):
+    out, err = io.StringIO(), io.StringIO()
+    folder = os.path.dirname(os.path.abspath(script))
+    saved_argv, saved_path = sys.argv, sys.path[:]
+    saved_cwd, saved_env = os.getcwd(), dict(os.environ)
+    saved_modules = set(sys.modules)
+    exit_funcs = []
+    saved_register, saved_unregister = atexit.register, atexit.unregister
+
+    def register(func, *args, **kwargs):
+        exit_funcs.append((func, args, kwargs))
+        return func
+
+    def unregister(func):
+        exit_funcs[:] = [entry for entry in exit_funcs if entry[0] != func]
+
+    sys.argv = [script]
+    sys.path[0] = folder
+    atexit.register, atexit.unregister = register, unregister
+    status = 0
+    try:
+        with redirect_stdout(out), redirect_stderr(err):
+            try:
+                runpy.run_path(script, run_name="__main__")
+            except SystemExit as e:
+                if e.code is None:
+                    status = 0
+                elif isinstance(e.code, int):
+                    status = e.code
+                else:
+                    print(e.code, file=sys.stderr)
+                    status = 1
+            except BaseException:
+                traceback.print_exc()
+                status = 1
+            _run_exit_funcs(exit_funcs)
+    finally:
+        atexit.register, atexit.unregister = saved_register, saved_unregister
+        sys.argv = saved_argv
+        sys.path[:] = saved_path
+        os.chdir(saved_cwd)
+        if os.environ != saved_env:
+            os.environ.clear()
+            os.environ.update(saved_env)
+        _forget_local_modules(folder, saved_modules)
+    return status, out.getvalue(), err.getvalue()
+
+
+def main():
+    requests = os.fdopen(os.dup(0), "r", encoding="utf-8")
+    replies = os.fdopen(os.dup(1), "w", encoding="utf-8")
+    devnull = os.open(os.devnull, os.O_RDWR)
+    os.dup2(devnull, 0)
+    os.dup2(devnull, 1)
+    sys.stdin = io.StringIO("")
+
+    for line in requests:
+        request = json.loads(line)
+        op = request.get("op")
+        if op == "preload":
+            reply = {"ok": True, "failed": preload(request.get("modules", []))}
+        elif op == "run":
+            failed = preload(request.get("preload", []))
+            status, out, err = run_script(request["script"])
+            if failed:
+                err = "Preload failed: " + "; ".join(failed) + "\n" + err
+            reply = {"ok": True, "status": status, "stdout": out, "stderr": err}
+        elif op == "quit":
+            break
+        else:
+            reply = {"ok": False, "error": f"unknown op {op!r}"}
+        replies.write(json.dumps(reply) + "\n")
+        replies.flush()
+
+
+if __name__ == "__main__":
+    main()
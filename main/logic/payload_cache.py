@@ -0,0 +1,176 @@
+# Slot payload cache for the command deck
+#
+# Prompt slots used to stat and re-read their seed markdown on every click, and
+# note/macro slots stat'ed their targets each time. PayloadCache preloads every
+# payload on a background thread at startup, keeps prompt text in an LRU with a
+# byte budget and remembers whether each payload exists. Entries are
+# invalidated by QFileSystemWatcher; paths the watcher refuses (some network or
+# synced volumes) fall back to mtime polling on a timer. invalidate() bumps a
+# per-path generation, and a read only goes into the cache if no invalidation
+# happened while it was in flight, so a preload racing an edit can't pin
+# stale text. The budget counts each file's size on disk.
+
+import os
+import threading
+from collections import OrderedDict
+
+from PySide6.QtCore import QObject, QFileSystemWatcher, QTimer, Signal
+
+POLL_MS = 2000
+
+
+def payload_key(path):
+    # Qt may hand paths back with different separators than we registered
+    return os.path.normpath(str(path))
+
+
+class PayloadCache(QObject):
+    availability_changed = Signal(str, bool)  # path, exists
+
+    def __init__(self, max_bytes=8 * 1024 * 1024, parent=None):
+        super().__init__(parent)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._texts = OrderedDict()  # path -> (text, bytes on disk), most recently used last
+        self._text_bytes = 0
+        self._generations = {}       # path -> times invalidated
+        self._stats = {}             # path -> (exists, mtime_ns, size)
+        self._polled = set()
+        self._watched = set()        # paths registered through preload(), files and dirs
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._on_changed)
+        self._watcher.directoryChanged.connect(self._on_dir_changed)
+        self._poll_timer = QTimer(self)
+        self._poll_timer.timeout.connect(self._poll)
+
+    # ---- Lookups used on click ----
+
+    def exists(self, path):
+        path = payload_key(path)
+        with self._lock:
+            stat = self._stats.get(path)
+        if stat is None:
+            stat = self._restat(path)
+        return stat[0]
+
+    def known(self, path):
+        """Cached existence of path, or None if it has not been stat'ed yet; never touches the disk."""
+        with self._lock:
+            stat = self._stats.get(payload_key(path))
+        return None if stat is None else stat[0]
+
+    def read_text(self, path):
+        path = payload_key(path)
+        with self._lock:
+            entry = self._texts.get(path)
+            if entry is not None:
+                self._texts.move_to_end(path)
+                return entry[0]
+            generation = self._generations.get(path, 0)
+        with open(path, "r", encoding="utf-8") as f:
+            size = os.fstat(f.fileno()).st_size
+            text = f.read()
+        self._store(path, text, size, generation)
+        return text
+
+    # ---- Population and invalidation ----
+
+    def preload(self, text_paths=(), stat_paths=()):
+        """Watch every path now; stat them and read text_paths on a background thread."""
+        text_paths = [payload_key(p) for p in text_paths]
+        stat_paths = [payload_key(p) for p in stat_paths]
+        for path in text_paths + stat_paths:
+            self._watch(path)
+        threading.Thread(target=self._load_all, args=(text_paths, stat_paths), daemon=True).start()
+
+    def invalidate(self, path):
+        path = payload_key(path)
+        with self._lock:
+            self._generations[path] = self._generations.get(path, 0) + 1
+            entry = self._texts.pop(path, None)
+            if entry is not None:
+                self._text_bytes -= entry[1]
+
+    def _load_all(self, text_paths, stat_paths):
+        for path in stat_paths:
+            self._restat(path)
+        for path in text_paths:
+            if self._restat(path)[0]:
+                try:
+                    self.read_text(path)
+                except OSError:
+                    pass
+
+    def _restat(self, path):
+        try:
+            st = os.stat(path)
+            stat = (True, st.st_mtime_ns, st.st_size)
+        except OSError:
+            stat = (False, 0, 0)
+        with self._lock:
+            previous = self._stats.get(path)
+            self._stats[path] = stat
+        if previous is None or previous[0] != stat[0]:
+            self.availability_changed.emit(path, stat[0])
+        return stat
+
+    def _store(self, path, text, size, generation):
+        if size > self.max_bytes:
+            return  # Too big to be worth holding; read through each time
+        with self._lock:
+            if self._generations.get(path, 0) != generation:
+                return  # Invalidated while we were reading; the text may be stale
+            old = self._texts.pop(path, None)
+            if old is not None:
+                self._text_bytes -= old[1]
+            self._texts[path] = (text, size)
+            self._text_bytes += size
+            while self._text_bytes > self.max_bytes:
+                _, (_, evicted) = self._texts.popitem(last=False)
+                self._text_bytes -= evicted
+
+    def _watch(self, path):
+        if path in self._watched:
+            return
+        self._watched.add(path)
+        parent = os.path.dirname(path)
+        if parent not in self._watched and os.path.isdir(parent):
+            self._watched.add(parent)
+            self._watcher.addPath(parent)  # Catches files created after startup
+        if not (os.path.exists(path) and self._watcher.addPath(path)):
+            self._polled.add(path)
+            if not self._poll_timer.isActive():
+                self._poll_timer.start(POLL_MS)
+
+    def _on_changed(self, path):
+        path = payload_key(path)
+        self.invalidate(path)
+        if not self._restat(path)[0]:
+            # Deleted or replaced by an atomic save; the watcher drops it either way
+            self._polled.add(path)
+            if not self._poll_timer.isActive():
+                self._poll_timer.start(POLL_MS)
+        else:
+            self._watcher.addPath(path)  # No-op if still watched
+
+    def _on_dir_changed(self, directory):
+        directory = payload_key(directory)
+        with self._lock:
+            paths = [p for p in self._stats if os.path.dirname(p) == directory]
+        for path in paths:
+            before = self._stats.get(path)
+            if self._restat(path) != before:
+                self.invalidate(path)
+                if path in self._polled and self._watcher.addPath(path):
+                    self._polled.discard(path)
+
+    def _poll(self):
+        for path in list(self._polled):
+            before = self._stats.get(path)
+            after = self._restat(path)
+            if after != before:
+                self.invalidate(path)
+                if after[0] and self._watcher.addPath(path):
+                    self._polled.discard(path)
+        if not self._polled:
+            self._poll_timer.stop()
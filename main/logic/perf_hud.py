@@ -0,0 +1,68 @@
+# On-screen latency overlay for the command deck
+#
+# A translucent label pinned to the deck's top-right corner showing p50/p95/p99
+# per action type and the slowest slots, from a logic.latency.LatencyRecorder.
+# It ignores the mouse, redraws only while visible and only when the recorder
+# has new samples. Styled by QLabel#perfHud in styles/cognition_mode*.qss.
+
+from PySide6.QtCore import QEvent, Qt, QTimer
+from PySide6.QtGui import QFont
+from PySide6.QtWidgets import QLabel
+
+HUD_REFRESH_MS = 500
+HUD_SLOW_SLOTS = 5
+HUD_MARGIN = 8
+
+
+class PerfHud(QLabel):
+    def __init__(self, recorder, parent):
+        super().__init__(parent)
+        self.recorder = recorder
+        self._drawn_version = -1
+        self.setObjectName("perfHud")
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.setTextFormat(Qt.PlainText)
+        font = QFont("Consolas")
+        font.setStyleHint(QFont.Monospace)
+        self.setFont(font)
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.redraw)
+        parent.installEventFilter(self)
+        self.hide()
+
+    def toggle(self):
+        self.setVisible(not self.isVisible())
+        if self.isVisible():
+            self._drawn_version = -1
+            self.redraw()
+            self.raise_()
+            self.timer.start(HUD_REFRESH_MS)
+        else:
+            self.timer.stop()
+
+    def redraw(self):
+        if self.recorder.version == self._drawn_version:
+            return
+        self._drawn_version = self.recorder.version
+        lines = [f"{'ms':<14}{'n':>5}{'p50':>8}{'p95':>8}{'p99':>8}"]
+        for key, count, p50, p95, p99 in self.recorder.summary('type'):
+            lines.append(f"{key[:14]:<14}{count:>5}{p50:>8.1f}{p95:>8.1f}{p99:>8.1f}")
+        slow = self.recorder.summary('slot')[:HUD_SLOW_SLOTS]
+        if slow:
+            lines.append("slowest slots (p95)")
+            for key, count, p50, p95, p99 in slow:
+                lines.append(f"{key[:14]:<14}{count:>5}{p50:>8.1f}{p95:>8.1f}{p99:>8.1f}")
+        if len(lines) == 1:
+            lines.append("no actions yet")
+        self.setText("\n".join(lines))
+        self.adjustSize()
+        self._reposition()
+
+    def _reposition(self):
+        parent = self.parentWidget()
+        self.move(parent.width() - self.width() - HUD_MARGIN, HUD_MARGIN)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Resize and self.isVisible():
+            self._reposition()
+        return False
@@ -0,0 +1,294 @@
+# Managed child processes for exec slots
+#
+# exec slots used to call subprocess.Popen([target], shell=True) and drop the
+# handle: children were never reaped, their output went nowhere and nothing
+# stopped a slot being launched twenty times. ProcessManager keeps a table of
+# every child it starts (pid, slot, start time, status) and a daemon thread per
+# child reaps its exit. Commands still run through the shell by default, so
+# payloads like "shutdown /s /t 0" keep working, but a payload that is just an
+# executable on disk or PATH is started directly, so the pid in the table is
+# the program's own. Where a shell does sit in between, terminate() and the
+# CPU/memory figures cover the whole process tree: psutil when installed,
+# otherwise taskkill /T on Windows and the child's own session elsewhere.
+#
+# Output is only captured for slots that opt in with "capture": true. Their
+# stdout/stderr lines go through two reader threads into a shared queue that
+# the GUI drains on one timer tick, into a bounded deque per process, so a
+# chatty child costs the GUI thread one batch every OUTPUT_FLUSH_MS rather
+# than a signal per line. Other children get DEVNULL: they are left running
+# when the deck quits, as before, and a pipe whose reader is gone would fail
+# their next write.
+#
+# Per-slot "instances" policy: an integer caps concurrent copies, "single"
+# refuses a second one and "focus" raises the running copy's window instead
+# (Windows only; elsewhere it behaves like "single"). CPU and memory are
+# sampled with psutil when it is installed.
+
+import collections
+import ctypes
+import datetime
+import itertools
+import os
+import shlex
+import shutil
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+RUNNING = "running"
+EXITED = "exited"
+FAILED = "failed"
+KILLED = "killed"
+
+LAUNCHED = "launched"
+FOCUSED = "focused"
+LIMITED = "limited"
+
+DEFAULT_INSTANCES = 5
+OUTPUT_LINES = 500     # lines kept per process
+OUTPUT_FLUSH_MS = 100
+FINISHED_KEPT = 50     # exited processes still listed
+
+
+def command_line(target, args=(), shell=True):
+    """(argv, shell) to hand Popen for an exec slot's payload and optional "args".
+
+    The shell is skipped when the payload names an executable on its own.
+    """
+    if not shell or shutil.which(target):
+        return [target, *args], False
+    if not args:
+        return [target], True  # As the deck always ran it; the payload may carry its own arguments
+    join = subprocess.list2cmdline if sys.platform == "win32" else shlex.join
+    return join([target, *args]), True
+
+
+def kill_tree(pid):
+    """Terminate pid and everything it started, e.g. a shell and the program it ran."""
+    if psutil is not None:
+        try:
+            root = psutil.Process(pid)
+            tree = [root, *root.children(recursive=True)]
+        except psutil.Error:
+            return
+        for member in tree:
+            try:
+                member.terminate()
+            except psutil.Error:
+                pass
+    elif sys.platform == "win32":
+        subprocess.run(["taskkill", "/T", "/F", "/PID", str(pid)], stdout=subprocess.DEVNULL,
+                       stderr=subprocess.DEVNULL, creationflags=subprocess.CREATE_NO_WINDOW)
+    else:
+        try:
+            os.killpg(pid, signal.SIGTERM)  # launch() gave the child its own session
+        except ProcessLookupError:
+            pass
+
+
+class ManagedProcess:
+    def __init__(self, proc_id, slot_id, label, argv, proc, captured):
+        self.proc_id = proc_id
+        self.slot_id = slot_id
+        self.label = label
+        self.argv = argv
+        self.pid = proc.pid
+        self.started = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.started_at = time.monotonic()
+        self.finished_at = None
+        self.status = RUNNING
+        self.returncode = None
+        self.captured = captured
+        self.output = collections.deque(maxlen=OUTPUT_LINES)  # (stream, line), when captured
+        self.cpu_percent = None
+        self.rss = None
+        self.kill_requested = False
+        self._proc = proc
+        self._tree = {}  # pid -> psutil.Process, kept so cpu_percent has a baseline
+
+    @property
+    def running(self):
+        return self.status == RUNNING
+
+    @property
+    def duration(self):
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    def describe(self):
+        if self.status == EXITED:
+            return "OK"
+        if self.status == FAILED:
+            return f"FAIL: exit {self.returncode}"
+        return self.status.upper()
+
+
+class ProcessManager(QObject):
+    process_started = Signal(object)
+    process_exited = Signal(object)
+    output_ready = Signal(list)  # [(ManagedProcess, stream, line)] since the last flush
+    usage_updated = Signal()
+    _exited = Signal(object)     # from reaper threads; delivered on the GUI thread
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._ids = itertools.count(1)
+        self._running = {}  # proc_id -> ManagedProcess
+        self._finished = collections.deque(maxlen=FINISHED_KEPT)
+        self._pending = collections.deque()  # appended by reader threads, drained by flush()
+        self._exited.connect(self._on_exited)
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.flush)
+
+    def processes(self, slot_id=None):
+        """Running processes first, then recently exited ones; newest first within each."""
+        rows = list(reversed(self._running.values())) + list(reversed(self._finished))
+        return [p for p in rows if slot_id is None or p.slot_id == slot_id]
+
+    def running(self, slot_id):
+        return [p for p in self._running.values() if p.slot_id == slot_id]
+
+    def launch(self, slot_id, label, argv, instances=DEFAULT_INSTANCES, shell=True, capture=False, cwd=None):
+        """Start argv (see command_line) for a slot unless its instances policy says otherwise.
+
+        Returns (outcome, process).
+        """
+        running = self.running(slot_id)
+        if running:
+            if instances == "focus":
+                if focus_window(running[-1].pid):
+                    return FOCUSED, running[-1]
+                return LIMITED, running[-1]
+            limit = 1 if instances in ("single", "focus") else int(instances)
+            if len(running) >= limit:
+                return LIMITED, running[-1]
+
+        output = subprocess.PIPE if capture else subprocess.DEVNULL
+        proc = subprocess.Popen(argv, shell=shell, cwd=cwd, stdin=subprocess.DEVNULL,
+                                stdout=output, stderr=output, text=True, errors="replace", bufsize=1,
+                                start_new_session=sys.platform != "win32")
+        process = ManagedProcess(next(self._ids), slot_id, label, argv, proc, capture)
+        self._running[process.proc_id] = process
+        if capture:
+            err = threading.Thread(target=self._read, args=(process, proc.stderr, "stderr"), daemon=True)
+            err.start()
+            threading.Thread(target=self._read_and_reap, args=(process, err), daemon=True).start()
+            if not self.timer.isActive():
+                self.timer.start(OUTPUT_FLUSH_MS)
+        else:
+            threading.Thread(target=self._reap, args=(process,), daemon=True).start()
+        self.process_started.emit(process)
+        return LAUNCHED, process
+
+    def terminate(self, proc_id):
+        process = self._running.get(proc_id)
+        if process is None:
+            return False
+        process.kill_requested = True
+        kill_tree(process.pid)
+        return True
+
+    def flush(self):
+        batch = []
+        while self._pending:
+            process, stream, line = self._pending.popleft()
+            process.output.append((stream, line))
+            batch.append((process, stream, line))
+        if batch:
+            self.output_ready.emit(batch)
+        if not self._running and not self._pending:
+            self.timer.stop()
+
+    def sample_usage(self):
+        """Refresh cpu_percent/rss of running processes and their children; a no-op without psutil."""
+        if psutil is None:
+            return False
+        for process in self._running.values():
+            try:
+                root = process._tree.get(process.pid) or psutil.Process(process.pid)
+                members = [root, *root.children(recursive=True)]
+            except psutil.Error:
+                process.cpu_percent = process.rss = None
+                continue
+            primed = bool(process._tree)
+            tree, cpu, rss = {}, 0.0, 0
+            for member in members:
+                member = process._tree.get(member.pid, member)
+                try:
+                    with member.oneshot():
+                        cpu += member.cpu_percent(None)  # 0.0 on a member's first call, which primes it
+                        rss += member.memory_info().rss
+                except psutil.Error:
+                    continue
+                tree[member.pid] = member
+            process._tree = tree
+            if primed:
+                process.cpu_percent, process.rss = cpu, rss
+        self.usage_updated.emit()
+        return True
+
+    def _read(self, process, stream, name):
+        for line in stream:
+            self._pending.append((process, name, line.rstrip("\r\n")))
+        stream.close()
+
+    def _read_and_reap(self, process, err):
+        # stdout's reader outlives stderr's, then waits for the exit code
+        self._read(process, process._proc.stdout, "stdout")
+        err.join()
+        self._reap(process)
+
+    def _reap(self, process):
+        process.returncode = process._proc.wait()
+        self._exited.emit(process)
+
+    def _on_exited(self, process):
+        process.finished_at = time.monotonic()
+        if process.kill_requested:
+            process.status = KILLED
+        else:
+            process.status = EXITED if process.returncode == 0 else FAILED
+        process._proc = None
+        process._tree = {}
+        self._running.pop(process.proc_id, None)
+        self._finished.append(process)
+        self.flush()  # Its last lines belong before the exit
+        self.process_exited.emit(process)
+
+
+def focus_window(pid):
+    """Bring a visible top-level window of pid (or, with psutil, its children) to the front. Windows only."""
+    if sys.platform != "win32":
+        return False
+    pids = {pid}
+    if psutil is not None:
+        try:
+            pids.update(child.pid for child in psutil.Process(pid).children(recursive=True))
+        except psutil.Error:
+            pass
+    user32 = ctypes.windll.user32
+    found = []
+
+    @ctypes.WINFUNCTYPE(ctypes.c_bool, ctypes.c_void_p, ctypes.c_void_p)
+    def visit(hwnd, _):
+        owner = ctypes.c_ulong()
+        user32.GetWindowThreadProcessId(hwnd, ctypes.byref(owner))
+        if owner.value in pids and user32.IsWindowVisible(hwnd):
+            found.append(hwnd)
+            return False
+        return True
+
+    user32.EnumWindows(visit, 0)
+    if not found:
+        return False
+    if user32.IsIconic(found[0]):
+        user32.ShowWindow(found[0], 9)  # SW_RESTORE
+    return bool(user32.SetForegroundWindow(found[0]))
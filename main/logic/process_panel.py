@@ -0,0 +1,134 @@
+# Process panel for exec slots
+#
+# A small tool window over logic.process_manager.ProcessManager: one row per
+# child (pid, slot, start time, status, CPU, memory) and a log pane streaming
+# their output. The pane is a QPlainTextEdit capped at PANE_LINES blocks, so it
+# drops its oldest lines instead of growing; selecting a row shows just that
+# process's buffered tail. Rows and resource usage refresh only while visible.
+
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtGui import QFont, QTextCursor
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QPlainTextEdit,
+    QTableWidget, QTableWidgetItem, QHeaderView, QSplitter
+)
+
+from logic.process_manager import psutil
+
+REFRESH_MS = 2000
+PANE_LINES = 2000
+COLUMNS = ["PID", "Slot", "Started", "Status", "CPU %", "Mem MB"]
+
+
+def _line(process, stream, line):
+    mark = "!" if stream == "stderr" else " "
+    return f"[{process.slot_id} {process.pid}]{mark} {line}"
+
+
+class ProcessPanel(QWidget):
+    def __init__(self, manager, parent=None):
+        super().__init__(parent)
+        self.manager = manager
+        self._rows = []  # ManagedProcess per table row
+        self.setWindowTitle("OTK Processes")
+        self.setWindowFlags(Qt.Tool)
+        self.resize(640, 480)
+
+        layout = QVBoxLayout(self)
+        bar = QHBoxLayout()
+        self.summary = QLabel()
+        bar.addWidget(self.summary, 1)
+        self.terminate_btn = QPushButton("⏹ Terminate")
+        self.terminate_btn.clicked.connect(self.terminate_selected)
+        bar.addWidget(self.terminate_btn)
+        layout.addLayout(bar)
+
+        splitter = QSplitter(Qt.Vertical)
+        self.table = QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels(COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.table.setSelectionMode(QTableWidget.SingleSelection)
+        self.table.itemSelectionChanged.connect(self.show_selected_output)
+        splitter.addWidget(self.table)
+        self.pane = QPlainTextEdit()
+        self.pane.setReadOnly(True)
+        self.pane.setMaximumBlockCount(PANE_LINES)
+        font = QFont("Consolas")
+        font.setStyleHint(QFont.Monospace)
+        self.pane.setFont(font)
+        splitter.addWidget(self.pane)
+        layout.addWidget(splitter)
+
+        manager.output_ready.connect(self.append_output)
+        manager.process_started.connect(self.populate)
+        manager.process_exited.connect(self.populate)
+        manager.usage_updated.connect(self.populate)
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self.show_selected_output()
+        self.timer.start(REFRESH_MS)
+
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self):
+        if not self.manager.sample_usage():
+            self.populate()  # usage_updated would have repopulated
+
+    def populate(self, *_):
+        if not self.isVisible():
+            return
+        selected = self.selected()
+        self._rows = self.manager.processes()
+        running = sum(p.running for p in self._rows)
+        usage = "" if psutil is not None else " · install psutil for CPU/memory"
+        self.summary.setText(f"{running} running · {len(self._rows) - running} exited{usage}")
+        self.table.blockSignals(True)
+        self.table.clearSelection()
+        self.table.setRowCount(len(self._rows))
+        for row, process in enumerate(self._rows):
+            cpu = "" if process.cpu_percent is None else f"{process.cpu_percent:.0f}"
+            mem = "" if process.rss is None else f"{process.rss / 2**20:.0f}"
+            status = process.status if process.running else f"{process.describe()} ({process.duration:.0f}s)"
+            for col, text in enumerate((str(process.pid), process.label, process.started, status, cpu, mem)):
+                self.table.setItem(row, col, QTableWidgetItem(text))
+            if process is selected:
+                self.table.selectRow(row)
+        self.table.blockSignals(False)
+        self.terminate_btn.setEnabled(bool(selected and selected.running))
+
+    def selected(self):
+        rows = self.table.selectionModel().selectedRows() if self.table.selectionModel() else []
+        return self._rows[rows[0].row()] if rows and rows[0].row() < len(self._rows) else None
+
+    def show_selected_output(self):
+        process = self.selected()
+        self.terminate_btn.setEnabled(bool(process and process.running))
+        if process is None:
+            return  # Keep streaming everything into the pane as it is
+        if not process.captured:
+            self.pane.setPlainText(f'[{process.slot_id} {process.pid}] output not captured; set "capture": true on the slot')
+            return
+        self.pane.setPlainText("\n".join(_line(process, stream, line) for stream, line in process.output))
+        self.pane.moveCursor(QTextCursor.End)
+
+    def append_output(self, batch):
+        if not self.isVisible():
+            return  # Lines stay in each process's buffer until a row is selected
+        process = self.selected()
+        lines = [_line(p, stream, line) for p, stream, line in batch if process is None or p is process]
+        if lines:
+            self.pane.appendPlainText("\n".join(lines))
+
+    def terminate_selected(self):
+        process = self.selected()
+        if process is not None and process.running:
+            self.manager.terminate(process.proc_id)
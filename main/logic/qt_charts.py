@@ -0,0 +1,171 @@
+# Lightweight chart rendering straight onto a QPainter
+#
+# The reflection bar chart and the handoff mindmap only need a handful of
+# shapes and labels, so instead of importing matplotlib (and PIL to re-encode)
+# they are painted onto a QImage and encoded once. The same paint functions
+# drive QSvgGenerator for SVG output. Requires a QGuiApplication instance.
+
+import math
+
+from PySide6.QtCore import Qt, QRect, QRectF, QPointF, QSize
+from PySide6.QtGui import QImage, QPainter, QColor, QFont, QFontMetricsF, QPen
+
+FORMATS = ('png', 'svg')
+AXIS_COLOR = QColor('#333333')
+GRID_COLOR = QColor('#dddddd')
+
+
+def render_bar_chart(path, labels, values, colors, title='', ylabel='', fmt='png', size=(500, 300)):
+    _render(path, fmt, size, _paint_bar_chart, labels=labels, values=values, colors=colors,
+            title=title, ylabel=ylabel)
+
+
+def render_mindmap(path, center_text, nodes, center_color='lightblue', fmt='png', size=(400, 400)):
+    _render(path, fmt, size, _paint_mindmap, center_text=center_text, nodes=nodes,
+            center_color=center_color)
+
+
+def _render(path, fmt, size, paint, **kwargs):
+    if fmt not in FORMATS:
+        raise ValueError(f"format must be one of {FORMATS}, got {fmt!r}")
+    width, height = size
+    if fmt == 'svg':
+        from PySide6.QtSvg import QSvgGenerator
+        target = QSvgGenerator()
+        target.setFileName(str(path))
+        target.setSize(QSize(width, height))
+        target.setViewBox(QRect(0, 0, width, height))
+    else:
+        target = QImage(width, height, QImage.Format_ARGB32_Premultiplied)
+        target.fill(Qt.white)
+
+    painter = QPainter(target)
+    painter.setRenderHint(QPainter.Antialiasing)
+    painter.setRenderHint(QPainter.TextAntialiasing)
+    if fmt == 'svg':
+        painter.fillRect(0, 0, width, height, Qt.white)
+    try:
+        paint(painter, width, height, **kwargs)
+    finally:
+        painter.end()
+
+    if fmt == 'png' and not target.save(str(path), 'PNG'):
+        raise OSError(f"Could not write {path}")
+
+
+def _nice_step(top):
+    step = max(1, math.ceil(top / 5))
+    magnitude = 10 ** int(math.log10(step))
+    for m in (1, 2, 5, 10):
+        if step <= m * magnitude:
+            return m * magnitude
+    return step
+
+
+def _paint_bar_chart(p, w, h, labels, values, colors, title, ylabel):
+    font = QFont()
+    font.setPointSizeF(8.5)
+    title_font = QFont(font)
+    title_font.setPointSizeF(10.5)
+    title_font.setBold(True)
+    fm = QFontMetricsF(font)
+
+    label_extent = max((fm.horizontalAdvance(str(l)) for l in labels), default=0) * math.sin(math.pi / 4)
+    left, top, right = 56.0, 30.0 if title else 12.0, 14.0
+    bottom = 14.0 + label_extent + fm.height()
+    plot = QRectF(left, top, max(10.0, w - left - right), max(10.0, h - top - bottom))
+
+    peak = max(values, default=0)
+    step = _nice_step(peak + 1)
+    y_max = step * math.ceil((peak + 1) / step)
+
+    def y_at(v):
+        return plot.bottom() - plot.height() * v / y_max
+
+    # Title and y label
+    if title:
+        p.setFont(title_font)
+        p.setPen(AXIS_COLOR)
+        p.drawText(QRectF(0, 4, w, top - 6), Qt.AlignCenter, title)
+    p.setFont(font)
+    if ylabel:
+        p.save()
+        p.translate(12, plot.center().y())
+        p.rotate(-90)
+        p.drawText(QRectF(-plot.height() / 2, -fm.height() / 2, plot.height(), fm.height()), Qt.AlignCenter, ylabel)
+        p.restore()
+
+    # Grid and y ticks
+    tick = 0
+    while tick <= y_max:
+        y = y_at(tick)
+        p.setPen(QPen(GRID_COLOR, 1))
+        p.drawLine(QPointF(plot.left(), y), QPointF(plot.right(), y))
+        p.setPen(AXIS_COLOR)
+        p.drawText(QRectF(plot.left() - 40, y - fm.height() / 2, 34, fm.height()), Qt.AlignRight | Qt.AlignVCenter, str(tick))
+        tick += step
+
+    # Bars, value labels and rotated x labels
+    n = max(len(values), 1)
+    slot = plot.width() / n
+    for i, (label, value, color) in enumerate(zip(labels, values, colors)):
+        cx = plot.left() + slot * (i + 0.5)
+        bar = QRectF(cx - slot * 0.4, y_at(value), slot * 0.8, plot.bottom() - y_at(value))
+        p.setPen(QPen(QColor('#888888'), 0.8))
+        p.setBrush(QColor(color))
+        p.drawRect(bar)
+
+        p.setPen(AXIS_COLOR)
+        p.drawText(QRectF(cx - slot / 2, bar.top() - fm.height() - 2, slot, fm.height()), Qt.AlignCenter, str(value))
+
+        text = str(label)
+        tw = fm.horizontalAdvance(text)
+        p.save()
+        p.translate(cx, plot.bottom() + 6)
+        p.rotate(-45)
+        p.drawText(QRectF(-tw, -fm.height() / 2, tw, fm.height()), Qt.AlignRight | Qt.AlignVCenter, text)
+        p.restore()
+
+    # Axes
+    p.setPen(QPen(AXIS_COLOR, 1))
+    p.setBrush(Qt.NoBrush)
+    p.drawLine(plot.bottomLeft(), plot.bottomRight())
+    p.drawLine(plot.bottomLeft(), plot.topLeft())
+
+
+def _paint_mindmap(p, w, h, center_text, nodes, center_color):
+    font = QFont()
+    font.setPointSizeF(8.5)
+    p.setFont(font)
+    fm = QFontMetricsF(font)
+
+    center = QPointF(w / 2, h / 2)
+    core_r = min(w, h) * 0.22
+    ring_r = min(w, h) * 0.38
+    n = max(len(nodes), 1)
+
+    # Spokes first so the nodes paint over them
+    positions = []
+    for i in range(len(nodes)):
+        angle = 2 * math.pi * i / n - math.pi / 2
+        positions.append(QPointF(center.x() + ring_r * math.cos(angle), center.y() + ring_r * math.sin(angle)))
+    p.setPen(QPen(QColor('#9aa7b0'), 1.2))
+    for pos in positions:
+        p.drawLine(center, pos)
+
+    p.setPen(Qt.NoPen)
+    p.setBrush(QColor(center_color))
+    p.drawEllipse(center, core_r, core_r)
+    p.setPen(AXIS_COLOR)
+    p.drawText(QRectF(center.x() - core_r, center.y() - core_r, core_r * 2, core_r * 2),
+               Qt.AlignCenter | Qt.TextWordWrap, center_text)
+
+    for label, pos in zip(nodes, positions):
+        text = str(label)
+        box = QRectF(0, 0, fm.horizontalAdvance(text) + 14, fm.height() + 8)
+        box.moveCenter(pos)
+        p.setPen(QPen(QColor('#6b7b86'), 1))
+        p.setBrush(QColor('#f4f6f8'))
+        p.drawRoundedRect(box, box.height() / 2, box.height() / 2)
+        p.setPen(AXIS_COLOR)
+        p.drawText(box, Qt.AlignCenter, text)
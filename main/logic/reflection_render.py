@@ -0,0 +1,71 @@
+# Reflection graph rendering in a detached process
+#
+# The graph used to be built with matplotlib inside quit_app(), so the HUD sat
+# frozen before closing. render_detached() hands a small JSON spec to a child
+# interpreter running this file and returns immediately; the child paints the
+# chart with qt_charts onto a QImage (or an SVG generator) on the offscreen
+# platform, so neither matplotlib nor painting is on the quit path. qt_charts
+# is only imported in the child. A signature of the spec is stored next to the
+# output once the render succeeds, so an unchanged submit_count skips it.
+
+import hashlib
+import json
+import os
+import subprocess
+import sys
+
+FORMATS = ('png', 'svg')  # as qt_charts.FORMATS, without importing Qt here
+
+
+def signature(spec):
+    return hashlib.sha1(json.dumps(spec, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def _stamp_path(out):
+    return out + '.sig'
+
+
+def is_current(spec):
+    out = spec['out']
+    if not os.path.exists(out):
+        return False
+    try:
+        with open(_stamp_path(out), 'r') as f:
+            return f.read().strip() == signature(spec)
+    except OSError:
+        return False
+
+
+def render_detached(spec):
+    """Spawn a renderer for spec unless its artifact is already current. Returns the child, or None."""
+    if spec.get('format', 'png') not in FORMATS:
+        raise ValueError(f"format must be one of {FORMATS}")
+    spec = dict(spec, out=os.path.abspath(spec['out']))
+    if is_current(spec):
+        return None
+    kwargs = {}
+    if os.name == 'nt':
+        kwargs['creationflags'] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        kwargs['start_new_session'] = True
+    return subprocess.Popen([sys.executable, os.path.abspath(__file__), json.dumps(spec)],
+                            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                            close_fds=True, env=dict(os.environ, QT_QPA_PLATFORM='offscreen'), **kwargs)
+
+
+def render(spec):
+    from PySide6.QtGui import QGuiApplication
+    from logic import qt_charts  # Deferred to the child; the HUD never loads it
+
+    app = QGuiApplication.instance() or QGuiApplication([])  # qt_charts needs one for fonts
+    qt_charts.render_bar_chart(spec['out'], spec['labels'], spec['values'], spec['colors'],
+                               title=spec.get('title', ''), ylabel=spec.get('ylabel', ''),
+                               fmt=spec.get('format', 'png'))
+    with open(_stamp_path(spec['out']), 'w') as f:
+        f.write(signature(spec))
+    del app
+
+
+if __name__ == '__main__':
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    render(json.loads(sys.argv[1]))
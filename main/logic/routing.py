@@ -0,0 +1,177 @@
+# Compiled keyword/regex routing for the Prompt Bay
+#
+# Agents declare routing rules in otk_agents.yaml:
+#
+#   RFP Scout:
+#     routing:
+#       keywords: [RFP, tender]
+#       regex: ['bid\s+due']
+#       priority: 10
+#
+# All rules (plus tag rules such as #creative) are compiled once into a single
+# case-insensitive regex with one named group per rule; keywords inside a rule
+# are folded into a trie so each position is rejected on its first character.
+# match() only rescans the region that changed since the previous call (widened
+# by the longest match any rule can produce) and returns agents ranked by
+# (priority, hit count). Rules whose match length is unbounded, like the
+# 'bid\s+due' above, or that use lookarounds make match() rescan the whole text.
+
+import re
+from collections import namedtuple
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+Candidate = namedtuple('Candidate', 'agent score hits')
+RouteResult = namedtuple('RouteResult', 'candidates tags')
+
+MAX_REGEX_SPAN = 256  # longer (or unbounded) regex matches disable incremental rescans
+LOOKAROUND_RE = re.compile(r'\(\?<?[=!]')
+
+
+def _regex_span(rx):
+    """Longest match rx can produce, or None if unbounded or it peeks past its match."""
+    if LOOKAROUND_RE.search(rx):
+        return None
+    width = sre_parse.parse(rx, re.IGNORECASE).getwidth()[1]
+    return width if width <= MAX_REGEX_SPAN else None
+
+
+def _trie_pattern(words):
+    """Build a regex alternation shaped like a trie, e.g. [RFP, RFQ] -> RF(?:P|Q)."""
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word.lower():
+            node = node.setdefault(ch, {})
+        node[''] = True
+
+    def walk(node):
+        end = node.get('') is True
+        branches = [re.escape(ch) + walk(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if end:
+            body = '(?:' + body + ')?'
+        return body
+
+    return walk(trie)
+
+
+def _common_prefix(a, b):
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[:mid] == b[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _common_suffix(a, b, limit):
+    lo, hi = 0, min(len(a), len(b), limit)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[len(a) - mid:] == b[len(b) - mid:]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+class RoutingEngine:
+    def __init__(self, rules):
+        """rules: iterable of (target, kind, keywords, regexes, priority); kind is 'agent' or 'tag'."""
+        self.rules = []
+        parts = []
+        span = 1
+        for target, kind, keywords, regexes, priority in rules:
+            alternatives = []
+            keywords = [k for k in keywords if k]
+            if keywords:
+                alternatives.append(_trie_pattern(keywords))
+                if span is not None:
+                    span = max(span, max(len(k) for k in keywords))
+            for rx in regexes:
+                re.compile(rx)  # Surface bad patterns with the rule that owns them
+                alternatives.append(f'(?:{rx})')
+                width = _regex_span(rx)
+                span = None if span is None or width is None else max(span, width)
+            if not alternatives:
+                continue
+            parts.append(f'(?P<r{len(self.rules)}>' + '|'.join(alternatives) + ')')
+            self.rules.append((target, kind, priority))
+        self._regex = re.compile('|'.join(parts), re.IGNORECASE) if parts else None
+        self._span = span  # None: every edit rescans the whole text
+        self._text = ''
+        self._hits = []  # (start, end, rule index), sorted by start
+
+    @classmethod
+    def from_agents(cls, agents, tags=None):
+        rules = []
+        for name, config in agents.items():
+            routing = (config or {}).get('routing') or {}
+            rules.append((name, 'agent', routing.get('keywords', []), routing.get('regex', []),
+                          routing.get('priority', 0)))
+        for tag, keywords in (tags or {}).items():
+            rules.append((tag, 'tag', keywords, [], 0))
+        return cls(rules)
+
+    def reset(self):
+        self._text = ''
+        self._hits = []
+
+    def match(self, text):
+        if self._regex is not None:
+            self._update(text)
+        self._text = text
+
+        counts = {}
+        for _, _, rule in self._hits:
+            counts[rule] = counts.get(rule, 0) + 1
+        candidates = []
+        tags = set()
+        for rule, hits in counts.items():
+            target, kind, priority = self.rules[rule]
+            if kind == 'tag':
+                tags.add(target)
+            else:
+                candidates.append(Candidate(target, priority * 1000 + hits, hits))
+        candidates.sort(key=lambda c: c.score, reverse=True)
+        return RouteResult(candidates, tags)
+
+    def _update(self, text):
+        old = self._text
+        if text == old:
+            return
+        if self._span is None:
+            self._hits = [(m.start(), m.end(), int(m.lastgroup[1:])) for m in self._regex.finditer(text)]
+            return
+        prefix = _common_prefix(old, text)
+        suffix = _common_suffix(old, text, min(len(old), len(text)) - prefix)
+        delta = len(text) - len(old)
+
+        # Anything within `span` of the edit may have changed; rescan just that window
+        lo = max(0, prefix - self._span)
+        hi_old = min(len(old), len(old) - suffix + self._span)
+        hi_new = min(len(text), len(text) - suffix + self._span)
+
+        for s, e, _ in self._hits:
+            if s < lo < e:
+                lo = s  # Never split an existing hit; rescan it whole
+            elif s >= lo:
+                break
+        kept = [h for h in self._hits if h[1] <= lo]
+        tail = [(s + delta, e + delta, r) for s, e, r in self._hits if s >= hi_old]
+        fresh = []
+        for m in self._regex.finditer(text, lo):
+            if m.start() >= hi_new:
+                break  # Past the window; from here on the old hits still hold
+            fresh.append((m.start(), m.end(), int(m.lastgroup[1:])))
+        if fresh:
+            tail = [h for h in tail if h[0] >= fresh[-1][1]]
+        self._hits = kept + fresh + tail
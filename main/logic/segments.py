@@ -0,0 +1,152 @@
+# Segmented history for the append-only CE stores
+#
+# otk_ce_index.md and ce_session_log.jsonl only ever grew, so every reader
+# paid for the whole history and ticked-off tasks never left the hot file.
+# A SegmentStore keeps a small active file plus numbered gzip segments in
+# <name>.segments/ next to it:
+#
+#   roll()     moves the whole active file into a new segment (JSONL logs;
+#              the LogPipeline sink calls it instead of numbering backups)
+#   compact()  moves only resolved "- [x]" task lines into a segment and
+#              leaves open items in the active markdown file
+#
+# Both are meant to run on the thread that owns the file's write handle.
+# iter_lines()/iter_records() read every segment oldest first, then the
+# active file, so history stays queryable. Files are UTF-8, but older CE
+# files carry stray cp1252 bytes: compact() passes those through unchanged
+# (surrogateescape) and readers replace them.
+
+import datetime
+import gzip
+import json
+import os
+import re
+from pathlib import Path
+
+SEGMENT_MAX_BYTES = 1_000_000
+REGROW_FRACTION = 4  # after a compaction, due() waits for max_bytes / 4 of new growth
+RESOLVED_RE = re.compile(r'^\s*- \[[xX]\]')
+
+
+def is_open_line(line):
+    return not RESOLVED_RE.match(line)
+
+
+class SegmentStore:
+    def __init__(self, path, max_bytes=SEGMENT_MAX_BYTES, daily=True, archive_dir=None):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.daily = daily
+        self.archive_dir = Path(archive_dir) if archive_dir else self.path.with_name(self.path.name + '.segments')
+        self._stamp = self.archive_dir / 'last_roll'  # mtime marks the last roll/compaction
+
+    # ---- Reading ----
+
+    def segments(self):
+        """Archive segment paths, oldest first."""
+        if not self.archive_dir.is_dir():
+            return []
+        return sorted(p for p in self.archive_dir.iterdir() if p.name.endswith('.gz'))
+
+    def iter_lines(self, include_active=True):
+        for segment in self.segments():
+            with gzip.open(segment, 'rt', encoding='utf-8', errors='replace') as f:
+                yield from f
+        if include_active and self.path.exists():
+            with open(self.path, 'r', encoding='utf-8', errors='replace') as f:
+                yield from f
+
+    def iter_records(self, include_active=True):
+        """JSON objects across segments; lines that don't parse (torn writes) are skipped."""
+        for line in self.iter_lines(include_active):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+    # ---- Maintenance ----
+
+    def due(self):
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            return False
+        if self.max_bytes and size >= self.max_bytes:
+            # A hot file that is mostly open items stays big; don't rewrite it on every check
+            if size - self._compacted_size() >= self.max_bytes // REGROW_FRACTION:
+                return True
+        return bool(self.daily and size and self._last_roll() != datetime.date.today())
+
+    def roll(self):
+        """Archive the whole active file and truncate it. Returns the new segment, or None."""
+        if not self.path.exists() or self.path.stat().st_size == 0:
+            self._touch()
+            return None
+        with open(self.path, 'rb') as src:
+            segment = self._write_segment(src.read())
+        with open(self.path, 'wb'):
+            pass  # Truncate; the caller reopens for append
+        self._touch()
+        return segment
+
+    def compact(self, keep=is_open_line):
+        """Move lines failing keep() into a segment; False if the file changed under us."""
+        try:
+            before = self.path.stat()
+        except FileNotFoundError:
+            return True
+        with open(self.path, 'r', encoding='utf-8', errors='surrogateescape', newline='') as f:
+            lines = f.readlines()
+        kept, moved = [], []
+        for line in lines:
+            (kept if keep(line) else moved).append(line)
+        if not moved:
+            self._touch(before.st_size)
+            return True
+
+        segment = self._write_segment(''.join(moved).encode('utf-8', errors='surrogateescape'))
+        tmp = self.path.with_name(self.path.name + '.compact.tmp')
+        with open(tmp, 'w', encoding='utf-8', errors='surrogateescape', newline='') as f:
+            f.writelines(kept)
+        after = self.path.stat()
+        if (after.st_mtime_ns, after.st_size) != (before.st_mtime_ns, before.st_size):
+            # Edited meanwhile (e.g. a checkbox ticked in Obsidian); try again next time
+            tmp.unlink()
+            segment.unlink()
+            return False
+        os.replace(tmp, self.path)
+        self._touch(self.path.stat().st_size)
+        return True
+
+    def _write_segment(self, data):
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        existing = self.segments()
+        seq = int(existing[-1].name.split('-', 1)[0]) + 1 if existing else 1
+        stamp = datetime.datetime.now().strftime('%Y%m%dT%H%M%S')
+        segment = self.archive_dir / f"{seq:06d}-{stamp}.gz"
+        tmp = segment.with_name(segment.name + '.tmp')
+        with gzip.open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, segment)
+        return segment
+
+    def _last_roll(self):
+        try:
+            return datetime.date.fromtimestamp(self._stamp.stat().st_mtime)
+        except FileNotFoundError:
+            self._touch()  # First run: start the day clock now rather than rolling at once
+            return datetime.date.today()
+
+    def _compacted_size(self):
+        try:
+            return int(self._stamp.read_text(encoding='utf-8') or 0)
+        except (OSError, ValueError):
+            return 0
+
+    def _touch(self, size=0):
+        """Stamp a roll/compaction; the stamp's content is the active file's size right after it."""
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        self._stamp.write_text(str(size), encoding='utf-8')
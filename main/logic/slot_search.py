@@ -0,0 +1,119 @@
+# Fuzzy slot search for the command palette
+#
+# SlotIndex is built once per layout load. Each slot's label, slot_id, tooltip
+# and payload are lowercased into one newline-separated haystack (so a fuzzy
+# match can't straddle two fields), and every character maps to a posting list
+# of the slots containing it. A search:
+#
+#   1. starts from the rarest query character's posting list, or from the
+#      previous result set when the query extends an earlier one (typing only
+#      ever narrows a subsequence match),
+#   2. scores survivors with str.find for substring hits and one compiled
+#      "a.*?b.*?c" regex for subsequence hits, and
+#   3. keeps the top `limit` by match quality x field weight plus a usage
+#      boost fed from the usage log.
+
+import heapq
+import math
+import re
+from collections import OrderedDict
+
+FIELDS = (('label', 4.0), ('slot_id', 2.0), ('tooltip', 1.5), ('payload', 1.0))
+FIELD_WEIGHTS = tuple(weight for _, weight in FIELDS)
+WORD_START_RE = re.compile(r'(?<=[^a-z0-9])(.)')  # characters that open a word after the first
+RECENT_QUERIES = 32
+USAGE_WEIGHT = 25.0
+
+
+class SlotIndex:
+    def __init__(self, slots):
+        self.slot_ids = []
+        self._hay = []
+        self._postings = {}     # char -> indices of slots containing it
+        self._char_scores = {}  # char -> [(best single-char score before usage boost, index)]
+        for slot in slots:
+            i = len(self.slot_ids)
+            fields = [str(slot.get(name, '')).lower().replace('\n', ' ') for name, _ in FIELDS]
+            self.slot_ids.append(slot['slot_id'])
+            self._hay.append('\n'.join(fields))
+            best = {}
+            for field, text in enumerate(fields):
+                if not text:
+                    continue
+                weight = FIELD_WEIGHTS[field]
+                word_starts = set(WORD_START_RE.findall(text))
+                for ch in set(text):
+                    quality = 100.0 if ch == text[0] else 80.0 if ch in word_starts else 60.0
+                    if quality * weight > best.get(ch, 0.0):
+                        best[ch] = quality * weight
+            for ch, score in best.items():
+                self._postings.setdefault(ch, []).append(i)
+                self._char_scores.setdefault(ch, []).append((score, i))
+        self._boost = [0.0] * len(self.slot_ids)
+        self._recent = OrderedDict()  # query -> indices that matched it
+
+    def __len__(self):
+        return len(self.slot_ids)
+
+    def set_usage(self, counts):
+        """counts: slot_id -> number of uses; more-used slots rank higher on equal matches."""
+        self._boost = [USAGE_WEIGHT * math.log1p(counts.get(slot_id, 0)) for slot_id in self.slot_ids]
+
+    def search(self, query, limit=20):
+        """[(score, slot_id)] best first. An empty query lists the most used slots."""
+        q = query.strip().lower()
+        if not q:
+            ranked = heapq.nlargest(limit, range(len(self.slot_ids)), key=self._boost.__getitem__)
+            return [(self._boost[i], self.slot_ids[i]) for i in ranked]
+
+        if len(q) == 1:
+            return self._search_char(q, limit)
+
+        candidates = self._candidates(q)
+        rx_search = re.compile('.*?'.join(map(re.escape, q))).search
+        hay, boost, weights = self._hay, self._boost, FIELD_WEIGHTS
+        n = len(q)
+        scored = []
+        for i in candidates:
+            text = hay[i]
+            pos = text.find(q)
+            if pos >= 0:
+                start = pos
+                before = text[pos - 1] if pos else '\n'
+                quality = 100.0 if before == '\n' else 80.0 if not before.isalnum() else 60.0
+            else:
+                m = rx_search(text)
+                if m is None:
+                    continue
+                start = m.start()
+                quality = max(10.0, 40.0 - (m.end() - start - n))
+            # Fields are newline-separated, so the field index is the newlines before the hit
+            scored.append((quality * weights[text.count('\n', 0, start)] + boost[i], i))
+
+        self._remember(q, [i for _, i in scored])
+        return [(score, self.slot_ids[i]) for score, i in heapq.nlargest(limit, scored)]
+
+    def _search_char(self, q, limit):
+        # One character: the static part of every score was computed at build time
+        ranked = self._char_scores.get(q, ())
+        boost = self._boost
+        top = heapq.nlargest(limit, ((static + boost[i], i) for static, i in ranked))
+        return [(score, self.slot_ids[i]) for score, i in top]
+
+    def _candidates(self, q):
+        # Longest remembered prefix of this query: its matches are a superset of ours
+        for n in range(len(q) - 1, 0, -1):
+            previous = self._recent.get(q[:n])
+            if previous is not None:
+                self._recent.move_to_end(q[:n])
+                return previous
+        lists = [self._postings.get(ch) for ch in set(q)]
+        if any(p is None for p in lists):
+            return []
+        return min(lists, key=len)
+
+    def _remember(self, q, matched):
+        self._recent[q] = matched
+        self._recent.move_to_end(q)
+        while len(self._recent) > RECENT_QUERIES:
+            self._recent.popitem(last=False)
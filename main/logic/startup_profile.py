@@ -0,0 +1,108 @@
+# Startup profiling for the OTK HUD (--profile-startup)
+#
+# Imported before anything heavy so it can time every module imported after
+# it. A meta-path finder wraps each loader for the duration of exec_module and
+# records inclusive and self time per module; mark() records named
+# milestones (window constructed, first paint). write() dumps a JSON report.
+
+import json
+import sys
+import time
+from datetime import datetime
+
+FLAG = '--profile-startup'
+
+
+def requested(argv=None):
+    return FLAG in (sys.argv if argv is None else argv)
+
+
+class _TimedLoader:
+    def __init__(self, loader, profiler, name):
+        self._loader = loader
+        self._profiler = profiler
+        self._name = name
+
+    def create_module(self, spec):
+        create = getattr(self._loader, 'create_module', None)
+        return create(spec) if create else None
+
+    def exec_module(self, module):
+        profiler = self._profiler
+        profiler._child_time.append(0.0)
+        start = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = profiler._child_time.pop()
+            if profiler._child_time:
+                profiler._child_time[-1] += elapsed
+            profiler.imports.append((self._name, elapsed - children, elapsed))
+            # Put the real loader back so nothing downstream ever sees the wrapper
+            if getattr(module, '__spec__', None) is not None:
+                module.__spec__.loader = self._loader
+            module.__loader__ = self._loader
+
+    def __getattr__(self, attr):
+        return getattr(self._loader, attr)
+
+
+class _TimingFinder:
+    def __init__(self, profiler):
+        self._profiler = profiler
+
+    def find_spec(self, name, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+            spec.loader = _TimedLoader(spec.loader, self._profiler, name)
+        return spec
+
+
+class StartupProfiler:
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.imports = []      # (module, self_seconds, inclusive_seconds)
+        self.marks = {}
+        self._child_time = []
+        self._finder = _TimingFinder(self)
+        sys.meta_path.insert(0, self._finder)
+
+    def mark(self, name):
+        self.marks[name] = time.perf_counter() - self.t0
+
+    def stop_import_timing(self):
+        if self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+
+    def report(self):
+        imports = sorted(self.imports, key=lambda i: i[2], reverse=True)
+        return {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': sys.version.split()[0],
+            'marks_ms': {k: round(v * 1000, 2) for k, v in self.marks.items()},
+            'import_count': len(imports),
+            'imports': [
+                {'module': name, 'self_ms': round(own * 1000, 3), 'cumulative_ms': round(total * 1000, 3)}
+                for name, own, total in imports
+            ],
+        }
+
+    def write(self, path='otk_startup_profile.json', top=15):
+        self.stop_import_timing()
+        report = self.report()
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Startup profile → {path}")
+        for name, ms in report['marks_ms'].items():
+            print(f"  {name:<20} {ms:9.1f} ms")
+        for entry in report['imports'][:top]:
+            print(f"  import {entry['module']:<40} {entry['cumulative_ms']:9.1f} ms (self {entry['self_ms']:.1f})")
+        return report
@@ -0,0 +1,87 @@
+# Usage stats panel for the command deck
+#
+# A small tool window over logic.usage_stats.UsageStats: per-slot uses,
+# failure ratio and last use, plus an hour-of-day sparkline. It only refreshes
+# while visible, and each refresh parses just the lines logged since the last.
+
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QTableWidget, QTableWidgetItem, QHeaderView
+
+from logic.usage_stats import failure_ratio
+
+REFRESH_MS = 5000
+SPARK = "▁▂▃▄▅▆▇█"
+
+
+def sparkline(values):
+    peak = max(values) if values else 0
+    if not peak:
+        return SPARK[0] * len(values)
+    return "".join(SPARK[min(len(SPARK) - 1, v * len(SPARK) // (peak + 1))] for v in values)
+
+
+class UsageStatsPanel(QWidget):
+    def __init__(self, stats, before_refresh=None, parent=None):
+        super().__init__(parent)
+        self.stats = stats
+        self.before_refresh = before_refresh  # e.g. flush buffered log lines first
+        self._populated = False
+        self.setWindowTitle("OTK Usage")
+        self.setWindowFlags(Qt.Tool)
+        self.resize(420, 360)
+
+        layout = QVBoxLayout(self)
+        self.summary = QLabel()
+        layout.addWidget(self.summary)
+        self.table = QTableWidget(0, 4)
+        self.table.setHorizontalHeaderLabels(["Slot", "Uses", "Fail %", "Last used"])
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.table.itemSelectionChanged.connect(self.show_hours)
+        layout.addWidget(self.table)
+        self.hours = QLabel()
+        self.hours.setToolTip("Uses by hour of day, 00-23")
+        layout.addWidget(self.hours)
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self.timer.start(REFRESH_MS)
+
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self):
+        if self.before_refresh:
+            self.before_refresh()
+        if self.stats.refresh() or not self._populated:
+            self.populate()
+
+    def populate(self):
+        self._populated = True
+        stats = self.stats
+        uses = sum(counter['total'] for counter in stats.types.values())
+        self.summary.setText(f"{uses} actions · {len(stats.slots)} slots · "
+                             f"{stats.failure_ratio():.0%} failed")
+        ranked = stats.top_slots()
+        self.table.setRowCount(len(ranked))
+        for row, (slot_id, counter) in enumerate(ranked):
+            uses = QTableWidgetItem()
+            uses.setData(Qt.DisplayRole, counter['total'])
+            cells = (QTableWidgetItem(slot_id), uses,
+                     QTableWidgetItem(f"{failure_ratio(counter):.0%}"), QTableWidgetItem(counter['last']))
+            for col, item in enumerate(cells):
+                self.table.setItem(row, col, item)
+        self.show_hours()
+
+    def show_hours(self):
+        rows = self.table.selectionModel().selectedRows() if self.table.selectionModel() else []
+        slot_id = self.table.item(rows[0].row(), 0).text() if rows else None
+        label = slot_id or "All slots"
+        self.hours.setText(f"{label}: {sparkline(self.stats.hourly(slot_id))}")
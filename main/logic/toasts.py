@@ -0,0 +1,146 @@
+# Pooled toast notifications for the command deck
+#
+# Every Toast used to be a new top-level QLabel with its own stylesheet and two
+# QPropertyAnimations, tracked in a module-global list whose positions were
+# never recomputed, so holding a shortcut stacked dozens of windows off-screen.
+# ToastManager keeps a fixed pool of pre-styled labels and shows at most
+# max_visible of them. A message identical to one already showing bumps a
+# count badge ("✅ Copied ×12") and restarts its timer instead of adding
+# another, and the stack re-flows with one QParallelAnimationGroup. Work per
+# notify() is bounded by the pool size, however fast notifications arrive.
+
+from PySide6.QtCore import QObject, QParallelAnimationGroup, QPoint, QPropertyAnimation, Qt, QTimer
+from PySide6.QtWidgets import QLabel
+
+TOAST_POOL = 6
+TOAST_MAX_VISIBLE = 4
+TOAST_MARGIN = 20
+TOAST_SPACING = 10
+FADE_IN_MS = 300
+FADE_OUT_MS = 500
+REFLOW_MS = 150
+
+
+def _style(dark):
+    bg = "rgba(50, 50, 50, 220)" if dark else "rgba(240, 240, 240, 220)"
+    color = "white" if dark else "black"
+    return f"""
+        background-color: {bg};
+        color: {color};
+        border-radius: 8px;
+        padding: 8px 12px;
+        font-size: 13px;
+    """
+
+
+class _Toast(QLabel):
+    def __init__(self, manager, style):
+        super().__init__()
+        self.setWindowFlags(Qt.ToolTip | Qt.FramelessWindowHint)
+        self.setAttribute(Qt.WA_ShowWithoutActivating)
+        self.setStyleSheet(style)
+        self.message = None
+        self.count = 0
+        self.leaving = False
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(lambda: manager._expire(self))
+        self.fade = QPropertyAnimation(self, b"windowOpacity", self)
+        self.fade.finished.connect(lambda: manager._faded(self))
+        self.slide = QPropertyAnimation(self, b"pos")
+        self.slide.setDuration(REFLOW_MS)
+
+    def set_message(self, message, count):
+        self.message = message
+        self.count = count
+        self.setText(message if count == 1 else f"{message} ×{count}")
+        self.adjustSize()
+
+    def fade_to(self, end, duration):
+        self.fade.stop()
+        self.fade.setDuration(duration)
+        self.fade.setStartValue(self.windowOpacity())
+        self.fade.setEndValue(end)
+        self.fade.start()
+
+
+class ToastManager(QObject):
+    def __init__(self, anchor, dark=True, pool_size=TOAST_POOL, max_visible=TOAST_MAX_VISIBLE):
+        super().__init__(anchor)
+        self.anchor = anchor
+        self.max_visible = min(max_visible, pool_size)
+        style = _style(dark)
+        self._free = [_Toast(self, style) for _ in range(pool_size)]
+        self._all = list(self._free)
+        self._visible = []  # oldest first; drawn bottom-up
+        self._reflow = QParallelAnimationGroup(self)
+
+    def set_dark(self, dark):
+        style = _style(dark)
+        for toast in self._all:
+            toast.setStyleSheet(style)
+
+    def show(self, message, duration=2000):
+        for toast in self._visible:
+            if toast.message == message:
+                # Coalesce; also revives a toast that had started fading out
+                toast.leaving = False
+                toast.set_message(message, toast.count + 1)
+                toast.fade_to(1.0, FADE_IN_MS)
+                toast.timer.start(duration)
+                self._layout()
+                return
+
+        if len(self._visible) >= self.max_visible or not self._free:
+            self._release(self._visible[0])  # Recycle the oldest rather than stack more
+        toast = self._free.pop()
+        toast.leaving = False
+        toast.set_message(message, 1)
+        toast.setWindowOpacity(0.0)
+        self._visible.append(toast)
+        self._layout(placed=toast)
+        toast.show()
+        toast.fade_to(1.0, FADE_IN_MS)
+        toast.timer.start(duration)
+
+    def clear(self):
+        for toast in list(self._visible):
+            self._release(toast)
+
+    def _expire(self, toast):
+        if toast in self._visible:
+            toast.leaving = True
+            toast.fade_to(0.0, FADE_OUT_MS)
+
+    def _faded(self, toast):
+        if toast.leaving and toast in self._visible:
+            self._release(toast)
+            self._layout()
+
+    def _release(self, toast):
+        toast.timer.stop()
+        toast.fade.stop()
+        toast.hide()
+        toast.message = None
+        self._visible.remove(toast)
+        self._free.append(toast)
+
+    def _layout(self, placed=None):
+        """Re-flow the stack from the anchor's bottom-right corner in one animation group."""
+        self._reflow.stop()
+        while self._reflow.animationCount():
+            self._reflow.takeAnimation(0)
+        corner = self.anchor.mapToGlobal(QPoint(self.anchor.width(), self.anchor.height()))
+        y = corner.y() - TOAST_MARGIN
+        for toast in self._visible:
+            y -= toast.height()
+            target = QPoint(corner.x() - toast.width() - TOAST_MARGIN, y)
+            y -= TOAST_SPACING
+            if toast is placed:
+                toast.move(target)
+            elif toast.pos() != target:
+                toast.slide.setStartValue(toast.pos())
+                toast.slide.setEndValue(target)
+                self._reflow.addAnimation(toast.slide)
+        if self._reflow.animationCount():
+            self._reflow.start()
@@ -0,0 +1,222 @@
+# Incremental usage analytics for logs/OTK_usage.log
+#
+# log_action appends "timestamp | slot_id | type | status" lines that nothing
+# read, and ad-hoc scripts rescanned the whole file for every report.
+# UsageStats keeps running per-slot and per-type counts, outcome buckets,
+# hour-of-day histograms and per-day totals in a JSON sidecar together with the
+# byte offset it has consumed, so refresh() only parses lines appended since
+# the last call. A daily/size rotation by LogPipeline (OTK_usage.log ->
+# OTK_usage.log.1) is followed: the rest of the rotated file is read first.
+
+import hashlib
+import json
+import os
+
+STATS_VERSION = 2
+HEAD_BYTES = 1024
+DAYS_KEPT = 90
+FAIL_PREFIXES = ('FAIL', 'TIMEOUT')
+
+
+def outcome(status):
+    if status.startswith(FAIL_PREFIXES):
+        return 'fail'
+    if status == 'OK':
+        return 'ok'
+    if status == 'QUEUED':
+        return 'queued'  # Macros log their real outcome when the job finishes
+    return 'other'
+
+
+def _new_counter(hours=False):
+    counter = {'total': 0, 'ok': 0, 'fail': 0, 'queued': 0, 'other': 0, 'last': ''}
+    if hours:
+        counter['hours'] = [0] * 24
+    return counter
+
+
+def failure_ratio(counter):
+    finished = counter['ok'] + counter['fail']
+    return counter['fail'] / finished if finished else 0.0
+
+
+class UsageStats:
+    def __init__(self, log_path, state_path=None):
+        self.log_path = str(log_path)
+        self.state_path = state_path or self.log_path + '.stats.json'
+        self._reset()
+        self._load_state()
+
+    def _reset(self):
+        self.offset = 0
+        self.inode = 0
+        self.head = ''
+        self.lines = 0
+        self.skipped = 0     # lines that aren't slot actions (e.g. CE_LOG_FAIL)
+        self.slots = {}      # slot_id -> counter with hours
+        self.types = {}      # action type -> counter
+        self.hours = [0] * 24
+        self.days = {}       # 'YYYY-MM-DD' -> count, last DAYS_KEPT days
+
+    # ---- Queries ----
+
+    def slot(self, slot_id):
+        return self.slots.get(slot_id) or _new_counter(hours=True)
+
+    def top_slots(self, n=None):
+        ranked = sorted(self.slots.items(), key=lambda item: item[1]['total'], reverse=True)
+        return ranked[:n] if n else ranked
+
+    def failure_ratio(self, slot_id=None, action_type=None):
+        if slot_id is not None:
+            return failure_ratio(self.slot(slot_id))
+        if action_type is not None:
+            return failure_ratio(self.types.get(action_type) or _new_counter())
+        total = _new_counter()
+        for counter in self.types.values():
+            total['ok'] += counter['ok']
+            total['fail'] += counter['fail']
+        return failure_ratio(total)
+
+    def hourly(self, slot_id=None):
+        return list(self.slot(slot_id)['hours'] if slot_id is not None else self.hours)
+
+    # ---- Maintenance ----
+
+    def refresh(self):
+        """Consume lines appended since the last call. Returns how many were new."""
+        before = self.lines
+        try:
+            st = os.stat(self.log_path)
+        except FileNotFoundError:
+            return 0
+        if st.st_ino == self.inode and st.st_size == self.offset:
+            return 0
+
+        if st.st_ino != self.inode or st.st_size < self.offset or self._head(self.log_path, self.offset) != self.head:
+            rotated = self.log_path + '.1'
+            try:
+                if self.inode and os.stat(rotated).st_ino == self.inode:
+                    self._consume(rotated, self.offset)  # Finish the file that was rotated away
+            except FileNotFoundError:
+                pass
+            self.offset = 0
+            self.inode = st.st_ino
+            self.head = ''
+
+        self.offset = self._consume(self.log_path, self.offset)
+        self.head = self._head(self.log_path, self.offset)
+        if self.lines != before:
+            self._save_state()
+        return self.lines - before
+
+    def rebuild(self):
+        self._reset()
+        return self.refresh()
+
+    @staticmethod
+    def _head(path, offset):
+        if not offset:
+            return ''
+        try:
+            with open(path, 'rb') as f:
+                return hashlib.sha1(f.read(min(offset, HEAD_BYTES))).hexdigest()
+        except OSError:
+            return ''
+
+    def _consume(self, path, offset):
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            chunk = f.read()
+        end = chunk.rfind(b'\n') + 1  # A partial last line waits for the next refresh
+        for raw in chunk[:end].splitlines():
+            self._ingest(raw.decode('utf-8', errors='replace'))
+        if end:
+            self._trim_days()
+        return offset + end
+
+    def _ingest(self, line):
+        parts = line.split(' | ', 3)
+        if len(parts) != 4:
+            if line.strip():
+                self.skipped += 1
+            return
+        timestamp, slot_id, action_type, status = parts
+        kind = outcome(status)
+        self.lines += 1
+
+        counter = self.slots.get(slot_id)
+        if counter is None:
+            counter = self.slots[slot_id] = _new_counter(hours=True)
+        type_counter = self.types.get(action_type)
+        if type_counter is None:
+            type_counter = self.types[action_type] = _new_counter()
+        if kind == 'queued':
+            # A macro click logs QUEUED, then its outcome when the job finishes; only the latter is a use
+            counter['queued'] += 1
+            type_counter['queued'] += 1
+            return
+
+        self._bump(counter, kind, timestamp)
+        hour = int(timestamp[11:13]) if timestamp[11:13].isdigit() else None
+        if hour is not None and hour < 24:
+            counter['hours'][hour] += 1
+            self.hours[hour] += 1
+
+        self._bump(type_counter, kind, timestamp)
+
+        day = timestamp[:10]
+        self.days[day] = self.days.get(day, 0) + 1
+
+    @staticmethod
+    def _bump(counter, kind, timestamp):
+        counter['total'] += 1
+        counter[kind] += 1
+        if timestamp > counter['last']:
+            counter['last'] = timestamp
+
+    def _trim_days(self):
+        if len(self.days) > DAYS_KEPT:
+            for day in sorted(self.days)[:-DAYS_KEPT]:
+                del self.days[day]
+
+    # ---- Sidecar persistence ----
+
+    def _load_state(self):
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') != STATS_VERSION:
+            return
+        self.offset = data['offset']
+        self.inode = data['inode']
+        self.head = data['head']
+        self.lines = data['lines']
+        self.skipped = data['skipped']
+        self.slots = data['slots']
+        self.types = data['types']
+        self.hours = data['hours']
+        self.days = data['days']
+
+    def _save_state(self):
+        data = {
+            'version': STATS_VERSION,
+            'offset': self.offset,
+            'inode': self.inode,
+            'head': self.head,
+            'lines': self.lines,
+            'skipped': self.skipped,
+            'slots': self.slots,
+            'types': self.types,
+            'hours': self.hours,
+            'days': self.days,
+        }
+        tmp = self.state_path + '.tmp'
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp, self.state_path)
+        except OSError as e:
+            print(f"Usage stats not saved: {e}")
@@ -0,0 +1,161 @@
+# Pool of pre-warmed Python interpreters for macro slots
+#
+# Starting a fresh interpreter per macro click costs 100+ ms before the script
+# does anything. WorkerPool keeps a few macro_worker.py processes alive and
+# hands scripts to them over a JSON-lines pipe. Workers are recycled after
+# max_runs scripts, after a crash, or when a run times out or is cancelled.
+#
+# A reused worker is not a fresh interpreter. Between scripts it restores the
+# cwd, os.environ, sys.argv and sys.path, runs the atexit handlers the script
+# registered, and forgets modules imported from the script's own folder; see
+# macro_worker.run_script. Other imported modules stay cached with whatever
+# state the script left in them. Slots that need a pristine interpreter set
+# "isolated": true and get a process of their own.
+
+import json
+import queue
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+WORKER_SCRIPT = Path(__file__).resolve().with_name("macro_worker.py")
+
+
+class WorkerCrashed(RuntimeError):
+    pass
+
+
+class MacroWorker:
+    def __init__(self):
+        self.proc = subprocess.Popen(
+            [sys.executable, "-u", str(WORKER_SCRIPT)],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            text=True, encoding="utf-8", bufsize=1,
+        )
+        self.runs = 0
+        self.preloaded = set()
+        # Pipes can't be read with a timeout on Windows, so a thread feeds a queue
+        self._replies = queue.Queue()
+        threading.Thread(target=self._pump, daemon=True).start()
+
+    def _pump(self):
+        for line in self.proc.stdout:
+            self._replies.put(line)
+        self._replies.put(None)
+
+    @property
+    def alive(self):
+        return self.proc.poll() is None
+
+    def request(self, message, timeout=None):
+        try:
+            self.proc.stdin.write(json.dumps(message) + "\n")
+            self.proc.stdin.flush()
+        except OSError as e:
+            raise WorkerCrashed(str(e))
+        try:
+            line = self._replies.get(timeout=timeout)
+        except queue.Empty:
+            self.kill()
+            raise TimeoutError(f"macro worker did not answer within {timeout}s")
+        if line is None:
+            raise WorkerCrashed(f"macro worker exited with {self.proc.wait()}")
+        return json.loads(line)
+
+    def kill(self):
+        if self.alive:
+            self.proc.kill()
+        self.proc.wait()
+
+
+class WorkerPool:
+    def __init__(self, size=2, max_runs=50):
+        self.size = size
+        self.max_runs = max_runs
+        self._idle = []
+        self._busy = 0
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def warm(self, preloads=()):
+        """Start the pool's workers now and import preload modules in each of them."""
+        workers = []
+        try:
+            for _ in range(self.size):
+                workers.append(self._acquire(preloads))
+        finally:
+            # Even if one failed to spawn, so _busy doesn't leak and block run()
+            for worker in workers:
+                self._release(worker)
+
+    def run(self, job, script, preload=()):
+        """Run script in a warm worker, filling job.returncode/stdout/stderr. Blocks the calling thread."""
+        worker = self._acquire(preload)
+        job.attach_process(worker.proc)
+        try:
+            reply = worker.request({"op": "run", "script": str(script), "preload": list(preload)},
+                                   timeout=job.timeout)
+            worker.runs += 1
+            worker.preloaded.update(preload)
+        except Exception:
+            worker.kill()
+            raise
+        finally:
+            self._release(worker)
+        job.returncode = reply["status"]
+        job.stdout = reply["stdout"]
+        job.stderr = reply["stderr"]
+
+    def shutdown(self):
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for worker in idle:
+            worker.kill()
+
+    def _acquire(self, preload):
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("worker pool is shut down")
+                self._idle = [w for w in self._idle if w.alive]
+                if self._idle:
+                    # Prefer a worker that already imported this slot's preload list
+                    wanted = set(preload)
+                    worker = max(self._idle, key=lambda w: len(wanted & w.preloaded))
+                    self._idle.remove(worker)
+                    break
+                if self._busy + len(self._idle) < self.size:
+                    worker = None
+                    break
+                self._cond.wait()
+            self._busy += 1
+        if worker is None:
+            try:
+                worker = MacroWorker()
+            except Exception:
+                with self._cond:
+                    self._busy -= 1
+                    self._cond.notify()
+                raise
+        missing = [m for m in preload if m not in worker.preloaded]
+        if missing:
+            try:
+                worker.request({"op": "preload", "modules": missing})
+            except Exception:
+                worker.kill()
+                self._release(worker)
+                raise
+            worker.preloaded.update(missing)
+        return worker
+
+    def _release(self, worker):
+        with self._cond:
+            self._busy -= 1
+            if worker.alive and worker.runs < self.max_runs and not self._closed:
+                self._idle.append(worker)
+            else:
+                worker.kill()
+            self._cond.notify()
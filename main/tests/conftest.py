@@ -0,0 +1,8 @@
+# Tests import the app's packages the way the scripts do, from main/
+#
+#   cd main && python -m pytest tests
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
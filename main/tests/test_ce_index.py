@@ -0,0 +1,108 @@
+import io
+import os
+
+from logic import ce_index
+from logic.ce_index import CEIndex, SAMPLE_BLOCKS, SAMPLE_SIZE, TAIL_SIZE
+from logic.ce_writer import CEWriter
+
+
+def unsampled_line(data, lines):
+    """Offset of a line that none of the fingerprint's sampled blocks touch."""
+    step = len(data) // SAMPLE_BLOCKS
+    sampled = [(i * step, i * step + SAMPLE_SIZE) for i in range(SAMPLE_BLOCKS)]
+    sampled.append((len(data) - TAIL_SIZE, len(data)))
+    at = 0
+    for line in lines:
+        end = at + len(line)
+        if all(end <= lo or at >= hi for lo, hi in sampled):
+            return at
+        at = end
+    raise AssertionError("every line is sampled")
+
+
+def write_tasks(path, count):
+    lines = [f'- [ ] task {i} | agent: Architect | #priority:medium #task\n' for i in range(count)]
+    path.write_text(''.join(lines), encoding='utf-8')
+    return [line.encode('utf-8') for line in lines]
+
+
+def tick(path, lines):
+    at = unsampled_line(path.read_bytes(), lines)
+    with open(path, 'r+b') as f:
+        f.seek(at)
+        f.write(b'- [x]')
+
+
+def append_through_writer(path, index, entries):
+    writer = CEWriter(str(path), flush_interval=0, on_append=index.note_append)
+    for entry in entries:
+        writer.write(entry)
+    writer.close()
+
+
+def test_tick_then_append_before_refresh_rebuilds(tmp_path):
+    path = tmp_path / 'otk_ce_index.md'
+    lines = write_tasks(path, 200)
+    index = CEIndex(str(path))
+    index.refresh()
+    assert (index.unresolved, index.resolved) == (200, 0)
+
+    # Tick one checkbox in the middle (same length), then something appends before the next refresh
+    tick(path, lines)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('- [ ] new | agent: Scout | #task\n')
+
+    index.refresh()
+    assert (index.unresolved, index.resolved) == (200, 1)
+    assert index.agent_count('Architect') == 199
+    assert index.agent_count('Architect', open_only=False) == 200
+    assert CEIndex(str(path)).counts() == index.counts()  # Sidecar round-trips
+
+
+def test_tick_then_writer_append_rebuilds(tmp_path):
+    path = tmp_path / 'otk_ce_index.md'
+    lines = write_tasks(path, 200)
+    index = CEIndex(str(path))
+    index.refresh()
+    tick(path, lines)
+    append_through_writer(path, index, ['- [ ] new | agent: Scout | #task\n'])
+
+    index.refresh()
+    assert (index.unresolved, index.resolved) == (200, 1)
+    assert index.agent_count('Architect') == 199
+
+
+class CountingFile(io.BufferedReader):
+    read_total = 0
+
+    def read(self, size=-1):
+        data = super().read(size)
+        CountingFile.read_total += len(data)
+        return data
+
+
+def test_writer_append_reads_only_new_bytes(tmp_path, monkeypatch):
+    path = tmp_path / 'otk_ce_index.md'
+    write_tasks(path, 20000)  # ~1.2 MB
+    index = CEIndex(str(path))
+    index.refresh()
+
+    entries = [f'- [x] done {i} | agent: Scout | #task\n' for i in range(3)]
+    append_through_writer(path, index, entries)
+    real_open = open
+
+    def counting_open(file, mode='r', **kwargs):
+        if mode == 'rb':
+            return CountingFile(io.FileIO(file, 'r'))
+        return real_open(file, mode, **kwargs)  # The sidecar
+
+    monkeypatch.setattr(ce_index, 'open', counting_open, raising=False)
+    CountingFile.read_total = 0
+    assert index.refresh()
+
+    appended = len(''.join(entries).encode('utf-8'))
+    fingerprint = SAMPLE_BLOCKS * SAMPLE_SIZE + TAIL_SIZE  # Verified once, recomputed once
+    assert CountingFile.read_total <= appended + 2 * fingerprint
+    assert (index.unresolved, index.resolved) == (20000, 3)
+    assert index.agent_count('Scout', open_only=False) == 3
+    assert os.path.exists(str(path) + '.idx.json')
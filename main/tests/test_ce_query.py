@@ -0,0 +1,79 @@
+import datetime
+import json
+import random
+
+import pytest
+
+from logic.ce_query import CEQuery, TIME_FORMAT
+from logic.segments import SegmentStore
+
+SLOTS = [f"Slot_{i}" for i in range(6)]
+TYPES = ["prompt", "macro", "exec"]
+STATUSES = ["OK", "QUEUED", "FAIL: Prompt not found", "FAIL: exit 1"]
+START = datetime.datetime(2025, 1, 1)
+
+
+def write_events(path, rng, first, count):
+    with open(path, 'a', encoding='utf-8') as f:
+        for i in range(first, first + count):
+            f.write(json.dumps({
+                "timestamp": (START + datetime.timedelta(minutes=37 * i)).strftime(TIME_FORMAT),
+                "source": "OTK",
+                "slot_id": rng.choice(SLOTS),
+                "type": rng.choice(TYPES),
+                "status": rng.choice(STATUSES),
+            }) + "\n")
+    return first + count
+
+
+def brute_force(store, since, until, slot_id, action_type, status):
+    since = since and since.strftime(TIME_FORMAT)
+    until = until and until.strftime(TIME_FORMAT)
+    return [e for e in store.iter_records()
+            if (not since or e["timestamp"] >= since) and (not until or e["timestamp"] <= until)
+            and slot_id in (None, e["slot_id"]) and action_type in (None, e["type"])
+            and (status is None or e["status"].startswith(status))]
+
+
+def roll_after(store, n):
+    """Roll as if it happened just after event n-1 was logged; segment names carry the roll time."""
+    segment = store.roll()
+    rolled = START + datetime.timedelta(minutes=37 * (n - 1) + 1)
+    seq = segment.name.split('-', 1)[0]
+    segment.rename(segment.with_name(f"{seq}-{rolled.strftime('%Y%m%dT%H%M%S')}.gz"))
+
+
+@pytest.fixture
+def rolled_log(tmp_path):
+    """~16 days of events: two rolled segments, then the active file."""
+    path = tmp_path / "ce_session_log.jsonl"
+    store = SegmentStore(path)
+    rng = random.Random(3)
+    n = write_events(path, rng, 0, 200)
+    roll_after(store, n)
+    n = write_events(path, rng, n, 200)
+    roll_after(store, n)
+    write_events(path, rng, n, 200)
+    return path, store
+
+
+def test_query_matches_brute_force(rolled_log):
+    path, store = rolled_log
+    query = CEQuery(path, block_bytes=1024)  # Many index entries over a small file
+    rng = random.Random(11)
+    for _ in range(200):
+        a, b = sorted(START + datetime.timedelta(minutes=rng.randrange(37 * 620)) for _ in range(2))
+        filters = dict(since=rng.choice([None, a]), until=rng.choice([None, b]),
+                       slot_id=rng.choice([None, *SLOTS]), action_type=rng.choice([None, *TYPES]),
+                       status=rng.choice([None, "FAIL", "OK"]))
+        assert list(query.query(**filters)) == brute_force(store, **filters), filters
+
+
+def test_archived_segments_are_included_by_default(rolled_log):
+    path, store = rolled_log
+    query = CEQuery(path)
+    active_only = sum(1 for _ in query.query(include_archived=False))
+    assert active_only == 200
+    assert query.count(since=START) == 600  # Reaches before the active file: segments too
+    late = START + datetime.timedelta(minutes=37 * 500)
+    assert query.count(since=late) == query.count(since=late, include_archived=False) == 100
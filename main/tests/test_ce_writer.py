@@ -0,0 +1,22 @@
+import threading
+import time
+
+from logic.ce_writer import CEWriter
+
+
+def test_full_queue_drops_without_waiting(tmp_path):
+    path = tmp_path / 'otk_ce_index.md'
+    writer = CEWriter(str(path), flush_interval=0, max_queue=2)
+    release = threading.Event()
+    assert writer.run_exclusive(release.wait)  # Stall the writer thread
+    time.sleep(0.05)
+    assert writer.write('- [ ] one\n') and writer.write('- [ ] two\n')
+
+    start = time.perf_counter()
+    assert not writer.write('- [ ] three\n')
+    assert time.perf_counter() - start < 0.01
+    assert writer.dropped == 1
+
+    release.set()
+    writer.close()
+    assert path.read_text(encoding='utf-8') == '- [ ] one\n- [ ] two\n'
@@ -0,0 +1,13 @@
+import pytest
+
+from logic.config_cache import ConfigError, normalize_agents
+
+
+@pytest.mark.parametrize('config', [['orange', 'prompt'], 'orange', 3])
+def test_non_mapping_agent_config_is_a_config_error(config):
+    with pytest.raises(ConfigError):
+        normalize_agents({'Architect': config})
+
+
+def test_empty_agent_config_gets_defaults():
+    assert normalize_agents({'Architect': None}) == {'Architect': {'color': 'lightgray', 'prompt': '{input}'}}
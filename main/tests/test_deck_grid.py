@@ -0,0 +1,88 @@
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtWidgets = pytest.importorskip("PySide6.QtWidgets")
+from PySide6.QtCore import Qt
+from PySide6.QtTest import QTest
+
+from logic.deck_grid import SlotGridModel, SlotGridView
+from logic.hot_reload import diff_keyed
+
+
+def slot(slot_id, row, col, **extra):
+    return {"slot_id": slot_id, "label": slot_id.replace("_", " "), "type": "prompt",
+            "payload": f"prompts/{slot_id}.txt", "row": row, "col": col, **extra}
+
+
+def layout(*slots):
+    return {s["slot_id"]: s for s in slots}
+
+
+@pytest.fixture
+def grid():
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    model = SlotGridModel(lambda button: None)
+    view = SlotGridView(model, 24)
+    clicks = []
+    view.slot_clicked.connect(clicks.append)
+    view.resize(800, 400)
+    view.show()
+    yield model, view, clicks
+    view.close()
+    app.processEvents()
+
+
+def click(view, model, row, col):
+    QTest.mouseClick(view.viewport(), Qt.LeftButton, pos=view.visualRect(model.index(row, col)).center())
+
+
+def test_click_maps_cells_to_slots(grid):
+    model, view, clicks = grid
+    slots = layout(slot("Scout_Button", 0, 0), slot("Architect_Button", 1, 2))
+    model.set_slots(slots, diff_keyed({}, slots))
+    assert (model.rowCount(), model.columnCount()) == (2, 3)
+    assert model.index_of("Architect_Button") == model.index(1, 2)
+
+    click(view, model, 1, 2)
+    click(view, model, 0, 0)
+    click(view, model, 0, 2)  # A gap in the layout
+    assert clicks == ["Architect_Button", "Scout_Button"]
+    assert model.slot_id(model.index(0, 2)) is None
+    assert model.flags(model.index(0, 2)) == Qt.NoItemFlags
+
+
+def test_missing_payload_cell_is_disabled(grid):
+    model, view, clicks = grid
+    slots = layout(slot("Scout_Button", 0, 0), slot("Broken_Button", 0, 1))
+    model.set_slots(slots, diff_keyed({}, slots))
+    model.set_available("Broken_Button", False)
+    assert not model.flags(model.index(0, 1)) & Qt.ItemIsEnabled
+    assert "Missing: prompts/Broken_Button.txt" in model.data(model.index(0, 1), Qt.ToolTipRole)
+
+    click(view, model, 0, 1)
+    assert clicks == []
+    model.set_available("Broken_Button", True)
+    click(view, model, 0, 1)
+    assert clicks == ["Broken_Button"]
+
+
+def test_overlapping_slots_later_one_wins(grid):
+    model, view, clicks = grid
+    slots = layout(slot("First_Button", 0, 0), slot("Second_Button", 0, 0), slot("Other_Button", 0, 1))
+    model.set_slots(slots, diff_keyed({}, slots))
+    assert model.slot_id(model.index(0, 0)) == "Second_Button"
+    assert not model.index_of("First_Button").isValid()
+    click(view, model, 0, 0)
+    assert clicks == ["Second_Button"]
+
+    # Moving the winner away uncovers the other one, without a model reset
+    moved = layout(slot("First_Button", 0, 0), slot("Second_Button", 0, 1), slot("Other_Button", 0, 1))
+    resets, changed = [], []
+    model.modelReset.connect(lambda: resets.append(True))
+    model.dataChanged.connect(lambda top, bottom, roles: changed.append((top.row(), top.column())))
+    model.set_slots(moved, diff_keyed(slots, moved))
+    assert not resets and set(changed) == {(0, 0), (0, 1)}
+    click(view, model, 0, 0)
+    assert clicks == ["Second_Button", "First_Button"]
@@ -0,0 +1,93 @@
+import sys
+import threading
+import time
+
+import pytest
+
+QtCore = pytest.importorskip("PySide6.QtCore")
+
+from logic.executor import ActionExecutor, CANCELLED, DONE, FAILED, TIMEOUT
+
+SLEEP = [sys.executable, "-c", "import time; time.sleep(30)"]
+
+
+@pytest.fixture
+def executor():
+    app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+    executor = ActionExecutor(max_workers=1)
+    executor.finished = []
+    executor.job_finished.connect(executor.finished.append)
+    yield executor
+    executor.shutdown()
+    app.processEvents()
+
+
+def wait(predicate, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        QtCore.QCoreApplication.processEvents()
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_process_job_reports_exit_and_output(executor):
+    job = executor.submit("Py_Button", "Py", [sys.executable, "-c", "print('hi'); raise SystemExit(2)"])
+    assert wait(lambda: job in executor.finished)
+    assert job.status == FAILED and job.returncode == 2
+    assert job.stdout.strip() == "hi"
+
+
+def test_timeout(executor):
+    job = executor.submit("Slow_Button", "Slow", SLEEP, timeout=0.2)
+    assert wait(lambda: job in executor.finished)
+    assert job.status == TIMEOUT
+
+
+def test_cancel_running_and_queued_jobs(executor):
+    running = executor.submit("Slow_Button", "Slow", SLEEP)
+    queued = executor.submit("Slow_Button", "Slow", SLEEP)  # One worker, so this waits
+    assert wait(lambda: running._proc is not None)
+
+    assert executor.cancel(queued.job_id)
+    assert queued.status == CANCELLED and queued.started_at is None
+    assert executor.cancel(running.job_id)
+    assert wait(lambda: running in executor.finished)
+    assert running.status == CANCELLED
+    assert running._proc.poll() is not None
+    assert executor.finished.count(queued) == 1 and executor.finished.count(running) == 1
+    assert not executor.jobs()
+    assert not executor.cancel(running.job_id)
+
+
+def test_cancel_before_runner_attaches_a_process(executor):
+    gate = threading.Event()
+
+    def runner(job):
+        gate.wait(5)
+        job.returncode = 0
+
+    job = executor.submit("Macro_Button", "Macro", runner=runner)
+    assert wait(lambda: job.started_at is not None)
+    executor.cancel(job.job_id)
+    gate.set()
+    assert wait(lambda: job in executor.finished)
+    assert job.status == CANCELLED
+
+
+def test_shutdown_cancels_everything(executor):
+    jobs = [executor.submit("Slow_Button", "Slow", SLEEP) for _ in range(3)]
+    assert wait(lambda: jobs[0]._proc is not None)
+    executor.shutdown()
+    assert wait(lambda: all(job in executor.finished for job in jobs))
+    assert [job.status for job in jobs] == [CANCELLED] * 3
+    assert jobs[0]._proc.poll() is not None
+
+
+def test_runner_job(executor):
+    def runner(job):
+        job.returncode = 0
+        job.stdout = "x" * 10000
+
+    job = executor.submit("Macro_Button", "Macro", runner=runner)
+    assert wait(lambda: job in executor.finished)
+    assert job.status == DONE and len(job.stdout) == 4096
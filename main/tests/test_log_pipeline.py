@@ -0,0 +1,58 @@
+import datetime
+import gzip
+import json
+import os
+
+from logic.log_pipeline import JsonlSink, LogPipeline, TextSink
+from logic.segments import SegmentStore
+
+
+def test_size_rotation_keeps_numbered_backups(tmp_path):
+    path = tmp_path / "OTK_usage.log"
+    pipeline = LogPipeline(flush_bytes=1)  # Every emit flushes
+    pipeline.add_sink("usage", TextSink(path, max_bytes=40, backups=2))
+    for i in range(6):
+        pipeline.emit("usage", ("2025-01-01 00:00:00", f"Slot_{i}", "OK"))  # 37 bytes a line
+    pipeline.close()
+    assert path.read_text() == "2025-01-01 00:00:00 | Slot_5 | OK\n"
+    assert (tmp_path / "OTK_usage.log.1").read_text() == "2025-01-01 00:00:00 | Slot_4 | OK\n"
+    assert (tmp_path / "OTK_usage.log.2").read_text() == "2025-01-01 00:00:00 | Slot_3 | OK\n"
+    assert not (tmp_path / "OTK_usage.log.3").exists()
+
+
+def test_daily_rotation_rolls_into_segments(tmp_path):
+    path = tmp_path / "ce_session_log.jsonl"
+    path.write_text(json.dumps({"slot_id": "Yesterday"}) + "\n")
+    yesterday = (datetime.datetime.now() - datetime.timedelta(days=1)).timestamp()
+    os.utime(path, (yesterday, yesterday))
+    store = SegmentStore(path)
+    pipeline = LogPipeline()
+    pipeline.add_sink("ce", JsonlSink(path, daily=True, archive=store))
+    pipeline.emit("ce", {"slot_id": "Today"})
+    pipeline.flush()
+    assert [json.loads(line)["slot_id"] for line in path.read_text().splitlines()] == ["Today"]
+    with gzip.open(store.segments()[0], "rt") as f:
+        assert json.loads(f.read())["slot_id"] == "Yesterday"
+    pipeline.close()
+
+
+def test_failed_flush_keeps_the_batch(tmp_path, monkeypatch):
+    path = tmp_path / "OTK_usage.log"
+    errors = []
+    pipeline = LogPipeline(on_error=lambda name, e: errors.append(name))
+    sink = pipeline.add_sink("usage", TextSink(path))
+    pipeline.emit("usage", "first")
+    pipeline.emit("usage", "second")
+
+    def locked(incoming):
+        raise PermissionError("file is locked")
+
+    monkeypatch.setattr(sink, "_rotate_if_needed", locked)
+    pipeline.flush()
+    assert errors == ["usage"]
+    assert not path.exists()
+
+    monkeypatch.undo()
+    pipeline.emit("usage", "third")
+    pipeline.close()
+    assert path.read_text() == "first\nsecond\nthird\n"
@@ -0,0 +1,53 @@
+import pytest
+
+QtCore = pytest.importorskip("PySide6.QtCore")
+
+from logic import payload_cache
+from logic.payload_cache import PayloadCache, payload_key
+
+
+@pytest.fixture
+def app():
+    return QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+
+def test_read_invalidated_in_flight_is_not_cached(app, tmp_path, monkeypatch):
+    seed = tmp_path / "seed.md"
+    seed.write_text("old prompt", encoding="utf-8")
+    cache = PayloadCache()
+    real_open = open
+
+    def racing_open(path, *args, **kwargs):
+        f = real_open(path, *args, **kwargs)
+        # The file is saved (atomically, as editors do) and the watcher fires while this read is in flight
+        tmp = tmp_path / "seed.md.tmp"
+        tmp.write_text("new prompt", encoding="utf-8")
+        tmp.replace(seed)
+        cache.invalidate(path)
+        return f
+
+    monkeypatch.setattr(payload_cache, "open", racing_open, raising=False)
+    assert cache.read_text(seed) == "old prompt"
+    monkeypatch.undo()
+    assert payload_key(seed) not in cache._texts
+    assert cache.read_text(seed) == "new prompt"
+    assert cache._texts[payload_key(seed)][0] == "new prompt"  # Cached once nothing raced it
+
+
+def test_budget_counts_bytes_not_characters(app, tmp_path):
+    cache = PayloadCache(max_bytes=1000)
+    big = tmp_path / "big.md"
+    big.write_text("é" * 600, encoding="utf-8")  # 600 characters, 1200 bytes
+    assert cache.read_text(big) == "é" * 600
+    assert not cache._texts
+
+    first, second = tmp_path / "first.md", tmp_path / "second.md"
+    first.write_text("é" * 300, encoding="utf-8")
+    second.write_text("ü" * 300, encoding="utf-8")
+    cache.read_text(first)
+    cache.read_text(second)  # 600 + 600 bytes: evicts the first
+    assert list(cache._texts) == [payload_key(second)]
+    assert cache._text_bytes == 600
+
+    cache.invalidate(second)
+    assert cache._text_bytes == 0
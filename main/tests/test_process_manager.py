@@ -0,0 +1,83 @@
+import os
+import sys
+import time
+
+import pytest
+
+QtCore = pytest.importorskip("PySide6.QtCore")
+
+from logic.process_manager import ProcessManager, command_line, EXITED, FAILED, KILLED, LAUNCHED
+
+
+@pytest.fixture
+def manager():
+    app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+    yield ProcessManager()
+    app.processEvents()
+
+
+def wait_exit(manager, process, timeout=10):
+    deadline = time.monotonic() + timeout
+    while process.running and time.monotonic() < deadline:
+        QtCore.QCoreApplication.processEvents()
+        time.sleep(0.01)
+    return process
+
+
+def test_payload_with_arguments_runs_through_the_shell(manager):
+    payload = f'"{sys.executable}" -c "import sys; sys.exit(3)"'
+    argv, shell = command_line(payload)
+    assert shell
+    outcome, process = manager.launch("Quit_Button", "Quit", argv, shell=shell)
+    assert outcome == LAUNCHED
+    assert wait_exit(manager, process).status == FAILED
+    assert process.returncode == 3
+
+
+@pytest.mark.parametrize("shell", [True, False])
+def test_args_key_with_and_without_shell(manager, shell):
+    argv, shell = command_line(sys.executable, ["-c", "print('hello world')"], shell)
+    assert argv[0] == sys.executable and not shell  # A bare executable needs no shell
+    outcome, process = manager.launch("Py_Button", "Py", argv, shell=shell, capture=True)
+    assert outcome == LAUNCHED
+    assert wait_exit(manager, process).status == EXITED
+    manager.flush()
+    assert ("stdout", "hello world") in process.output
+
+
+def test_uncaptured_children_get_no_pipes(manager):
+    outcome, process = manager.launch("Py_Button", "Py", [sys.executable, "-c", "print('x')"], shell=False)
+    assert process._proc.stdout is None and process._proc.stderr is None
+    assert wait_exit(manager, process).status == EXITED
+    assert not process.output
+
+
+def test_single_instance_limit(manager):
+    argv = [sys.executable, "-c", "import time; time.sleep(5)"]
+    first = manager.launch("Slow_Button", "Slow", argv, instances="single", shell=False)[1]
+    outcome, process = manager.launch("Slow_Button", "Slow", argv, instances="single", shell=False)
+    assert (outcome, process) == ("limited", first)
+    manager.terminate(first.proc_id)
+    wait_exit(manager, first)
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="reads /proc")
+def test_terminate_kills_the_program_behind_the_shell(manager, tmp_path):
+    pid_file = tmp_path / "pid"
+    script = f"import os, time; open({str(pid_file)!r}, 'w').write(str(os.getpid())); time.sleep(30)"
+    payload = f'"{sys.executable}" -c "{script}"; exit 0'  # The shell stays as the program's parent
+    argv, shell = command_line(payload)
+    process = manager.launch("Slow_Button", "Slow", argv, shell=shell)[1]
+    deadline = time.monotonic() + 10
+    while not pid_file.exists() or not pid_file.read_text():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    child = int(pid_file.read_text())
+    assert child != process.pid
+
+    manager.terminate(process.proc_id)
+    assert wait_exit(manager, process).status == KILLED
+    deadline = time.monotonic() + 10
+    while os.path.exists(f"/proc/{child}") and "\nState:\tZ" not in open(f"/proc/{child}/status").read():
+        assert time.monotonic() < deadline, "program outlived its shell"
+        time.sleep(0.01)
@@ -0,0 +1,30 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("PySide6.QtGui")
+
+from logic import reflection_render
+
+MAIN = Path(__file__).resolve().parents[1]
+
+
+def test_importing_does_not_load_qt_charts():
+    code = "import sys; from logic import reflection_render; print('logic.qt_charts' in sys.modules, 'PySide6' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], cwd=MAIN, capture_output=True, text=True, check=True)
+    assert out.stdout.split() == ["False", "False"]
+
+
+@pytest.mark.parametrize("fmt", ["png", "svg"])
+def test_detached_render_writes_artifact_once(tmp_path, fmt):
+    spec = {"labels": ["Architect", "Scout"], "values": [2, 5], "colors": ["orange", "yellow"],
+            "ylabel": "Activity Weight", "title": "Runbook Graph", "format": fmt,
+            "out": str(tmp_path / f"graph.{fmt}")}
+    child = reflection_render.render_detached(spec)
+    assert child is not None
+    assert child.wait(timeout=60) == 0
+    assert Path(spec["out"]).stat().st_size > 0
+    assert reflection_render.is_current(spec)
+    assert reflection_render.render_detached(spec) is None  # Unchanged spec: nothing spawned
@@ -0,0 +1,65 @@
+from logic.routing import RoutingEngine
+
+
+def type_out(engine, text):
+    result = None
+    for i in range(1, len(text) + 1):
+        result = engine.match(text[:i])
+    return result
+
+
+def test_long_regex_match_found_while_typing():
+    text = 'bid ' + 'x' * 100 + ' due'
+    engine = RoutingEngine([('Scout', 'agent', [], [r'bid.*due'], 10)])
+    assert [c.agent for c in type_out(engine, text).candidates] == ['Scout']
+    assert [c.agent for c in RoutingEngine([('Scout', 'agent', [], [r'bid.*due'], 10)]).match(text).candidates] == ['Scout']
+
+
+def test_bounded_rules_stay_incremental():
+    engine = RoutingEngine([('Scout', 'agent', ['RFP'], [r'bid\s{1,3}due'], 10)])
+    assert engine._span == 9
+    assert [c.hits for c in type_out(engine, 'rfp then bid  due').candidates] == [2]
+
+
+ALPHABET = 'abdeinrtu  \n#'
+WORDS = ['bid', 'due', 'rfp', 'tender', 'idea', 'brainstorm', 'run', 'bi', 'dd']
+
+
+def random_rules(rng):
+    regexes = [r'bid\s{1,3}due', r'r[a-z]{2}p', r'(?:ab|ba)+', r'i\w{0,4}a', r'bid.*due', r'(?<=#)\w+', r'te?n']
+    rules = []
+    for i in range(rng.randint(1, 4)):
+        keywords = rng.sample(WORDS, rng.randint(0, 3))
+        chosen = rng.sample(regexes, rng.randint(0, 2))
+        rules.append((f'Agent{i}', rng.choice(['agent', 'agent', 'tag']), keywords, chosen, rng.randint(0, 3)))
+    return rules
+
+
+def random_edit(rng, text):
+    at = rng.randint(0, len(text))
+    op = rng.random()
+    if op < 0.4:  # Typing
+        return text[:at] + rng.choice(ALPHABET) + text[at:]
+    if op < 0.6:  # Paste
+        insert = ''.join(rng.choice([rng.choice(WORDS), rng.choice(ALPHABET)]) for _ in range(rng.randint(1, 8)))
+        return text[:at] + insert + text[at:]
+    if op < 0.8:  # Delete a selection
+        return text[:at] + text[at + rng.randint(1, 12):]
+    end = at + rng.randint(0, 8)  # Replace a selection
+    return text[:at] + rng.choice(WORDS) + text[end:]
+
+
+def test_incremental_matches_full_rescan_on_random_edits():
+    import random
+    for seed in range(300):
+        rng = random.Random(seed)
+        rules = random_rules(rng)
+        engine, rescan = RoutingEngine(rules), RoutingEngine(rules)
+        text = ''
+        for step in range(60):
+            text = random_edit(rng, text) if rng.random() < 0.95 else ''
+            got = engine.match(text)
+            rescan.reset()
+            expected = rescan.match(text)
+            assert engine._hits == rescan._hits, (seed, step, text)
+            assert got == expected, (seed, step, text)
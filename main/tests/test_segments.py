@@ -0,0 +1,32 @@
+import gzip
+
+from logic.ce_writer import CEWriter
+from logic.segments import SegmentStore
+
+
+def test_compact_keeps_non_utf8_bytes(tmp_path):
+    path = tmp_path / 'otk_ce_index.md'
+    legacy = b'Branches: All clear\x97dive into new ideas.\n'
+    path.write_bytes(legacy + b'- [x] shipped \x97 done\n- [ ] still open\n')
+    writer = CEWriter(str(path), flush_interval=0)
+    writer.write('- [ ] café follow-up\n')
+    writer.close()
+
+    store = SegmentStore(path, max_bytes=1)
+    assert store.compact()
+    assert path.read_bytes() == legacy + '- [ ] still open\n- [ ] café follow-up\n'.encode('utf-8')
+    with gzip.open(store.segments()[0], 'rb') as f:
+        assert f.read() == b'- [x] shipped \x97 done\n'
+    assert sum(1 for _ in store.iter_lines()) == 4
+
+
+def test_due_waits_for_growth_after_compacting_open_items(tmp_path):
+    path = tmp_path / 'otk_ce_index.md'
+    path.write_text('- [ ] open item\n' * 100, encoding='utf-8')
+    store = SegmentStore(path, max_bytes=800, daily=False)
+    assert store.due()
+    assert store.compact()
+    assert not store.due()  # Nothing left to move; don't rewrite again
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('- [ ] open item\n' * 13)
+    assert store.due()
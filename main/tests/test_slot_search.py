@@ -0,0 +1,78 @@
+import random
+import re
+
+import pytest
+
+from logic.slot_search import FIELDS, SlotIndex
+
+ALPHABET = "abcde -_"
+
+
+def make_slots(rng, count=300):
+    word = lambda: "".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 10)))
+    return [{"slot_id": f"S{i}", "label": word(), "tooltip": word(), "payload": word()}
+            for i in range(count)]
+
+
+def brute_force(slots, query):
+    q = query.strip().lower()
+    rx = re.compile(".*?".join(map(re.escape, q)))
+    return {slot["slot_id"] for slot in slots
+            if any(rx.search(str(slot.get(name, "")).lower()) for name, _ in FIELDS)}
+
+
+def keystrokes(rng, steps=12):
+    """Query strings as a user types, with the odd backspace."""
+    text = ""
+    for _ in range(steps):
+        if text and rng.random() < 0.25:
+            text = text[:-1]
+        else:
+            text += rng.choice(ALPHABET)
+        yield text
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_incremental_search_matches_fresh_search_and_brute_force(seed):
+    rng = random.Random(seed)
+    slots = make_slots(rng)
+    usage = {f"S{i}": rng.randint(0, 5) for i in range(0, len(slots), 3)}
+    index = SlotIndex(slots)
+    index.set_usage(usage)
+    for query in keystrokes(rng):
+        results = index.search(query, limit=len(slots))
+        fresh = SlotIndex(slots)
+        fresh.set_usage(usage)
+        assert results == fresh.search(query, limit=len(slots)), query
+        if query.strip():
+            assert {slot_id for _, slot_id in results} == brute_force(slots, query), query
+
+
+def test_limit_keeps_the_best_and_empty_query_ranks_by_usage():
+    slots = [{"slot_id": "Open_Logs", "label": "Open logs"},
+             {"slot_id": "Log_Out", "label": "Sign out", "tooltip": "log out"},
+             {"slot_id": "Blog", "label": "Blog"}]
+    index = SlotIndex(slots)
+    assert [slot_id for _, slot_id in index.search("log", limit=2)] == ["Open_Logs", "Blog"]
+    index.set_usage({"Blog": 3})
+    assert index.search("", limit=1)[0][1] == "Blog"
+    assert index.search("xyz") == []
+
+
+def test_palette_lists_at_most_a_screenful():
+    QtWidgets = pytest.importorskip("PySide6.QtWidgets")
+    from logic.command_palette import PALETTE_ROWS, CommandPalette
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    slots = [{"slot_id": f"S{i}", "label": f"macro {i}"} for i in range(500)]
+    deck = QtWidgets.QWidget()
+    deck.resize(600, 400)
+    palette = CommandPalette(deck)
+    palette.open(SlotIndex(slots), {slot["slot_id"]: slot["label"] for slot in slots})
+    for text in ("m", "ma", "mac", "macro 4", "macro 49"):
+        palette.input.setText(text)
+        shown = [palette.results.item(row).text() for row in range(palette.results.count())]
+        assert len(shown) == min(PALETTE_ROWS, len(SlotIndex(slots).search(text, limit=len(slots))))
+    assert shown[0].startswith("macro 49")
+    deck.deleteLater()
+    app.processEvents()
@@ -0,0 +1,16 @@
+from logic.usage_stats import UsageStats
+
+
+def test_macro_click_counts_as_one_use(tmp_path):
+    log = tmp_path / 'OTK_usage.log'
+    log.write_text('2025-01-01 09:00:00 | Scout_Button | macro | QUEUED\n'
+                   '2025-01-01 09:00:04 | Scout_Button | macro | OK\n'
+                   '2025-01-01 09:01:00 | Prompt_Button | prompt | OK\n', encoding='utf-8')
+    stats = UsageStats(log)
+    stats.refresh()
+    scout = stats.slot('Scout_Button')
+    assert (scout['total'], scout['ok'], scout['queued']) == (1, 1, 1)
+    assert sum(scout['hours']) == 1
+    assert stats.types['macro']['total'] == 1
+    assert [slot_id for slot_id, _ in stats.top_slots()] == ['Scout_Button', 'Prompt_Button']
+    assert sum(stats.days.values()) == 2
@@ -0,0 +1,72 @@
+import os
+
+import pytest
+
+pytest.importorskip("PySide6.QtCore")  # logic.executor's Job lives next to Qt signals
+
+from logic import worker_pool
+from logic.executor import Job
+from logic.worker_pool import WorkerPool
+
+
+class FakeWorker:
+    spawned = 0
+
+    def __init__(self):
+        FakeWorker.spawned += 1
+        if FakeWorker.spawned == 2:
+            raise OSError("spawn failed")
+        self.runs = 0
+        self.preloaded = set()
+        self.alive = True
+
+    def kill(self):
+        self.alive = False
+
+
+def test_warm_releases_workers_when_a_spawn_fails(monkeypatch):
+    FakeWorker.spawned = 0
+    monkeypatch.setattr(worker_pool, "MacroWorker", FakeWorker)
+    pool = WorkerPool(size=3)
+    with pytest.raises(OSError):
+        pool.warm()
+    assert pool._busy == 0
+    assert len(pool._idle) == 1
+    idle = pool._idle[0]
+    assert pool._acquire(()) is idle  # Would wait forever if the first worker had leaked
+
+
+def test_reused_worker_starts_each_script_from_the_same_state(tmp_path):
+    (tmp_path / "helper.py").write_text("calls = 0\n", encoding="utf-8")
+    marker = tmp_path / "atexit.txt"
+    first = tmp_path / "first.py"
+    first.write_text(
+        "import atexit, os, sys, helper\n"
+        "helper.calls += 1\n"
+        "os.chdir(os.path.dirname(os.__file__))\n"
+        "os.environ['OTK_MACRO_LEAK'] = '1'\n"
+        "sys.path.append('/nowhere')\n"
+        f"atexit.register(lambda: open({str(marker)!r}, 'w').write('ran'))\n", encoding="utf-8")
+    second = tmp_path / "second.py"
+    second.write_text(
+        "import os, sys, helper\n"
+        "helper.calls += 1\n"
+        "print(os.getcwd(), os.environ.get('OTK_MACRO_LEAK'), '/nowhere' in sys.path, helper.calls)\n",
+        encoding="utf-8")
+
+    pool = WorkerPool(size=1)
+    try:
+        job = Job(1, "First_Button", "First", timeout=30)
+        pool.run(job, first)
+        assert job.returncode == 0, job.stderr
+        assert marker.read_text() == "ran"  # When the script ends, not when the worker exits
+
+        job = Job(2, "Second_Button", "Second", timeout=30)
+        pool.run(job, second)
+        assert job.returncode == 0, job.stderr
+        cwd, leak, path_leak, calls = job.stdout.split()
+        assert pool._idle[0].runs == 2  # Same worker both times
+        assert (leak, path_leak, calls) == ("None", "False", "1")
+        assert os.path.samefile(cwd, os.getcwd())
+    finally:
+        pool.shutdown()